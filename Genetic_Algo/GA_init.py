@@ -1,33 +1,144 @@
-from Poker.player import Player
+from Poker.player import Player, Action, make_strategy
 from Poker.poker import TexasHoldem
-from Genetic_Algo.fitness import calculate_fitness
+from Poker.deck import DealSequence
+from Poker import hot_path
+from Genetic_Algo.fitness import calculate_fitness, estimate_fitness
+from Genetic_Algo.online_stats import player_stat_values
+from Genetic_Algo.population import TRAITS
 from typing import List
+import numpy as np
+import random
 import uuid
 from math import ceil
 import sys
-def run_sim(players: List[Player], max_player_per_game: int, round_cutoff: int = sys.maxsize):
+
+# Deals the players round robin onto as few tables as possible
+def assign_tables(players: List[Player], max_player_per_game: int) -> List[List[Player]]:
     num_games = ceil(len(players) / max_player_per_game)
     game = {}
-    new_population = []
     for game_round, player in enumerate(players):
         round = game_round % num_games
         if f"game_{round}" not in game:
             game[f"game_{round}"] = []
         game[f"game_{round}"].append(player)
+    return list(game.values())
 
-    for player_list in game.values():
-        poker = TexasHoldem(player_list)
+# Plays one table until it has one winner or the round cutoff is reached, then scores it
+# (counted as one table by the hot path instrumentation when it's on, see Poker/hot_path.py)
+def play_table(player_list: List[Player], round_cutoff: int, deals: DealSequence = None) -> TexasHoldem:
+    hot_path.start_table()
+    try:
+        poker = TexasHoldem(player_list, deals)
         rounds_played = 0
         # play until this game has one winner or round cutoff reached
         while sum(player.chips.total_value() > 0 for player in poker.players) > 1 and rounds_played < round_cutoff:
             poker.play()
             rounds_played += 1
-
-        for player in poker.initial_players:
-            new_population.append(player)
         calculate_fitness(poker)
+    finally:
+        hot_path.end_table()
+    return poker
+
+# Puts a player back to how they sat down, keeping traits and lineage fitness
+def reset_for_table(player: Player):
+    player.chips = player.initial_chips.copy()
+    player.reset()
+    player.rounds_survived = 0
+    player.actions_called = {action: 0 for action in Action}
+    player.position = None
+
+# Duplicate poker: the table replays one deal sequence once per seat rotation, so every player
+# gets every seat's cards (dealt by seat, busted or not, see TexasHoldem._deal_cards), and each player's
+# results are averaged over the rotations.
+# Returns (hands played, fitness of every player in every rotation: players x rotations)
+def play_duplicate_table(player_list: List[Player], round_cutoff: int):
+    # Seeded from the global generator so seeded runs stay reproducible
+    deals = DealSequence(random.getrandbits(32))
+    table_size = len(player_list)
+    start_lineage_fitness = [p.lineage_fitness for p in player_list]
+
+    fitness = np.zeros((table_size, table_size))
+    lineage_fitness = np.zeros((table_size, table_size))
+    rounds = np.zeros((table_size, table_size))
+    actions = np.zeros((table_size, len(Action)))
+    hands = 0
+    for rotation in range(table_size):
+        for p, start in zip(player_list, start_lineage_fitness):
+            reset_for_table(p)
+            p.lineage_fitness = start
+        poker = play_table(player_list[rotation:] + player_list[:rotation], round_cutoff, deals)
+        hands += poker.hands_dealt
+        for i, p in enumerate(player_list):
+            fitness[i, rotation] = p.fitness
+            lineage_fitness[i, rotation] = p.lineage_fitness
+            rounds[i, rotation] = p.rounds_survived
+            actions[i] += [p.actions_called[action] for action in Action]
+
+    for i, p in enumerate(player_list):
+        p.fitness = fitness[i].mean()
+        p.lineage_fitness = lineage_fitness[i].mean()
+        p.rounds_survived = int(round(rounds[i].mean()))
+        p.actions_called = {action: int(round(count / table_size)) for action, count in zip(Action, actions[i])}
+        p.set_pos(i)
+    return hands, fitness
+
+# Baseline bots for run_sim: opponents maps strategy names (Poker.player.STRATEGIES) to seats per table.
+# Their traits are never used, they only decide through their strategy.
+def opponent_players(opponents: dict) -> List[Player]:
+    bots = []
+    for name, seats in opponents.items():
+        for seat in range(seats):
+            bots.append(Player(f"{name}_{seat}", traits=dict.fromkeys(TRAITS, 0.0), strategy=make_strategy(name)))
+    return bots
+
+# matchup: a MatchupMatrix, when given the tables are scored from it instead of being played
+# duplicate: replay each table's deals with the seats rotated and average (see play_duplicate_table)
+# stats: optional dict that gets the number of hands played and, for duplicate, how much the rotations reduce the
+# variance of the fitness
+# accumulator: optional RunningStats (Genetic_Algo/online_stats.py) that gets every table's players once it's done
+# (estimated tables give it nan rounds and actions, nobody played them)
+# opponents: {strategy name: seats} of baseline bots that join every played table (see opponent_players), on top
+# of max_player_per_game. The same bots go from table to table and aren't part of the returned population or stats.
+def run_sim(players: List[Player], max_player_per_game: int, round_cutoff: int = sys.maxsize, matchup=None,
+            duplicate: bool = False, stats: dict = None, accumulator=None, opponents: dict = None):
+    new_population = []
+    hands = 0
+    # Duplicate: the players' fitness from every single rotation, and averaged over the rotations
+    single_rotation_fitness = []
+    averaged_fitness = []
+    tables = assign_tables(players, max_player_per_game)
+    bots = opponent_players(opponents) if opponents and matchup is None else []
+    for player_list in tables:
+        for bot in bots:
+            reset_for_table(bot)
+            bot.lineage_fitness = 0
+        if matchup is not None:
+            for position, p in enumerate(player_list):
+                p.set_pos(position)
+            estimate_fitness(player_list, matchup)
+        elif duplicate:
+            table_hands, fitness = play_duplicate_table(player_list + bots, round_cutoff)
+            hands += table_hands
+            single_rotation_fitness.append(fitness[:len(player_list)].ravel())
+            averaged_fitness.append(fitness[:len(player_list)].mean(axis=1))
+        else:
+            hands += play_table(player_list + bots, round_cutoff).hands_dealt
+        if accumulator is not None:
+            accumulator.add(player_stat_values(player_list, played=matchup is None))
+        new_population.extend(player_list)
+
+    if stats is not None:
+        stats["hands_played"] = hands
+        if duplicate and matchup is None:
+            # Variance of the population's fitness had every player been scored on one rotation, and scored on all of
+            # them averaged: averaging takes out the noise of the cards, the reduction is the share of it that went
+            single_variance = np.var(np.concatenate(single_rotation_fitness))
+            averaged_variance = np.var(np.concatenate(averaged_fitness))
+            stats["duplicate_single_rotation_variance"] = single_variance
+            stats["duplicate_averaged_variance"] = averaged_variance
+            stats["duplicate_variance_reduction"] = 1 - averaged_variance / single_variance if single_variance > 0 else 0.0
     return new_population
-        
+
 
 def initiate_player(size: int, mode: str = "rand") -> list:
     players = []
@@ -0,0 +1,111 @@
+from Poker.player import HIGH_TRAIT_THRESHOLD, MID_TRAIT_THRESHOLD, POSITION_THRESHOLD
+from Genetic_Algo.population import TRAITS
+import numpy as np
+
+# Player.make_decision only ever compares traits against fixed thresholds,
+# so every trait vector falls into one of a small number of behavior classes.
+# aggressiveness, risk_tolerance, bluff_tendency and chip_size_awareness have 3 levels (< 0.5, < 0.7, >= 0.7),
+# position_awareness has 2 (<= 0.6, > 0.6). Levels are in TRAITS order.
+LEVELS = {
+    "aggressiveness": 3,
+    "risk_tolerance": 3,
+    "bluff_tendency": 3,
+    "position_awareness": 2,
+    "chip_size_awareness": 3
+}
+LEVEL_SIZES = np.array([LEVELS[trait] for trait in TRAITS])
+NUM_CLASSES = int(np.prod(LEVEL_SIZES))
+# Mixed radix place value of every trait level in the class id
+_PLACE = np.concatenate([np.cumprod(LEVEL_SIZES[::-1])[::-1][1:], [1]])
+
+_POSITION = TRAITS.index("position_awareness")
+_CHIP_SIZE = TRAITS.index("chip_size_awareness")
+_AGGRESSIVENESS = TRAITS.index("aggressiveness")
+_RISK = TRAITS.index("risk_tolerance")
+
+# A trait value that sits in the middle of each level, used to build a genome for a class
+_LEVEL_VALUES = {
+    3: (MID_TRAIT_THRESHOLD / 2, (MID_TRAIT_THRESHOLD + HIGH_TRAIT_THRESHOLD) / 2, (HIGH_TRAIT_THRESHOLD + 1) / 2),
+    2: (POSITION_THRESHOLD / 2, (POSITION_THRESHOLD + 1) / 2)
+}
+
+# Trait matrix (N x traits) -> level matrix (N x traits)
+def trait_levels(traits: np.ndarray) -> np.ndarray:
+    traits = np.atleast_2d(traits)
+    levels = (traits >= MID_TRAIT_THRESHOLD).astype(int) + (traits >= HIGH_TRAIT_THRESHOLD).astype(int)
+    levels[:, _POSITION] = traits[:, _POSITION] > POSITION_THRESHOLD
+
+    # chip_size_awareness and position_awareness only adjust raises, and a raise can only come from
+    # a strong hand (aggressiveness) or a medium hand (risk_tolerance), so without either they never matter
+    never_raises = (levels[:, _AGGRESSIVENESS] == 0) & (levels[:, _RISK] == 0)
+    levels[never_raises, _CHIP_SIZE] = 0
+    levels[never_raises, _POSITION] = 0
+    return levels
+
+# Trait matrix (N x traits) -> behavior class id per row
+# Two genomes with the same class id make the same decision in every spot
+def behavior_classes(traits: np.ndarray) -> np.ndarray:
+    return trait_levels(traits) @ _PLACE
+
+# Single trait dict (like Player.traits) -> behavior class id
+def behavior_class(traits: dict) -> int:
+    return int(behavior_classes(np.array([traits[trait] for trait in TRAITS]))[0])
+
+def class_levels(class_id: int) -> tuple:
+    return tuple(int(level) for level in (class_id // _PLACE) % LEVEL_SIZES)
+
+# A genome that plays exactly like the class
+def representative_traits(class_id: int) -> dict:
+    return {trait: _LEVEL_VALUES[LEVELS[trait]][level] for trait, level in zip(TRAITS, class_levels(class_id))}
+
+# Every class id that a genome can actually map to
+def canonical_classes() -> np.ndarray:
+    return np.unique(behavior_classes(np.array([[_LEVEL_VALUES[size][level] for size, level in zip(LEVEL_SIZES, levels)]
+                                                 for levels in np.ndindex(*LEVEL_SIZES)])))
+
+# Running fitness statistics per behavior class
+# Individuals in the same class play identically, so their fitness samples can be pooled,
+# across a generation and across generations, instead of trusting one noisy table each
+class BehaviorFitnessCache:
+    def __init__(self):
+        self.count = np.zeros(NUM_CLASSES)
+        self.mean = np.zeros(NUM_CLASSES)
+        self.m2 = np.zeros(NUM_CLASSES)
+
+    # Add one fitness sample per class id (Welford / Chan merge of the batch into the running stats)
+    def update(self, classes: np.ndarray, fitness: np.ndarray):
+        batch_count = np.bincount(classes, minlength=NUM_CLASSES).astype(float)
+        seen = batch_count > 0
+        batch_mean = np.zeros(NUM_CLASSES)
+        batch_mean[seen] = np.bincount(classes, weights=fitness, minlength=NUM_CLASSES)[seen] / batch_count[seen]
+        batch_m2 = np.bincount(classes, weights=(fitness - batch_mean[classes]) ** 2, minlength=NUM_CLASSES)
+
+        total = self.count + batch_count
+        delta = batch_mean - self.mean
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.mean = np.where(seen, self.mean + delta * batch_count / total, self.mean)
+            self.m2 = np.where(seen, self.m2 + batch_m2 + delta ** 2 * self.count * batch_count / total, self.m2)
+        self.count = total
+
+    # Shrinks the weight of old samples, fitness is relative to the population so it drifts over generations
+    def decay(self, factor: float):
+        self.count *= factor
+        self.m2 *= factor
+
+    def variance(self, classes: np.ndarray) -> np.ndarray:
+        count = self.count[classes]
+        return np.where(count > 1, self.m2[classes] / np.maximum(count - 1, 1), np.nan)
+
+    # Pooled fitness estimate: the class mean when the class has been seen, otherwise the fallback
+    def estimate(self, classes: np.ndarray, fallback: np.ndarray) -> np.ndarray:
+        return np.where(self.count[classes] > 0, self.mean[classes], fallback)
+
+    def save(self, path: str):
+        np.savez(path, count=self.count, mean=self.mean, m2=self.m2)
+
+    @classmethod
+    def load(cls, path: str) -> "BehaviorFitnessCache":
+        cache = cls()
+        with np.load(path) as data:
+            cache.count, cache.mean, cache.m2 = data["count"], data["mean"], data["m2"]
+        return cache
@@ -1,16 +1,19 @@
 from Poker.player import Player
 import random
 import uuid
+import numpy as np
 # Using arithmetic crossover because of our real-valued parameters 
 # Returns a new player object
 def crossover(player1, player2) -> Player:
     alpha = 0.5 # Perfect average instead of weighing one's parents traits too highly 
     mutated_player = Player(str(uuid.uuid4())[:8])
-    mutated_player.traits = player1.traits.copy()
+    mutated_player.traits = {trait: alpha * player1.traits[trait] + (1 - alpha) * player2.traits[trait]
+                             for trait in player1.traits}
     mutated_player.parent1 = player1.name
     mutated_player.parent2 = player2.name
 
-    for trait in mutated_player.traits:
-        mutated_player.traits[trait] = alpha * player1.traits[trait] + (1 - alpha) * player2.traits[trait] 
+    return mutated_player
 
-    return mutated_player
\ No newline at end of file
+# Arithmetic crossover on trait matrices (one row per child)
+def arithmetic_crossover(traits1: np.ndarray, traits2: np.ndarray, alpha: float = 0.5) -> np.ndarray:
+    return alpha * traits1 + (1 - alpha) * traits2
@@ -1,4 +1,6 @@
-
+import numpy as np
+from Genetic_Algo.behavior import behavior_classes
+from Genetic_Algo.population import TRAITS
 # 3 metrics affects a players fitness value
 # rank_based_score which ranks player in a game (encourages players that have lasted longer)
 # the change in chips over time of the rounds they played (discourages players that have lost chips quicker)
@@ -10,20 +12,27 @@ def calculate_fitness(game):
         key=lambda p: (p.rounds_survived, p.chips.total_value()),
         reverse=True
     )
-    table_size = len(game.initial_players)
+
+    chip_growth = []
+    for p in player_rank:
+        # What was a players change in chip over the rounds that they've played 
+        delta_chip = p.chips.total_value() - p.initial_chips.total_value()
+        d_chip_per_round = delta_chip / max(1, p.rounds_survived)
+        chip_growth.append(d_chip_per_round / p.initial_chips.total_value())
+
+    _score_players(player_rank, chip_growth)
+
+# Scores a table that is already ranked best to worst, chip_growth is each player's normalized chip growth per round
+def _score_players(player_rank, chip_growth):
+    table_size = len(player_rank)
 
     # Lineage history | normalized chip growth | rank_bsed_score
     weights = (0.5, 0.3, 0.2)
 
-    for i, p in enumerate(player_rank):
+    for i, (p, normalized_chip_growth) in enumerate(zip(player_rank, chip_growth)):
         # Player who lasted longer get's a value closer to 1.0, player who didn't last closer to 0.0
         rank_based_score = (table_size - i - 1) / (table_size - 1)
 
-        # What was a players change in chip over the rounds that they've played 
-        delta_chip = p.chips.total_value() - p.initial_chips.total_value()
-        d_chip_per_round = delta_chip / max(1, p.rounds_survived)
-        normalized_chip_growth = d_chip_per_round / p.initial_chips.total_value()
-
         player_score = (rank_based_score + weights[1]) + (normalized_chip_growth * weights[0])
 
         # lineage fitness decays so that the current score affects the lineage line less
@@ -33,4 +42,20 @@ def calculate_fitness(game):
         p.fitness = (p.lineage_fitness * weights[0]) + (rank_based_score * weights[2]) + (normalized_chip_growth * weights[1])
         # print(f"calculating fitness for {p.name}: {p.lineage_fitness} {rank_based_score} {normalized_chip_growth} = {p.fitness}")
 
-
+# Estimates fitness for a table without playing it, using a precomputed behavior-class matchup matrix
+# Each player's expected chip delta per hand is what its class made in the matrix's mix of exactly the table's classes
+# if it has one, otherwise its average pairwise delta against everyone else at the table.
+# That stands in for both the ranking and the chip growth of calculate_fitness
+def estimate_fitness(players, matchup):
+    classes = behavior_classes(np.array([[p.traits[trait] for trait in TRAITS] for p in players]))
+    expected_delta = matchup.mix_chip_deltas(classes)
+    if expected_delta is None:
+        rows = matchup.rows(classes)
+        deltas = matchup.chip_delta[np.ix_(rows, rows)]
+        np.fill_diagonal(deltas, 0)
+        expected_delta = deltas.sum(axis=1) / max(1, len(players) - 1)
+
+    order = np.argsort(-expected_delta, kind="stable")
+    player_rank = [players[i] for i in order]
+    chip_growth = [expected_delta[i] / players[i].initial_chips.total_value() for i in order]
+    _score_players(player_rank, chip_growth)
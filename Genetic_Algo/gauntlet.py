@@ -0,0 +1,142 @@
+from Poker.player import Player
+from Poker.poker import TexasHoldem
+from Poker.deck import DealSequence
+from Genetic_Algo.behavior import behavior_classes, representative_traits
+from Genetic_Algo.GA_init import opponent_players
+from Genetic_Algo.population import Population, TRAITS
+from Sweep.file_lock import file_lock
+import numpy as np
+import pandas as pd
+import argparse
+import hashlib
+import json
+import os
+import random
+
+# Fixed benchmark: calculate_fitness only ranks players against whoever shares their table, so it drifts between
+# generations and can't be compared across combinations. The gauntlet is the same for everyone: a player of each
+# behavior class plays heads up against a fixed lineup, the hall of fame (stored genomes) and baseline bots
+# (Poker.player.STRATEGIES), num_hands hands each on seeded deals with the stacks reset every hand.
+# Its score is the average chip delta per hand as a share of the starting stack.
+# Every genome of a class plays exactly like the class (see behavior.py), so scores are cached by class id,
+# on disk and keyed by the lineup, hands and seed: a class is only ever played once per gauntlet,
+# whichever generation, run or combination meets it first.
+class Gauntlet:
+    # hall_of_fame: trait matrix (N x TRAITS), bots: strategy names
+    def __init__(self, hall_of_fame: np.ndarray, bots, num_hands: int, seed: int, cache_folder: str = None):
+        self.hall_of_fame = np.asarray(hall_of_fame, dtype=float).reshape(-1, len(TRAITS))
+        self.bots = list(bots)
+        self.num_hands = num_hands
+        self.seed = seed
+        self.scores_by_class = {}
+        # Classes played since the cache was last saved
+        self.played = 0
+        self.path = None
+        if cache_folder is not None:
+            os.makedirs(cache_folder, exist_ok=True)
+            self.path = os.path.join(cache_folder, f"gauntlet_{self.key()}.npz")
+            self.load_cache()
+
+    def key(self) -> str:
+        settings = {
+            "hall_of_fame": self.hall_of_fame.tolist(),
+            "bots": self.bots,
+            "num_hands": self.num_hands,
+            "seed": self.seed
+        }
+        return hashlib.sha1(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:16]
+
+    # A fresh lineup, the bots' own generators are seeded from the global random state
+    def opponents(self):
+        hall_of_fame = [Player(f"hall_of_fame_{i}", traits=dict(zip(TRAITS, row))) for i, row in enumerate(self.hall_of_fame.tolist())]
+        return hall_of_fame + opponent_players({name: 1 for name in self.bots})
+
+    def play(self, class_id: int) -> float:
+        state = random.getstate()
+        random.seed(self.seed)
+
+        player = Player(f"class_{class_id}", traits=representative_traits(class_id))
+        chip_delta = []
+        for n, opponent in enumerate(self.opponents()):
+            game = TexasHoldem([player, opponent], DealSequence(self.seed + n))
+            total = 0
+            for _ in range(self.num_hands):
+                for p in (player, opponent):
+                    p.chips = p.initial_chips.copy()
+                # Busted players are dropped from game.players, bring both back for the next hand
+                game.players = list(game.initial_players)
+                game.play()
+                total += player.chips.total_value() - player.initial_chips.total_value()
+            chip_delta.append(total / self.num_hands)
+
+        random.setstate(state)
+        return float(np.mean(chip_delta)) / player.initial_chips.total_value() if chip_delta else 0.0
+
+    # Gauntlet score per class id, only classes that aren't cached yet are played
+    def scores(self, classes) -> np.ndarray:
+        classes = np.asarray(classes, dtype=int)
+        for class_id in np.unique(classes).tolist():
+            if class_id not in self.scores_by_class:
+                self.scores_by_class[class_id] = self.play(class_id)
+                self.played += 1
+        return np.array([self.scores_by_class[class_id] for class_id in classes.tolist()])
+
+    def load_cache(self):
+        if self.path is not None and os.path.exists(self.path):
+            with np.load(self.path) as data:
+                self.scores_by_class.update(zip(data["classes"].tolist(), data["scores"].tolist()))
+
+    # Writes newly played classes to the cache file, merged with whatever other runs have added meanwhile
+    def save_cache(self):
+        if self.path is None or self.played == 0:
+            return
+        with file_lock(self.path + ".lock"):
+            mine = dict(self.scores_by_class)
+            self.load_cache()
+            self.scores_by_class.update(mine)
+            classes = np.array(sorted(self.scores_by_class), dtype=int)
+            np.savez(self.path + ".tmp.npz", classes=classes, scores=np.array([self.scores_by_class[c] for c in classes.tolist()]))
+            os.replace(self.path + ".tmp.npz", self.path)
+        self.played = 0
+
+# Gauntlet columns for population_stats: the score of the population's mean, its best and its fittest individual,
+# and how many classes had to be played for it
+def gauntlet_stats(gauntlet: Gauntlet, population: Population) -> dict:
+    played = gauntlet.played
+    scores = gauntlet.scores(behavior_classes(population.traits))
+    stats = {
+        "gauntlet_mean": scores.mean(),
+        "gauntlet_max": scores.max(),
+        "gauntlet_fittest": scores[np.argmax(population.fitness)],
+        "gauntlet_classes_played": gauntlet.played - played
+    }
+    gauntlet.save_cache()
+    return stats
+
+def load_hall_of_fame(path: str) -> np.ndarray:
+    return np.load(path) if path is not None and os.path.exists(path) else np.zeros((0, len(TRAITS)))
+
+# Hall of fame from finished runs: the top fittest individuals of the last generation of every lineage_history CSV,
+# one genome per behavior class
+def build_hall_of_fame(paths, top: int) -> np.ndarray:
+    genomes = []
+    for path in paths:
+        lineage_history = pd.read_csv(path)
+        last = lineage_history[lineage_history["generation"] == lineage_history["generation"].iloc[-1]]
+        genomes.append(last.nlargest(top, "fitness")[[f"trait_{trait}" for trait in TRAITS]].to_numpy())
+    genomes = np.concatenate(genomes) if genomes else np.zeros((0, len(TRAITS)))
+    if len(genomes) == 0:
+        return genomes
+    _, first = np.unique(behavior_classes(genomes), return_index=True)
+    return genomes[np.sort(first)]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the gauntlet's hall of fame from finished runs")
+    parser.add_argument("out", help="where to write the hall of fame (.npy)")
+    parser.add_argument("lineage_history", nargs="+", help="lineage_history CSVs to take the genomes from")
+    parser.add_argument("--top", type=int, default=1, help="fittest individuals of each run's last generation")
+    args = parser.parse_args()
+
+    hall_of_fame = build_hall_of_fame(args.lineage_history, args.top)
+    np.save(args.out, hall_of_fame)
+    print(f"{len(hall_of_fame)} genomes in the hall of fame")
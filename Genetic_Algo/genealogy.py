@@ -0,0 +1,99 @@
+from Genetic_Algo.population import Population
+from Sweep.stream import StreamWriter
+import numpy as np
+import pandas as pd
+import argparse
+
+# Genealogy of a run: one fixed-size record per individual per generation with its integer id, the ids of its
+# parents (-1 for none) and its lineage, so ancestry can be followed with array lookups instead of joining names
+# across CSVs. Records are streamed to disk as the run goes (a .npy file at the end, see save_genealogy).
+RECORD = np.dtype([
+    ("generation", np.int32),
+    ("id", np.int64),
+    ("parent1", np.int64),
+    ("parent2", np.int64),
+    # lineage strings are str(uuid.uuid4())[:12]
+    ("lineage", "S12"),
+    ("fitness", np.float64)
+])
+
+class GenealogyStream(StreamWriter):
+    def write(self, generation, population: Population):
+        records = np.empty(len(population), RECORD)
+        records["generation"] = generation
+        records["id"] = population.ids
+        records["parent1"] = population.parent_ids[:, 0]
+        records["parent2"] = population.parent_ids[:, 1]
+        records["lineage"] = population.lineage.astype("S12")
+        records["fitness"] = population.fitness
+        self.file.write(records.tobytes())
+        self.file.flush()
+
+# Turns a finished stream into a .npy file (loads with np.load, or memory mapped)
+def save_genealogy(stream_path: str, path: str):
+    np.save(path, np.fromfile(stream_path, RECORD))
+
+class Genealogy:
+    def __init__(self, records: np.ndarray):
+        self.generation = records["generation"]
+        self.ids = records["id"]
+        self.parents = np.stack([records["parent1"], records["parent2"]], axis=1)
+        self.fitness = records["fitness"]
+        # Lineages as integers, lineage_names[lineage] is the original string
+        self.lineage_names, self.lineage = np.unique(records["lineage"], return_inverse=True)
+        # Record of every id (-1 for ids that never made it into a generation)
+        self.rows = np.full(self.ids.max() + 1, -1, dtype=np.int64)
+        self.rows[self.ids] = np.arange(len(self.ids))
+
+    @classmethod
+    def load(cls, path: str) -> "Genealogy":
+        return cls(np.load(path))
+
+    # Id of the fittest individual of a generation (the last one by default)
+    def best(self, generation: int = None) -> int:
+        if generation is None:
+            generation = self.generation.max()
+        rows = np.flatnonzero(self.generation == generation)
+        return int(self.ids[rows[np.argmax(self.fitness[rows])]])
+
+    # Ids of every ancestor of the given ids, one step per generation back
+    def ancestors(self, ids) -> np.ndarray:
+        seen = np.zeros(len(self.rows), dtype=bool)
+        frontier = np.atleast_1d(np.asarray(ids, dtype=np.int64))
+        while len(frontier):
+            parents = self.parents[self.rows[frontier]].ravel()
+            parents = np.unique(parents[parents >= 0])
+            frontier = parents[~seen[parents]]
+            seen[frontier] = True
+        return np.flatnonzero(seen)
+
+    # Number of distinct lineages in every generation
+    def lineages_alive(self) -> pd.DataFrame:
+        pairs = np.unique(np.stack([self.generation, self.lineage], axis=1), axis=0)
+        generations, counts = np.unique(pairs[:, 0], return_counts=True)
+        return pd.DataFrame({"generation": generations, "lineages": counts})
+
+    # Survival curve: share of lineages that lasted at least each number of generations
+    # (a lineage can't come back once it's gone, so it lasts from its first to its last generation)
+    def lineage_survival(self) -> pd.DataFrame:
+        first = np.full(len(self.lineage_names), np.iinfo(np.int32).max)
+        last = np.full(len(self.lineage_names), np.iinfo(np.int32).min)
+        np.minimum.at(first, self.lineage, self.generation)
+        np.maximum.at(last, self.lineage, self.generation)
+        lifespans = np.bincount(last - first + 1)
+        surviving = lifespans[::-1].cumsum()[::-1]
+        return pd.DataFrame({"generations": np.arange(1, len(surviving)), "surviving": surviving[1:] / len(first)})
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ancestry of the final best individual and lineage survival of a run")
+    parser.add_argument("path", help="a genealogy .npy file (<combination>/genealogy/genealogy_<i>.npy)")
+    args = parser.parse_args()
+
+    genealogy = Genealogy.load(args.path)
+    best = genealogy.best()
+    ancestors = genealogy.ancestors(best)
+    rows = genealogy.rows[ancestors]
+    print(f"Best individual of generation {genealogy.generation.max()}: id {best}, fitness {genealogy.fitness[genealogy.rows[best]]:.4f}")
+    print(f"{len(ancestors)} ancestors going back to generation {genealogy.generation[rows].min() if len(rows) else None}, "
+          f"from {len(np.unique(genealogy.lineage[rows]))} lineages")
+    print(genealogy.lineage_survival().to_string(index=False))
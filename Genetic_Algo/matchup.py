@@ -0,0 +1,123 @@
+from Poker.player import Player
+from Poker.poker import TexasHoldem
+from Genetic_Algo.behavior import canonical_classes, representative_traits
+from itertools import combinations
+from multiprocessing import Pool
+import numpy as np
+import argparse
+import random
+
+# Decisions only depend on the behavior class, so the set of distinct strategies is finite.
+# This tool plays every pair (and optionally every small-table mix) of classes for many seeded hands
+# and stores the win rate and chip delta per hand, so fitness can be estimated without playing.
+
+# Plays num_hands independent hands between one player of each class (stacks are reset every hand)
+# Returns each seat's fraction of hands that won chips and its average chip delta per hand
+def play_hands(classes, num_hands: int, seed: int):
+    state = random.getstate()
+    random.seed(seed)
+
+    players = []
+    for seat, class_id in enumerate(classes):
+        p = Player(f"seat{seat}_class{class_id}")
+        p.traits = representative_traits(class_id)
+        players.append(p)
+    game = TexasHoldem(players)
+
+    won = np.zeros(len(players))
+    chip_delta = np.zeros(len(players))
+    for _ in range(num_hands):
+        for p in players:
+            p.chips = p.initial_chips.copy()
+        # Busted players are dropped from game.players, bring everyone back for the next hand
+        game.players = list(game.initial_players)
+        game.play()
+        change = np.array([p.chips.total_value() - p.initial_chips.total_value() for p in players])
+        won += change > 0
+        chip_delta += change
+
+    random.setstate(state)
+    return won / num_hands, chip_delta / num_hands
+
+class MatchupMatrix:
+    def __init__(self, classes, win_rate, chip_delta, num_hands, seed, mixes=None, mix_win_rate=None, mix_chip_delta=None):
+        self.classes = np.asarray(classes)
+        # win_rate[i, j] / chip_delta[i, j] is how class i does heads up against class j
+        self.win_rate = win_rate
+        self.chip_delta = chip_delta
+        self.num_hands = num_hands
+        self.seed = seed
+        # Optional small-table mixes, one row per mix with one column per seat
+        self.mixes = mixes
+        self.mix_win_rate = mix_win_rate
+        self.mix_chip_delta = mix_chip_delta
+        self._index = {int(class_id): i for i, class_id in enumerate(self.classes)}
+        self._mix_index = {} if mixes is None else {tuple(sorted(mix)): n for n, mix in enumerate(np.asarray(mixes).tolist())}
+
+    # Matrix rows of the given behavior classes
+    def rows(self, classes) -> np.ndarray:
+        try:
+            return np.array([self._index[int(class_id)] for class_id in classes], dtype=int)
+        except KeyError as e:
+            raise ValueError(f"Behavior class {e.args[0]} is not in the matchup matrix") from None
+
+    # Chip delta per hand of every seat of a table whose classes were played together as a mix, None if they weren't
+    def mix_chip_deltas(self, classes):
+        n = self._mix_index.get(tuple(sorted(int(class_id) for class_id in classes)))
+        if n is None:
+            return None
+        seats = self.mixes[n].tolist()
+        return self.mix_chip_delta[n, [seats.index(int(class_id)) for class_id in classes]]
+
+    def save(self, path: str):
+        arrays = {
+            "classes": self.classes,
+            "win_rate": self.win_rate,
+            "chip_delta": self.chip_delta,
+            "num_hands": self.num_hands,
+            "seed": self.seed
+        }
+        if self.mixes is not None:
+            arrays.update(mixes=self.mixes, mix_win_rate=self.mix_win_rate, mix_chip_delta=self.mix_chip_delta)
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "MatchupMatrix":
+        with np.load(path) as data:
+            mixes = {key: data[key] for key in ("mixes", "mix_win_rate", "mix_chip_delta") if key in data}
+            return cls(data["classes"], data["win_rate"], data["chip_delta"], int(data["num_hands"]), int(data["seed"]), **mixes)
+
+# Plays every pair of classes (and every mix of mix_size distinct classes if given) for num_hands seeded hands
+# Matchups are independent, so they are spread over a process pool
+def build_matchup_matrix(classes=None, num_hands: int = 200, seed: int = 0, mix_size: int = None, processes: int = None) -> MatchupMatrix:
+    classes = canonical_classes() if classes is None else np.asarray(classes)
+    pairs = list(combinations(range(len(classes)), 2))
+    mixes = list(combinations(range(len(classes)), mix_size)) if mix_size else []
+    # Every matchup gets its own seed so results don't depend on the order they're played in
+    tasks = [([classes[i] for i in seats], num_hands, seed + n) for n, seats in enumerate(pairs + mixes)]
+
+    with Pool(processes) as pool:
+        results = pool.starmap(play_hands, tasks, chunksize=max(1, len(tasks) // (64 * (processes or 1))))
+
+    win_rate = np.zeros((len(classes), len(classes)))
+    chip_delta = np.zeros((len(classes), len(classes)))
+    for (i, j), (won, delta) in zip(pairs, results):
+        win_rate[i, j], win_rate[j, i] = won
+        chip_delta[i, j], chip_delta[j, i] = delta
+
+    if not mixes:
+        return MatchupMatrix(classes, win_rate, chip_delta, num_hands, seed)
+    mix_results = results[len(pairs):]
+    return MatchupMatrix(classes, win_rate, chip_delta, num_hands, seed, classes[np.array(mixes)],
+                         np.array([won for won, _ in mix_results]), np.array([delta for _, delta in mix_results]))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute the behavior-class matchup matrix")
+    parser.add_argument("path", help="where to write the .npz matrix")
+    parser.add_argument("--hands", type=int, default=200, help="seeded hands per matchup")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mix-size", type=int, default=None, help="also play every mix of this many classes, tables of exactly those classes are estimated from it")
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    build_matchup_matrix(num_hands=args.hands, seed=args.seed, mix_size=args.mix_size, processes=args.processes).save(args.path)
@@ -1,17 +1,27 @@
 from Poker.player import Player
 import uuid
 import random
+import numpy as np
 
 # Implement mutation strategy and return a player object
 # Mutation will take a player's traits and adjust them randomly by a random amount (0-0.9 in a circular way)
 def mutate(player: Player) -> Player:
     # mutated_player = Player(str(uuid.uuid4())[:8])
     mutated_player = player
-    mutated_player.traits = player.traits.copy()
-
-    for trait in mutated_player.traits:
+    # Traits are replaced as a whole (assigning them compiles the player's decision table)
+    traits = {}
+    for trait, value in player.traits.items():
         amnt_change_trait_by = random.random()
         # Circular wrap 
-        mutated_player.traits[trait] = (mutated_player.traits[trait] + amnt_change_trait_by) % 1.0
+        traits[trait] = (value + amnt_change_trait_by) % 1.0
+    mutated_player.traits = traits
+
+    return mutated_player
 
-    return mutated_player
\ No newline at end of file
+# Circular mutation on a trait matrix, only the rows selected by mask are changed
+# Returns a new matrix, the input is left untouched
+def circular_mutation(traits: np.ndarray, mask: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    mutated = traits.copy()
+    amnt_change_traits_by = rng.random((int(mask.sum()), traits.shape[1]))
+    mutated[mask] = (mutated[mask] + amnt_change_traits_by) % 1.0
+    return mutated
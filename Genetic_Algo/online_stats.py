@@ -0,0 +1,139 @@
+from Poker.player import Player, Action
+from Genetic_Algo.population import Population, TRAITS, ACTIONS
+from typing import List
+import numpy as np
+import math
+
+# Per-player values the population statistics are kept for, one column each
+STAT_COLUMNS = (("fitness", "rounds_lasted") + tuple(f"trait_{trait}" for trait in TRAITS)
+                + tuple(f"action_{action.name.lower()}" for action in ACTIONS))
+# Columns that only exist for tables that were actually played
+PLAYED_COLUMNS = ("rounds_lasted",) + tuple(f"action_{action.name.lower()}" for action in ACTIONS)
+
+# Rows of STAT_COLUMNS values for players that finished a table
+# played=False is for tables whose fitness was estimated rather than played: nobody lasted rounds or acted,
+# so rounds_lasted and the action columns are nan instead of 0
+def player_stat_values(players: List[Player], played: bool = True) -> np.ndarray:
+    values = np.array([[p.fitness, p.rounds_survived] + [p.traits[trait] for trait in TRAITS]
+                       + [p.actions_called[action] for action in Action] for p in players], dtype=float)
+    if not played:
+        values[:, [STAT_COLUMNS.index(column) for column in PLAYED_COLUMNS]] = np.nan
+    return values
+
+# The same rows from a population that has been played
+def population_stat_values(population: Population) -> np.ndarray:
+    return np.column_stack([population.fitness, population.rounds_survived, population.traits, population.actions]).astype(float)
+
+# Single-pass statistics of a stream of rows, fed a batch (e.g. a table's players) at a time:
+# count, mean and variance (Welford / Chan et al. batch updates), min, max and approximate quantiles.
+# Quantiles come from a log-bucketed histogram per column (as in DDSketch): every estimate is within
+# relative_accuracy of a value of the right rank, and buckets also keep their smallest and largest value,
+# so a bucket that only ever saw one value (say an action count of 3) gives it back exactly.
+# Two RunningStats over the same columns merge exactly, so tables played apart (other processes, other machines)
+# can be combined afterwards.
+# nan marks a missing value: every statistic of a column that has seen one is nan.
+class RunningStats:
+    def __init__(self, columns, relative_accuracy: float = 0.01):
+        self.columns = tuple(columns)
+        size = len(self.columns)
+        self.n = 0
+        self.mean = np.zeros(size)
+        self.m2 = np.zeros(size)
+        self.min = np.full(size, np.inf)
+        self.max = np.full(size, -np.inf)
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        # Buckets per column for positive values and negative values (by magnitude), key -> [count, lowest, highest]
+        self.positive = [{} for _ in range(size)]
+        self.negative = [{} for _ in range(size)]
+        self.zeros = np.zeros(size, dtype=np.int64)
+        self.missing = np.zeros(size, dtype=np.int64)
+
+    def add(self, values: np.ndarray):
+        values = np.asarray(values, dtype=float).reshape(-1, len(self.columns))
+        count = len(values)
+        if count == 0:
+            return
+        batch_mean = values.mean(axis=0)
+        self._combine(count, batch_mean, ((values - batch_mean) ** 2).sum(axis=0), values.min(axis=0), values.max(axis=0))
+
+        self.zeros += (values == 0).sum(axis=0)
+        missing = np.isnan(values)
+        self.missing += missing.sum(axis=0)
+        # Every nonzero value's (column, sign, bucket) packed into one integer, so one np.unique sorts them all out
+        rows, columns = np.nonzero((values != 0) & ~missing)
+        magnitudes = np.abs(values[rows, columns])
+        buckets = np.ceil(np.log(magnitudes) / math.log(self.gamma)).astype(np.int64)
+        negative = values[rows, columns] < 0
+        packed = ((columns * 2 + negative) << 32) + (buckets + (1 << 31))
+        keys, inverse, counts = np.unique(packed, return_inverse=True, return_counts=True)
+        lowest = np.full(len(keys), np.inf)
+        highest = np.full(len(keys), -np.inf)
+        np.minimum.at(lowest, inverse, magnitudes)
+        np.maximum.at(highest, inverse, magnitudes)
+        for key, bucket in zip(keys.tolist(), zip(counts.tolist(), lowest.tolist(), highest.tolist())):
+            column, sign = divmod(key >> 32, 2)
+            store = self.negative[column] if sign else self.positive[column]
+            self._add_bucket(store, (key & 0xFFFFFFFF) - (1 << 31), bucket)
+
+    def merge(self, other: "RunningStats"):
+        if other.columns != self.columns or other.gamma != self.gamma:
+            raise ValueError("Can only merge statistics over the same columns and accuracy")
+        if other.n == 0:
+            return
+        self._combine(other.n, other.mean, other.m2, other.min, other.max)
+        self.zeros += other.zeros
+        self.missing += other.missing
+        for stores, other_stores in ((self.positive, other.positive), (self.negative, other.negative)):
+            for store, other_store in zip(stores, other_stores):
+                for key, bucket in other_store.items():
+                    self._add_bucket(store, key, bucket)
+
+    @staticmethod
+    def _add_bucket(store: dict, key: int, bucket):
+        count, lowest, highest = bucket
+        if key in store:
+            previous = store[key]
+            store[key] = [previous[0] + count, min(previous[1], lowest), max(previous[2], highest)]
+        else:
+            store[key] = [count, lowest, highest]
+
+    def _combine(self, count, mean, m2, minimum, maximum):
+        total = self.n + count
+        delta = mean - self.mean
+        self.mean = self.mean + delta * count / total
+        self.m2 = self.m2 + m2 + delta ** 2 * self.n * count / total
+        self.n = total
+        self.min = np.minimum(self.min, minimum)
+        self.max = np.maximum(self.max, maximum)
+
+    # Sample variance, like np.var(ddof=1) (nan with fewer than 2 rows)
+    def variance(self) -> np.ndarray:
+        return self.m2 / (self.n - 1) if self.n > 1 else np.full(len(self.columns), np.nan)
+
+    def std(self) -> np.ndarray:
+        return np.sqrt(self.variance())
+
+    # Approximate q-quantile (0 <= q <= 1) of every column
+    def quantile(self, q: float) -> np.ndarray:
+        estimates = np.full(len(self.columns), np.nan)
+        if self.n == 0:
+            return estimates
+        rank = q * (self.n - 1)
+        for column in range(len(self.columns)):
+            if self.missing[column]:
+                continue
+            # Buckets from the lowest values up: negatives by falling magnitude, zeros, positives by rising magnitude
+            buckets = ([(-self._value(key, bucket), bucket[0]) for key, bucket in sorted(self.negative[column].items(), reverse=True)]
+                       + [(0.0, int(self.zeros[column]))]
+                       + [(self._value(key, bucket), bucket[0]) for key, bucket in sorted(self.positive[column].items())])
+            seen = 0
+            for value, count in buckets:
+                seen += count
+                if seen > rank:
+                    estimates[column] = value
+                    break
+        return estimates
+
+    # Magnitude every member of a bucket is estimated as: the middle of the bucket, within what it has seen
+    def _value(self, key: int, bucket) -> float:
+        return min(max(2 * self.gamma ** key / (self.gamma + 1), bucket[1]), bucket[2])
@@ -0,0 +1,136 @@
+from Poker.player import Player, PlayerPool, Action
+from Genetic_Algo.selection import tournament_selection_indices
+from Genetic_Algo.crossover import arithmetic_crossover
+from Genetic_Algo.mutation import circular_mutation
+from typing import List
+import numpy as np
+import uuid
+
+# Trait columns of the population matrix, same order as Player.initialize_traits
+TRAITS = ("aggressiveness", "risk_tolerance", "bluff_tendency", "position_awareness", "chip_size_awareness")
+# Action columns of the actions matrix
+ACTIONS = tuple(Action)
+
+# Makes ids in the same format as str(uuid.uuid4())[:length], but drawn from rng so runs can be seeded
+def new_ids(rng: np.random.Generator, size: int, length: int) -> np.ndarray:
+    raw = rng.bytes(16 * size)
+    return np.array([str(uuid.UUID(bytes=raw[i * 16:(i + 1) * 16], version=4))[:length] for i in range(size)], dtype=object)
+
+# Struct-of-arrays population
+# Every individual is a row: traits is (N x traits), parent_ids is (N x 2), everything else is a length N array
+# Player objects are only made when the population is seated at a table (to_players)
+# ids are integers unique within a run, parent_ids are the ids the individual was bred from (-1 for none)
+class Population:
+    def __init__(self, traits: np.ndarray, names: np.ndarray, lineage: np.ndarray, lineage_fitness: np.ndarray = None,
+                 fitness: np.ndarray = None, parent1: np.ndarray = None, parent2: np.ndarray = None,
+                 ids: np.ndarray = None, parent_ids: np.ndarray = None):
+        size = len(traits)
+        self.traits = np.asarray(traits, dtype=float)
+        self.names = names
+        self.lineage = lineage
+        self.lineage_fitness = np.zeros(size) if lineage_fitness is None else lineage_fitness
+        self.fitness = np.zeros(size) if fitness is None else fitness
+        self.parent1 = np.full(size, None, dtype=object) if parent1 is None else parent1
+        self.parent2 = np.full(size, None, dtype=object) if parent2 is None else parent2
+        self.ids = np.arange(size, dtype=np.int64) if ids is None else ids
+        self.parent_ids = np.full((size, 2), -1, dtype=np.int64) if parent_ids is None else parent_ids
+
+        # Filled in by collect() once the population has been played
+        self.rounds_survived = np.zeros(size, dtype=int)
+        self.actions = np.zeros((size, len(ACTIONS)), dtype=int)
+        self.positions = np.full(size, -1, dtype=int)
+
+    def __len__(self):
+        return len(self.traits)
+
+    @classmethod
+    def random(cls, size: int, rng: np.random.Generator) -> "Population":
+        # Rounded to 2 decimals like Player.initialize_traits
+        traits = np.round(rng.uniform(0, 1, (size, len(TRAITS))), 2)
+        return cls(traits, new_ids(rng, size, 8), new_ids(rng, size, 12))
+
+    @classmethod
+    def from_players(cls, players: List[Player]) -> "Population":
+        population = cls(
+            np.array([[p.traits[trait] for trait in TRAITS] for p in players], dtype=float),
+            np.array([p.name for p in players], dtype=object),
+            np.array([p.lineage for p in players], dtype=object),
+            np.array([p.lineage_fitness for p in players], dtype=float),
+            np.array([p.fitness for p in players], dtype=float),
+            np.array([p.parent1 for p in players], dtype=object),
+            np.array([p.parent2 for p in players], dtype=object),
+        )
+        population.collect(players)
+        return population
+
+    # New population made of the given rows
+    def subset(self, rows: np.ndarray) -> "Population":
+        population = Population(self.traits[rows], self.names[rows], self.lineage[rows], self.lineage_fitness[rows],
+                                self.fitness[rows], self.parent1[rows], self.parent2[rows], self.ids[rows], self.parent_ids[rows])
+        population.rounds_survived = self.rounds_survived[rows]
+        population.actions = self.actions[rows]
+        population.positions = self.positions[rows]
+        return population
+
+    # Materialize the players for a table, the returned list lines up with the population rows
+    # pool: a PlayerPool to take the Player objects from instead of making new ones
+    def to_players(self, pool: PlayerPool = None) -> List[Player]:
+        players = []
+        for i in range(len(self)):
+            traits = dict(zip(TRAITS, self.traits[i].tolist()))
+            p = Player(self.names[i], traits=traits) if pool is None else pool.acquire(self.names[i], traits)
+            p.lineage = self.lineage[i]
+            p.lineage_fitness = float(self.lineage_fitness[i])
+            p.fitness = float(self.fitness[i])
+            p.parent1 = self.parent1[i]
+            p.parent2 = self.parent2[i]
+            players.append(p)
+        return players
+
+    # Read the results of a simulation back from the players made by to_players
+    def collect(self, players: List[Player]):
+        self.fitness = np.array([p.fitness for p in players], dtype=float)
+        self.lineage_fitness = np.array([p.lineage_fitness for p in players], dtype=float)
+        self.rounds_survived = np.array([p.rounds_survived for p in players], dtype=int)
+        self.actions = np.array([[p.actions_called[action] for action in ACTIONS] for p in players], dtype=int)
+        self.positions = np.array([-1 if p.position is None else p.position for p in players], dtype=int)
+
+# Builds the next generation in a handful of array operations
+# Mirrors the per-player loop: two tournaments per child, arithmetic crossover or a copy of one parent,
+# lineage from the fitter parent, then circular mutation which starts a new lineage
+# fitness overrides the scores used for selection (defaults to population.fitness)
+# num_children defaults to the population size
+def evolve(population: Population, tournament_k: int, crossover_probability: float, mutation_probability: float,
+           rng: np.random.Generator, fitness: np.ndarray = None, num_children: int = None) -> Population:
+    size = len(population) if num_children is None else num_children
+    if fitness is None:
+        fitness = population.fitness
+    parent1 = tournament_selection_indices(tournament_k, fitness, size, rng)
+    parent2 = tournament_selection_indices(tournament_k, fitness, size, rng)
+
+    crossed = rng.random(size) < crossover_probability
+    # Children that are copies come from either parent with equal chance
+    copied_from = np.where(rng.random(size) < 0.5, parent1, parent2)
+
+    traits = np.where(crossed[:, None],
+                      arithmetic_crossover(population.traits[parent1], population.traits[parent2]),
+                      population.traits[copied_from])
+    # Crossover children start from scratch, copies keep the parent's scores
+    lineage_fitness = np.where(crossed, 0.0, population.lineage_fitness[copied_from])
+    child_fitness = np.where(crossed, 0.0, population.fitness[copied_from])
+    child_parent1 = np.where(crossed, population.names[parent1], population.parent1[copied_from])
+    child_parent2 = np.where(crossed, population.names[parent2], population.parent2[copied_from])
+    # Children get ids after every id so far, a copy's only parent is the one it was copied from
+    ids = population.ids.max() + 1 + np.arange(size, dtype=np.int64)
+    parent_ids = np.where(crossed[:, None], np.stack([population.ids[parent1], population.ids[parent2]], axis=1),
+                          np.stack([population.ids[copied_from], np.full(size, -1, dtype=np.int64)], axis=1))
+
+    fitter_parent = np.where(fitness[parent1] >= fitness[parent2], parent1, parent2)
+    lineage = population.lineage[fitter_parent].copy()
+
+    mutated = rng.random(size) < mutation_probability
+    traits = circular_mutation(traits, mutated, rng)
+    lineage[mutated] = new_ids(rng, int(mutated.sum()), 12)
+
+    return Population(traits, new_ids(rng, size, 8), lineage, lineage_fitness, child_fitness, child_parent1, child_parent2,
+                      ids, parent_ids)
@@ -0,0 +1,105 @@
+from Poker.player import Player, Action
+from Poker.deck import DealSequence
+from Genetic_Algo.GA_init import run_sim, play_table, reset_for_table
+from typing import List
+from math import comb
+import numpy as np
+import random
+
+# Fitness where tournament selection stops caring
+# A tournament of k out of N is won by someone in the top m with probability 1 - C(N-m, k) / C(N, k),
+# the boundary sits between the m-th and (m+1)-th best once that probability reaches `coverage`
+def selection_boundary(fitness: np.ndarray, k: int, coverage: float = 0.9) -> float:
+    ranked = np.sort(fitness)[::-1]
+    size = len(ranked)
+    for m in range(1, size):
+        if 1 - comb(size - m, k) / comb(size, k) >= coverage:
+            return (ranked[m - 1] + ranked[m]) / 2
+    return ranked[-1]
+
+# Racing evaluation: every player gets two tables like run_sim (with other tablemates the second time), so every
+# confidence interval comes from the player's own spread, then only the players whose interval still straddles the
+# selection boundary get extra seeded tables, until none are left or the hand budget runs out.
+# Contenders never make up more than half a table, the other seats go to randomly picked resolved players,
+# so they're scored against the same kind of field as everyone else.
+# Results are averaged over every table a player sat at.
+def run_sim_racing(players: List[Player], max_player_per_game: int, round_cutoff: int, tournament_k: int,
+                   hand_budget: int, z: float = 1.96, stats: dict = None):
+    start_lineage_fitness = [p.lineage_fitness for p in players]
+    samples = [[] for _ in players]
+    positions = [None for _ in players]
+
+    def record(indices):
+        for i in indices:
+            p = players[i]
+            samples[i].append((p.fitness, p.lineage_fitness, p.rounds_survived, [p.actions_called[action] for action in Action]))
+            if positions[i] is None:
+                positions[i] = p.position
+
+    def reset(indices):
+        for i in indices:
+            reset_for_table(players[i])
+            players[i].lineage_fitness = start_lineage_fitness[i]
+
+    hands = 0
+    for full_round in range(2):
+        if hands >= hand_budget:
+            break
+        seating = list(range(len(players)))
+        if full_round > 0:
+            random.shuffle(seating)
+            reset(seating)
+        sim_stats = {}
+        run_sim([players[i] for i in seating], max_player_per_game, round_cutoff, stats=sim_stats)
+        record(seating)
+        hands += sim_stats["hands_played"]
+    extra_tables = 0
+    contenders = np.arange(len(players))
+
+    while hands < hand_budget:
+        fitness = [np.array([sample[0] for sample in player_samples]) for player_samples in samples]
+        means = np.array([f.mean() for f in fitness])
+        counts = np.array([len(f) for f in fitness])
+        variances = np.array([f.var(ddof=1) for f in fitness])
+        half_width = z * np.sqrt(variances / counts)
+
+        boundary = selection_boundary(means, tournament_k)
+        contenders = np.flatnonzero(np.abs(means - boundary) < half_width)
+        if len(contenders) == 0:
+            break
+
+        # Half of every table (or all of it when nobody is resolved) goes to contenders, the rest to resolved players
+        order = list(contenders)
+        random.shuffle(order)
+        contender_set = set(contenders)
+        others = [i for i in range(len(players)) if i not in contender_set]
+        contender_seats = max(1, max_player_per_game // 2) if others else max_player_per_game
+        tables_before = extra_tables
+        for start in range(0, len(order), contender_seats):
+            if hands >= hand_budget:
+                break
+            table = order[start:start + contender_seats]
+            table += random.sample(others, min(len(others), max_player_per_game - len(table)))
+            if len(table) < 2:
+                continue
+            reset(table)
+            hands += play_table([players[i] for i in table], round_cutoff, DealSequence(random.getrandbits(32))).hands_dealt
+            record(table)
+            extra_tables += 1
+        if extra_tables == tables_before:
+            break
+
+    for i, p in enumerate(players):
+        fitness, lineage_fitness, rounds, actions = zip(*samples[i])
+        p.fitness = float(np.mean(fitness))
+        p.lineage_fitness = float(np.mean(lineage_fitness))
+        p.rounds_survived = int(round(np.mean(rounds)))
+        p.actions_called = {action: int(round(count)) for action, count in zip(Action, np.mean(actions, axis=0))}
+        p.position = positions[i]
+
+    if stats is not None:
+        stats["hands_played"] = hands
+        stats["hand_budget"] = hand_budget
+        stats["racing_extra_tables"] = extra_tables
+        stats["racing_unresolved"] = len(contenders)
+    return players
@@ -1,7 +1,19 @@
 from Poker.player import Player
 import random
+import numpy as np
 #Select a random group of k players within population List[Player] and within that return the player with the best fitness
 def tournament_selection(k, population) -> Player:
     randomly_chosen_players = random.sample(population, k)
     # Chooses and returns player with highest fitness score
-    return max(randomly_chosen_players, key=lambda player: player.fitness)
\ No newline at end of file
+    return max(randomly_chosen_players, key=lambda player: player.fitness)
+
+# Vectorized tournament selection over a fitness array
+# Runs num_tournaments tournaments at once, each drawing k distinct individuals, and returns the winners' indices
+def tournament_selection_indices(k, fitness: np.ndarray, num_tournaments: int, rng: np.random.Generator) -> np.ndarray:
+    population_size = len(fitness)
+    if k > population_size or k < 0:
+        raise ValueError("Sample larger than population or is negative")
+    # Sorting a row of random keys gives a random permutation, the first k columns are a sample without replacement
+    contestants = np.argsort(rng.random((num_tournaments, population_size)), axis=1)[:, :k]
+    winners = np.argmax(fitness[contestants], axis=1)
+    return contestants[np.arange(num_tournaments), winners]
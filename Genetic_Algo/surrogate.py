@@ -0,0 +1,60 @@
+from Genetic_Algo.population import Population
+from Genetic_Algo.behavior import trait_levels, LEVEL_SIZES
+from collections import deque
+import numpy as np
+
+# Cheap trait vector -> fitness regression used to pre-screen offspring before they take a seat at a table
+# Decisions are piecewise constant in the traits, so besides the raw traits the model gets a one-hot
+# of every trait's threshold level, then it's plain ridge regression
+class SurrogateModel:
+    def __init__(self, window: int = 5, ridge: float = 1.0):
+        # Fitness is relative to the population, so only the last `window` generations are trained on
+        self.history = deque(maxlen=window)
+        self.ridge = ridge
+        self.weights = None
+
+    @staticmethod
+    def features(traits: np.ndarray) -> np.ndarray:
+        levels = trait_levels(traits)
+        one_hot = [levels[:, i:i + 1] == np.arange(size) for i, size in enumerate(LEVEL_SIZES)]
+        return np.hstack([np.ones((len(traits), 1)), traits] + one_hot).astype(float)
+
+    # Add one evaluated generation (the same traits and fitness that go into lineage_history)
+    def add(self, traits: np.ndarray, fitness: np.ndarray):
+        self.history.append((traits.copy(), fitness.copy()))
+
+    def fit(self):
+        x = self.features(np.vstack([traits for traits, _ in self.history]))
+        y = np.concatenate([fitness for _, fitness in self.history])
+        penalty = self.ridge * np.eye(x.shape[1])
+        penalty[0, 0] = 0  # don't shrink the intercept
+        self.weights = np.linalg.solve(x.T @ x + penalty, x.T @ y)
+
+    @property
+    def fitted(self) -> bool:
+        return self.weights is not None
+
+    def predict(self, traits: np.ndarray) -> np.ndarray:
+        return self.features(traits) @ self.weights
+
+# Keeps `keep` of the candidates: mostly the best predicted, plus a random share of the rest
+# so the model can't lock the search into the regions it already likes
+# Returns the kept population and the predictions for it
+def screen_offspring(candidates: Population, surrogate: SurrogateModel, keep: int, exploration: float,
+                     rng: np.random.Generator):
+    predicted = surrogate.predict(candidates.traits)
+    order = np.argsort(-predicted, kind="stable")
+    num_explore = min(int(round(keep * exploration)), len(candidates) - keep)
+    best = order[:keep - num_explore]
+    explore = rng.choice(order[keep - num_explore:], size=num_explore, replace=False)
+    rows = np.concatenate([best, explore])
+    return candidates.subset(rows), predicted[rows]
+
+# How well the predictions made before play matched the real fitness
+def surrogate_accuracy(predicted: np.ndarray, fitness: np.ndarray) -> dict:
+    # Spearman rank correlation, selection only cares about the order
+    ranks = lambda values: np.argsort(np.argsort(values))
+    return {
+        "surrogate_rank_corr": np.corrcoef(ranks(predicted), ranks(fitness))[0, 1],
+        "surrogate_mae": np.abs(predicted - fitness).mean()
+    }
@@ -0,0 +1,90 @@
+from Poker.player import (Action, HIGH_TRAIT_THRESHOLD, MID_TRAIT_THRESHOLD, POSITION_THRESHOLD, SMALL_BET, DEEP_STACK,
+                          level_policy)
+from Poker.chip import Chips
+from itertools import product
+import numpy as np
+
+# The trait strategy (Player.make_decision) for every seat that's to act at once, across any number of tables: arrays in, arrays out.
+# It gathers from the same compiled tables as the object path (see compile_policy), stacked into arrays,
+# so both decide exactly alike (python -m Poker.decision_check checks it).
+
+# Columns of the traits matrix, in Player.initialize_traits order
+TRAIT_COLUMNS = ("aggressiveness", "risk_tolerance", "bluff_tendency", "position_awareness", "chip_size_awareness")
+# Columns of the chip_counts matrix, the order raises are counted out in (ChipStash.chips_for)
+CHIP_VALUES = np.array([Chips.Black, Chips.Blue, Chips.Green, Chips.Red, Chips.White])
+
+_LEVEL_SIZES = np.array([3, 3, 3, 2, 3])
+# Mixed radix place value of every trait level in the policy id
+_PLACE = np.concatenate([np.cumprod(_LEVEL_SIZES[::-1])[::-1][1:], [1]])
+_POSITION = TRAIT_COLUMNS.index("position_awareness")
+
+# Every compiled table, one row per policy id: action (Action value), raise multiple, chip size adjustment, dealer bonus
+_TABLES = [level_policy(levels) for levels in product(*(range(size) for size in _LEVEL_SIZES))]
+ACTION_TABLE = np.array([[entry[0].value for entry in table] for table in _TABLES])
+MULTIPLE_TABLE, ADJUSTMENT_TABLE, DEALER_BONUS_TABLE = (np.array([[entry[field] for entry in table] for table in _TABLES])
+                                                        for field in (1, 2, 3))
+
+# Trait matrix (N x TRAIT_COLUMNS) -> row of the tables per player
+def policy_ids(traits: np.ndarray) -> np.ndarray:
+    traits = np.atleast_2d(traits)
+    levels = (traits >= MID_TRAIT_THRESHOLD).astype(int) + (traits >= HIGH_TRAIT_THRESHOLD)
+    levels[:, _POSITION] = traits[:, _POSITION] > POSITION_THRESHOLD
+    return levels @ _PLACE
+
+# spot_index over arrays
+def spot_indices(hand_rank, community_count, stack, to_call, is_dealer) -> np.ndarray:
+    hand = (np.asarray(hand_rank) >= 4).astype(int) + (np.asarray(hand_rank) >= 7)
+    street = (np.asarray(community_count) > 3).astype(int)
+    stack = (np.asarray(stack) >= SMALL_BET).astype(int) + (np.asarray(stack) >= DEEP_STACK)
+    facing = (np.asarray(to_call) > 0).astype(int) + (np.asarray(to_call) >= SMALL_BET)
+    return (((hand * 2 + street) * 3 + stack) * 3 + facing) * 2 + np.asarray(is_dealer, dtype=int)
+
+# Whether each amount can be counted out exactly from the chips (largest chips first, like ChipStash.chips_for)
+def can_pay_exactly(chip_counts: np.ndarray, amounts: np.ndarray) -> np.ndarray:
+    remaining = np.asarray(amounts).copy()
+    for column, chip_value in enumerate(CHIP_VALUES):
+        remaining -= np.minimum(chip_counts[:, column], np.maximum(remaining, 0) // chip_value) * chip_value
+    return remaining <= 0
+
+# One decision per row, for players still in the hand (folded ones don't decide):
+# traits: N x TRAIT_COLUMNS, hand_rank: Eval rank of hand + community cards, to_call: the bet faced,
+# min_raise: the minimum raise, stack: the player's chips, community_count: cards on the table,
+# is_dealer: whether the player deals, raised: whether they raised already this round (default: nobody),
+# all in dollars. chip_counts (N x CHIP_VALUES) is what the player's stack is made of: a raise the chips can't
+# make exactly is a call instead. Without it every raise is taken to be payable.
+# Returns the actions (Action values, bluffs come out as raises like make_decision's) and the amounts:
+# the raise for raises, to_call for calls and 0 for checks and folds
+def decide(traits, hand_rank, to_call, min_raise, stack, community_count, is_dealer, raised=None, chip_counts=None):
+    to_call = np.asarray(to_call, dtype=np.int64)
+    stack = np.asarray(stack, dtype=np.int64)
+    policies = policy_ids(traits)
+    spots = spot_indices(hand_rank, community_count, stack, to_call, is_dealer)
+    actions = ACTION_TABLE[policies, spots]
+    multiple = MULTIPLE_TABLE[policies, spots]
+    adjustment = ADJUSTMENT_TABLE[policies, spots]
+    dealer_bonus = DEALER_BONUS_TABLE[policies, spots]
+    amounts = np.where(actions == Action.CALL.value, to_call, 0)
+
+    raising = multiple > 0
+    raise_amounts = np.asarray(min_raise, dtype=np.int64) * multiple
+    # Can't cover the raise: fold
+    folding = raising & (stack + to_call < raise_amounts)
+    raising &= ~folding
+    # Only adjust when the raise stays affordable (going up) or positive (going down)
+    adjusted = ((adjustment > 0) & (raise_amounts + adjustment <= stack)) | ((adjustment < 0) & (raise_amounts + adjustment > 0))
+    raise_amounts = raise_amounts + np.where(adjusted, adjustment, 0)
+    raise_amounts = raise_amounts + np.where((dealer_bonus > 0) & (raise_amounts + dealer_bonus <= stack), dealer_bonus, 0)
+
+    # Players who raised already, or whose chips can't make the raise, call instead
+    calling = raising & (np.zeros(len(raising), dtype=bool) if raised is None else np.asarray(raised, dtype=bool))
+    if chip_counts is not None:
+        calling |= raising & ~can_pay_exactly(np.asarray(chip_counts), raise_amounts)
+    raising &= ~calling
+
+    actions = np.where(folding, Action.FOLD.value, actions)
+    actions = np.where(raising, Action.RAISE.value, actions)
+    actions = np.where(calling, Action.CALL.value, actions)
+    amounts = np.where(folding, 0, amounts)
+    amounts = np.where(raising, raise_amounts, amounts)
+    amounts = np.where(calling, to_call, amounts)
+    return actions, amounts
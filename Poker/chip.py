@@ -1,4 +1,5 @@
 from collections import deque
+from operator import mul
 class Chips:
     White = 50
     Red = 100
@@ -7,6 +8,8 @@ class Chips:
     Black = 1000
 
 class ChipStash:
+    __slots__ = ("contributors", "inventory")
+
     def __init__(self, initial_inventory=None):
         # list of people who've contributed to this pot
         self.contributors = []
@@ -216,7 +219,7 @@ class ChipStash:
             pass
 
     def total_value(self) -> int:
-        return sum(value * count for value, count in self.inventory.items())
+        return sum(map(mul, self.inventory, self.inventory.values()))
 
     def reset(self):
         """Resets the chip inventory to zero for all chip values."""
@@ -282,6 +285,24 @@ class ChipStash:
 
         return bet_chips
 
+    # The chips dollar_to_chips would take out of this stash for value, without taking them
+    def chips_for(self, value) -> "ChipStash":
+        bet_chips = ChipStash()
+        remaining = value
+
+        for chip_value in sorted(self.inventory.keys(), reverse=True):
+            if remaining <= 0:
+                break
+            use = min(self.inventory[chip_value], remaining // chip_value)
+            if use > 0:
+                bet_chips.inventory[chip_value] = use
+                remaining -= chip_value * use
+
+        if remaining > 0:
+            raise ValueError(f"Insufficient chips to convert ${value}. Remaining: ${remaining}")
+
+        return bet_chips
+
     def copy(self):
         """Creates a new ChipStash with the same chip inventory as this one"""
         new_stash = ChipStash()
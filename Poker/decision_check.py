@@ -0,0 +1,223 @@
+from Poker.player import (Player, Action, HIGH_TRAIT_THRESHOLD, MID_TRAIT_THRESHOLD, POSITION_THRESHOLD, spot_index,
+                          STRATEGIES, TRAIT_STRATEGY, make_strategy)
+from Poker.chip import ChipStash
+from Poker.deck import Card, Suit, Rank
+from Poker.batch_decisions import TRAIT_COLUMNS, CHIP_VALUES, decide
+import numpy as np
+import argparse
+import random
+
+# Seeded check that the compiled decision tables (Player.make_decision) decide exactly like the trait comparisons
+# they replaced, that the batched decisions (batch_decisions.decide) match them, and that every other batchable
+# strategy's decide_batch agrees with its decide: python -m Poker.decision_check [--samples N] [--seed S]
+
+# The original make_decision, kept as the reference
+def reference_decision(player: Player, bet_size: ChipStash, min_raise, community_cards, dealer_name):
+    if player.folded:
+        return Action.FOLD, None
+
+    # See how good the cards are
+    player.evaluate_hand(community_cards)
+    hand_rank = player.hand_eval[0]
+    player_call = (None, None)
+
+    # Strong hand (7-10)
+    if(hand_rank >= 7):
+        # Will bet aggressively- if agressiveness > 70% - raise $200
+        if(player.traits["aggressiveness"] >= HIGH_TRAIT_THRESHOLD):
+            if(player.chips.total_value() + bet_size.total_value() >= (min_raise.total_value() * 2)):
+                player_call = Action.RAISE, (min_raise.total_value() * 2)
+        elif(player.traits["aggressiveness"] >= MID_TRAIT_THRESHOLD):
+            if(player.chips.total_value() + bet_size.total_value() >= min_raise.total_value()):
+                player_call =  Action.RAISE, min_raise.total_value()
+        elif bet_size.total_value() == 0:
+            player_call = Action.CHECK, None
+        else:
+            player_call = Action.CALL, bet_size
+    # Medium hand (4-6)
+    elif(hand_rank >= 4):
+        # Will take a risk to raise if high risk tolerance
+        if(player.traits["risk_tolerance"] >= HIGH_TRAIT_THRESHOLD):
+            if(player.chips.total_value() + bet_size.total_value() >= (min_raise.total_value() * 2)):
+                player_call = Action.RAISE, (min_raise.total_value() * 2)
+        elif(player.traits["risk_tolerance"] >= MID_TRAIT_THRESHOLD):
+            if(player.chips.total_value() + bet_size.total_value() >= min_raise.total_value()):
+                player_call =  Action.RAISE, min_raise.total_value()
+        else:
+            if bet_size.total_value == 0:
+                player_call = Action.CHECK, None
+            if(bet_size.total_value() < 200 and player.chips.total_value() >= 200):
+                player_call  = Action.CALL, bet_size
+            elif len(community_cards) <= 3:
+                player_call = Action.CALL, bet_size
+            else:
+                player_call = Action.FOLD, None
+    # Weak hand (1-3)
+    else:
+        # Will raise if high bluff tolerance
+        if(player.traits["bluff_tendency"] >= HIGH_TRAIT_THRESHOLD):
+            if(player.chips.total_value() + bet_size.total_value() >= (min_raise.total_value() * 2)):
+                player_call =  Action.BLUFF, (min_raise.total_value() * 2)
+        elif(player.traits["bluff_tendency"] >= MID_TRAIT_THRESHOLD):
+            if(player.chips.total_value() + bet_size.total_value() >= min_raise.total_value()):
+                player_call =  Action.BLUFF, min_raise.total_value()
+        elif bet_size.total_value() == 0:
+            player_call = Action.CHECK, None
+        elif len(community_cards) <= 3:
+            player_call = Action.CALL, bet_size
+        else:
+            player_call  = Action.FOLD, None
+
+    # Then change betting based on chip size and position awareness
+    # The more chips a player has, a more they bet based on chip size awareness
+    if(player_call[0] == Action.RAISE):
+        if(player.traits["chip_size_awareness"] >= HIGH_TRAIT_THRESHOLD):
+            if(player.chips.total_value() >= 5000):
+                if(player_call[1] + 100 <= player.chips.total_value()):
+                    player_call = Action.RAISE, player_call[1] + 100
+            else:
+                if(player_call[1] - 100 > 0):
+                    player_call = Action.RAISE, player_call[1] - 100
+        elif(player.traits["chip_size_awareness"] >= MID_TRAIT_THRESHOLD):
+            if(player.chips.total_value() >= 5000):
+                if(player_call[1] + 50 <= player.chips.total_value()):
+                    player_call = Action.RAISE, player_call[1] + 50
+            else:
+                if(player_call[1] - 50 > 0):
+                    player_call = Action.RAISE, player_call[1] - 50
+
+        # If player is the last to go (dealer), they should bet more
+        if(player.name == dealer_name and player.traits["position_awareness"] > POSITION_THRESHOLD):
+            if(player_call[1] + 50 <= player.chips.total_value()):
+                player_call = Action.RAISE, player_call[1] + 50
+
+    if(player_call[0] == Action.RAISE or player_call[0] == Action.BLUFF):
+        if not player.raised:
+            try:
+                bet_stash = player.chips.copy().dollar_to_chips(player_call[1])
+                player_call = (Action.RAISE, bet_stash)
+            except ValueError:
+                player_call = (Action.CALL, bet_size)
+        else:
+            player_call = (Action.CALL, bet_size)
+
+    # Catch-all
+    if not player_call[0]:
+        player_call = (Action.FOLD, None)
+
+    if player_call[0]:
+        player.actions_called[player_call[0]] += 1
+    return player_call
+
+def random_stash(rng: random.Random, most: int) -> ChipStash:
+    return ChipStash({chip: rng.randint(0, most) for chip in CHIP_VALUES.tolist()})
+
+# A random player in a random spot: traits, chips, cards, the bet faced, the minimum raise and who deals
+def random_spot(rng: random.Random):
+    player = Player("player", traits={trait: rng.random() for trait in
+                                      ("aggressiveness", "risk_tolerance", "bluff_tendency", "position_awareness", "chip_size_awareness")})
+    player.chips = random_stash(rng, rng.choice((0, 2, 10)))
+    player.raised = rng.random() < 0.2
+    cards = rng.sample([Card(rank, suit) for suit in Suit for rank in Rank], 7)
+    player.hand = cards[:2]
+    community_cards = cards[2:2 + rng.choice((0, 3, 4, 5))]
+    bet_size = random_stash(rng, rng.choice((0, 0, 1, 3)))
+    min_raise = random_stash(rng, rng.choice((0, 1, 2)))
+    dealer_name = player.name if rng.random() < 0.5 else "dealer"
+    return player, bet_size, min_raise, community_cards, dealer_name
+
+def same_call(call, other) -> bool:
+    if call[0] != other[0]:
+        return False
+    if call[1] is None or other[1] is None:
+        return call[1] is other[1]
+    return call[1].inventory == other[1].inventory
+
+# Returns the number of spots the compiled tables and the batched decisions each disagree with the original rules on
+# (counted actions included) and how many different (policy, spot) cells were tried
+def check(samples: int, seed: int):
+    rng = random.Random(seed)
+    mismatches = 0
+    cells = set()
+    spots = []
+    expected_calls = []
+    for _ in range(samples):
+        player, bet_size, min_raise, community_cards, dealer_name = random_spot(rng)
+        reference = player.copy()
+        spots.append(([player.traits[trait] for trait in TRAIT_COLUMNS], bet_size.total_value(), min_raise.total_value(),
+                      player.chips.total_value(), len(community_cards), player.name == dealer_name, player.raised,
+                      [player.chips.inventory[chip] for chip in CHIP_VALUES.tolist()]))
+        call = player.make_decision(bet_size, min_raise, community_cards, dealer_name)
+        expected = reference_decision(reference, bet_size, min_raise, community_cards, dealer_name)
+        if not same_call(call, expected) or player.actions_called != reference.actions_called:
+            mismatches += 1
+        expected_calls.append((expected[0].value, 0 if expected[1] is None else expected[1].total_value(), player.hand_eval[0]))
+        cells.add((id(player.policy), spot_index(player.hand_eval[0], len(community_cards), player.chips.total_value(),
+                                                 bet_size.total_value(), player.name == dealer_name)))
+
+    traits, to_call, min_raise, stack, community_count, is_dealer, raised, chip_counts = (np.array(column) for column in zip(*spots))
+    expected_actions, expected_amounts, hand_rank = (np.array(column) for column in zip(*expected_calls))
+    actions, amounts = decide(traits, hand_rank, to_call, min_raise, stack, community_count, is_dealer, raised, chip_counts)
+    batch_mismatches = int(((actions != expected_actions) | (amounts != expected_amounts)).sum())
+    return mismatches, batch_mismatches, len(cells)
+
+# Stands in for a strategy's generator to make it pick the given choice
+class _Choice:
+    def __init__(self, choice: int):
+        self.choice = choice
+
+    def randrange(self, n: int) -> int:
+        return self.choice
+
+# The (Action value, amount) decisions the object path can make in a spot: one for deterministic strategies,
+# one per choice for the random one
+def possible_decisions(strategy, spot):
+    player, bet_size, min_raise, community_cards, dealer_name = spot
+    generators = [_Choice(choice) for choice in range(3)] if hasattr(strategy, "random") else [None]
+    decisions = set()
+    for generator in generators:
+        if generator is not None:
+            strategy.random = generator
+        action, amount = strategy.decide(player, bet_size, min_raise, community_cards, dealer_name)
+        decisions.add((action.value, 0 if amount is None else amount.total_value()))
+    return decisions
+
+# Returns {strategy name: spots where decide_batch made a decision decide couldn't have} for every batchable strategy
+# but the trait one (check() covers it)
+def check_strategies(samples: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    spots = [random_spot(rng) for _ in range(samples)]
+    to_call, min_raise, stack, raised, chip_counts = (np.array(column) for column in zip(*(
+        (bet_size.total_value(), raise_size.total_value(), player.chips.total_value(), player.raised,
+         [player.chips.inventory[chip] for chip in CHIP_VALUES.tolist()])
+        for player, bet_size, raise_size, _, _ in spots)))
+    community_count = np.array([len(spot[3]) for spot in spots])
+    is_dealer = np.array([spot[0].name == spot[4] for spot in spots])
+    traits = np.array([[spot[0].traits[trait] for trait in TRAIT_COLUMNS] for spot in spots])
+    hand_rank = np.zeros(samples, dtype=int)
+
+    mismatches = {}
+    for name, strategy_class in STRATEGIES.items():
+        if not strategy_class.batchable or isinstance(TRAIT_STRATEGY, strategy_class):
+            continue
+        strategy = make_strategy(name, seed=seed) if hasattr(strategy_class(), "random") else make_strategy(name)
+        actions, amounts = strategy.decide_batch(traits, hand_rank, to_call, min_raise, stack, community_count, is_dealer,
+                                                 raised, chip_counts)
+        mismatches[name] = sum((action, amount) not in possible_decisions(strategy, spot)
+                               for action, amount, spot in zip(actions.tolist(), amounts.tolist(), spots))
+    return mismatches
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the compiled decision tables and batched decisions against the original decision rules")
+    parser.add_argument("--samples", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    mismatches, batch_mismatches, cells = check(args.samples, args.seed)
+    print(f"{args.samples} random spots, {cells} different (policy, spot) cells: "
+          f"{mismatches} mismatches with the compiled tables, {batch_mismatches} with the batched decisions")
+    strategy_mismatches = check_strategies(args.samples, args.seed)
+    for name, count in strategy_mismatches.items():
+        print(f"{name}: {count} batched decisions its decide couldn't have made")
+    if mismatches or batch_mismatches or any(strategy_mismatches.values()):
+        raise SystemExit(1)
@@ -1,5 +1,6 @@
 import random
 from enum import Enum, auto
+from typing import List
 import ascii_cards.cards as dealer
 
 class Suit(Enum):
@@ -49,7 +50,11 @@ class Card:
     
 
 class Deck():
-    def __init__(self):
+    # cards: an already shuffled card order to deal from (dealt from the end), None for a fresh shuffled deck
+    def __init__(self, cards: List[Card] = None):
+        if cards is not None:
+            self.cards = list(cards)
+            return
         self.cards = [Card(rank, suit) for suit in Suit for rank in Rank]
         self.shuffle()
     
@@ -59,4 +64,19 @@ class Deck():
     def deal(self) -> Card:
         if not self.cards:
             raise ValueError("Deck is empty")
-        return self.cards.pop()
\ No newline at end of file
+        return self.cards.pop()
+
+# A reproducible sequence of shuffled decks, one per hand
+# Lets the same cards be replayed, e.g. for duplicate poker where every seat rotation gets the same deals
+# Uses its own generator so replaying doesn't touch the global random state
+class DealSequence():
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+        self.orders: List[List[Card]] = []
+
+    def deck(self, hand_number: int) -> Deck:
+        while len(self.orders) <= hand_number:
+            cards = [Card(rank, suit) for suit in Suit for rank in Rank]
+            self.rng.shuffle(cards)
+            self.orders.append(cards)
+        return Deck(self.orders[hand_number])
@@ -0,0 +1,145 @@
+from Poker.poker import TexasHoldem
+from Poker.chip import ChipStash
+from Poker.player import Player
+from collections import defaultdict
+from functools import wraps
+from time import perf_counter
+
+# Opt-in counters and timers for the game's hot path: enable() wraps the methods below with a call counter and a
+# timer, disable() puts the originals back. Nothing is wrapped while it's off, so it costs nothing then.
+# Times are inclusive, a method's time includes whatever it calls (play includes everything else,
+# transfer_chips includes the trade_in calls it makes).
+# Only tables played through start_table()/end_table() (Genetic_Algo.GA_init.play_table) are counted: their totals
+# are added up per table, then per generation (generation_stats, which goes into population_stats).
+
+# name -> (class, method)
+HOT_PATH = {
+    "play": (TexasHoldem, "play"),
+    "deal_round": (TexasHoldem, "_deal_round"),
+    "deal_flop": (TexasHoldem, "_deal_flop"),
+    "deal_turn": (TexasHoldem, "_deal_turn"),
+    "deal_river": (TexasHoldem, "_deal_river"),
+    "evaluate_hand": (Player, "evaluate_hand"),
+    "make_decision": (Player, "make_decision"),
+    "resolve_pots": (TexasHoldem, "_resolve_pots"),
+    "showdown": (TexasHoldem, "_showdown"),
+    "distribute_pot": (TexasHoldem, "_distribute_pot"),
+    "trade_in": (ChipStash, "trade_in"),
+    "transfer_chips": (ChipStash, "transfer_chips")
+}
+# Betting rounds are counted per street, by the number of community cards
+STREETS = {0: "preflop", 3: "flop", 4: "turn", 5: "river"}
+
+class HotPathCounters:
+    def __init__(self):
+        self.calls = defaultdict(int)
+        self.seconds = defaultdict(float)
+        # Decisions made in a street's betting rounds
+        self.actions = defaultdict(int)
+
+    def add(self, other: "HotPathCounters"):
+        for name, calls in other.calls.items():
+            self.calls[name] += calls
+        for name, seconds in other.seconds.items():
+            self.seconds[name] += seconds
+        for street, actions in other.actions.items():
+            self.actions[street] += actions
+
+class HotPathProfile:
+    def __init__(self):
+        # The table being played, None between tables (nothing is counted then)
+        self.table = None
+        self.generation = HotPathCounters()
+        self.table_seconds = []
+
+    def timed(self, name, method):
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            table = self.table
+            if table is None:
+                return method(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                table.seconds[name] += perf_counter() - start
+                table.calls[name] += 1
+        return wrapper
+
+    def timed_betting_round(self, method):
+        @wraps(method)
+        def wrapper(game, *args, **kwargs):
+            table = self.table
+            if table is None:
+                return method(game, *args, **kwargs)
+            name = f"betting_round_{STREETS.get(len(game.community_cards), len(game.community_cards))}"
+            decisions = table.calls["make_decision"]
+            start = perf_counter()
+            try:
+                return method(game, *args, **kwargs)
+            finally:
+                table.seconds[name] += perf_counter() - start
+                table.calls[name] += 1
+                table.actions[name] += table.calls["make_decision"] - decisions
+        return wrapper
+
+    def start_table(self):
+        self.table = HotPathCounters()
+
+    def end_table(self):
+        if self.table is None:
+            return
+        self.generation.add(self.table)
+        self.table_seconds.append(self.table.seconds["play"])
+        self.table = None
+
+    # Totals of the tables played since the last call: calls and seconds of every method, decisions per betting
+    # round on every street and the time spent per table
+    def generation_stats(self) -> dict:
+        counters = self.generation
+        stats = {"hot_path_tables": len(self.table_seconds)}
+        for name in list(HOT_PATH) + [f"betting_round_{street}" for street in STREETS.values()]:
+            stats[f"hot_path_{name}_calls"] = counters.calls[name]
+            stats[f"hot_path_{name}_seconds"] = counters.seconds[name]
+        for street in STREETS.values():
+            rounds = counters.calls[f"betting_round_{street}"]
+            stats[f"hot_path_actions_per_round_{street}"] = counters.actions[f"betting_round_{street}"] / rounds if rounds else 0.0
+        stats["hot_path_table_seconds_mean"] = sum(self.table_seconds) / len(self.table_seconds) if self.table_seconds else 0.0
+        stats["hot_path_table_seconds_max"] = max(self.table_seconds, default=0.0)
+        self.generation = HotPathCounters()
+        self.table_seconds = []
+        return stats
+
+# The profile being recorded into, None while instrumentation is off
+PROFILE = None
+_originals = {}
+
+# Every call starts a fresh profile, nothing carries over from an earlier run that didn't disable()
+def enable() -> HotPathProfile:
+    global PROFILE
+    disable()
+    PROFILE = HotPathProfile()
+    for name, (cls, method) in HOT_PATH.items():
+        _originals[name] = getattr(cls, method)
+        setattr(cls, method, PROFILE.timed(name, _originals[name]))
+    _originals["betting_round"] = TexasHoldem._betting_round
+    TexasHoldem._betting_round = PROFILE.timed_betting_round(_originals["betting_round"])
+    return PROFILE
+
+def disable():
+    global PROFILE
+    if PROFILE is None:
+        return
+    for name, (cls, method) in HOT_PATH.items():
+        setattr(cls, method, _originals[name])
+    TexasHoldem._betting_round = _originals["betting_round"]
+    _originals.clear()
+    PROFILE = None
+
+def start_table():
+    if PROFILE is not None:
+        PROFILE.start_table()
+
+def end_table():
+    if PROFILE is not None:
+        PROFILE.end_table()
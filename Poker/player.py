@@ -1,9 +1,10 @@
 from enum import Enum, auto
 from typing import List
+import numpy as np
 import random
 
 from Poker.chip import Chips, ChipStash
-from Poker.deck import Card
+from Poker.deck import Card, Rank, Suit
 from Poker.evaluate import Eval
 
 # Player actions
@@ -15,25 +16,148 @@ class Action(Enum):
     ALL_IN = auto()
     BLUFF = auto()
 
-class Player:
-    def __init__(self, name: str):
-        self.initial_chips = ChipStash({
-            Chips.White: 20,
-            Chips.Red: 10,
-            Chips.Green: 4,
-            Chips.Blue: 2,
-            Chips.Black: 1
-        })
-
-        self.chips = self.initial_chips.copy()
-        self.name = name
-        self.evaluator = Eval()
+# Trait cut-offs used by the trait strategy (TraitStrategy)
+# A trait at or above HIGH_TRAIT_THRESHOLD plays the strong line, at or above MID_TRAIT_THRESHOLD the medium line
+HIGH_TRAIT_THRESHOLD = 0.7
+MID_TRAIT_THRESHOLD = 0.5
+# Dealers only add to their raise when position_awareness is strictly above this
+POSITION_THRESHOLD = 0.6
+# Bets and stacks the trait strategy treats differently: a bet under SMALL_BET is called with at least SMALL_BET in chips,
+# raises grow with at least DEEP_STACK in chips and shrink below it
+SMALL_BET = 200
+DEEP_STACK = 5000
+
+# Every player starts with these chips, shared by all players and never modified (use .copy())
+STARTING_CHIPS = ChipStash({
+    Chips.White: 20,
+    Chips.Red: 10,
+    Chips.Green: 4,
+    Chips.Blue: 2,
+    Chips.Black: 1
+})
+
+# Hand evaluation has no state, so every player uses the same evaluator
+EVALUATOR = Eval()
+
+# The trait strategy looks its move up in a table compiled from the player's traits instead of comparing them every time.
+# The move only depends on which side of the thresholds each number falls, so a spot is:
+#   hand:   0 weak (rank 1-3), 1 medium (4-6), 2 strong (7-10)
+#   street: 0 up to the flop (<= 3 community cards), 1 turn or river
+#   stack:  0 under SMALL_BET, 1 under DEEP_STACK, 2 DEEP_STACK or more
+#   facing: 0 no bet, 1 under SMALL_BET, 2 SMALL_BET or more
+#   dealer: 0 or 1
+# and every table entry is (action, raise multiple, chip size adjustment, dealer bonus). A raise or bluff is
+# multiple x the minimum raise, only what it comes to depends on the exact amounts (see TraitStrategy.decide).
+def spot_index(hand_rank: int, community_count: int, chips: int, facing: int, is_dealer: bool) -> int:
+    hand = 2 if hand_rank >= 7 else 1 if hand_rank >= 4 else 0
+    street = 1 if community_count > 3 else 0
+    stack = 2 if chips >= DEEP_STACK else 1 if chips >= SMALL_BET else 0
+    bet = 2 if facing >= SMALL_BET else 1 if facing > 0 else 0
+    return (((hand * 2 + street) * 3 + stack) * 3 + bet) * 2 + int(is_dealer)
+
+def _trait_level(value: float) -> int:
+    return 2 if value >= HIGH_TRAIT_THRESHOLD else 1 if value >= MID_TRAIT_THRESHOLD else 0
+
+def _spot_entry(levels, hand, street, stack, facing, dealer):
+    aggressiveness, risk_tolerance, bluff_tendency, position_awareness, chip_size_awareness = levels
+    # Strong hands raise (x2 at a high level) with aggressiveness, otherwise check or call
+    if hand == 2:
+        if aggressiveness:
+            action, multiple = Action.RAISE, aggressiveness
+        else:
+            action, multiple = (Action.CHECK if facing == 0 else Action.CALL), 0
+    # Medium hands raise with risk_tolerance, otherwise call a small bet with enough chips, anything up to the flop,
+    # and fold later on (they never check, even when there's no bet)
+    elif hand == 1:
+        if risk_tolerance:
+            action, multiple = Action.RAISE, risk_tolerance
+        elif (stack >= 1 and facing <= 1) or street == 0:
+            action, multiple = Action.CALL, 0
+        else:
+            action, multiple = Action.FOLD, 0
+    # Weak hands bluff with bluff_tendency, otherwise check, call up to the flop and fold later on
+    else:
+        if bluff_tendency:
+            action, multiple = Action.BLUFF, bluff_tendency
+        elif facing == 0:
+            action, multiple = Action.CHECK, 0
+        elif street == 0:
+            action, multiple = Action.CALL, 0
+        else:
+            action, multiple = Action.FOLD, 0
+
+    # Raises (not bluffs) go up with chip_size_awareness on a deep stack and down on a short one,
+    # and up again for the dealer with position_awareness
+    adjustment, dealer_bonus = 0, 0
+    if action == Action.RAISE:
+        adjustment = (0, 50, 100)[chip_size_awareness] * (1 if stack == 2 else -1)
+        dealer_bonus = 50 if dealer and position_awareness else 0
+    return action, multiple, adjustment, dealer_bonus
+
+# Compiled tables by trait levels, there are only 3^4 x 2 different policies
+_POLICIES = {}
+
+# Levels of (aggressiveness, risk_tolerance, bluff_tendency, position_awareness, chip_size_awareness):
+# 0 below MID_TRAIT_THRESHOLD, 1 below HIGH_TRAIT_THRESHOLD, 2 above, and position_awareness 0 or 1 around POSITION_THRESHOLD
+def policy_levels(traits: dict) -> tuple:
+    return (_trait_level(traits["aggressiveness"]), _trait_level(traits["risk_tolerance"]),
+            _trait_level(traits["bluff_tendency"]), int(traits["position_awareness"] > POSITION_THRESHOLD),
+            _trait_level(traits["chip_size_awareness"]))
+
+# The decision table for some trait levels, indexed by spot_index
+def level_policy(levels: tuple) -> tuple:
+    policy = _POLICIES.get(levels)
+    if policy is None:
+        policy = tuple(_spot_entry(levels, hand, street, stack, facing, dealer)
+                       for hand in range(3) for street in range(2) for stack in range(3)
+                       for facing in range(3) for dealer in range(2))
+        _POLICIES[levels] = policy
+    return policy
+
+# The decision table of a set of traits
+def compile_policy(traits: dict) -> tuple:
+    return level_policy(policy_levels(traits))
+
+# What a player has going in the current hand, cleared in place between hands instead of being reallocated
+class HandState:
+    __slots__ = ("hand", "hand_eval", "bet", "folded", "raised")
+
+    def __init__(self):
         self.hand: List[Card] = []
         self.hand_eval = (None, None)
         self.bet = ChipStash()
         self.folded = False
         self.raised = False
-        self.traits = self.initialize_traits()
+
+    def clear(self):
+        self.hand.clear()
+        self.hand_eval = (None, None)
+        self.bet.reset()
+        self.folded = False
+        self.raised = False
+
+    def copy(self) -> "HandState":
+        state = HandState()
+        state.hand = self.hand.copy()
+        state.hand_eval = self.hand_eval
+        state.bet = self.bet.copy()
+        state.folded = self.folded
+        state.raised = self.raised
+        return state
+
+class Player:
+    __slots__ = ("name", "initial_chips", "chips", "state", "_traits", "policy", "rounds_survived", "actions_called", "position",
+                 "parent1", "parent2", "lineage", "lineage_fitness", "fitness", "strategy")
+    evaluator = EVALUATOR
+
+    # traits: the player's traits, random ones (initialize_traits) if not given
+    # strategy: how the player decides (a Strategy, see STRATEGIES), by default from its traits
+    def __init__(self, name: str, *, traits: dict = None, strategy: "Strategy" = None):
+        self.initial_chips = STARTING_CHIPS
+        self.chips = STARTING_CHIPS.copy()
+        self.name = name
+        self.state = HandState()
+        self.traits = self.initialize_traits() if traits is None else traits
         self.rounds_survived = 0
         self.actions_called = {action: 0 for action in Action}
         self.position = None
@@ -42,6 +166,77 @@ class Player:
         self.lineage = None
         self.lineage_fitness = 0
         self.fitness = 0
+        self.strategy = TRAIT_STRATEGY if strategy is None else strategy
+
+    # Assigning traits compiles the player's decision table, so they have to be replaced as a whole
+    # (player.traits = {...}), never edited in place
+    @property
+    def traits(self) -> dict:
+        return self._traits
+
+    @traits.setter
+    def traits(self, traits: dict):
+        self._traits = traits
+        self.policy = compile_policy(traits)
+
+    # Per-hand state lives in self.state, these keep the old attribute names working
+    @property
+    def hand(self) -> List[Card]:
+        return self.state.hand
+
+    @hand.setter
+    def hand(self, hand: List[Card]):
+        self.state.hand = hand
+
+    @property
+    def hand_eval(self):
+        return self.state.hand_eval
+
+    @hand_eval.setter
+    def hand_eval(self, hand_eval):
+        self.state.hand_eval = hand_eval
+
+    @property
+    def bet(self) -> ChipStash:
+        return self.state.bet
+
+    @bet.setter
+    def bet(self, bet: ChipStash):
+        self.state.bet = bet
+
+    @property
+    def folded(self) -> bool:
+        return self.state.folded
+
+    @folded.setter
+    def folded(self, folded: bool):
+        self.state.folded = folded
+
+    @property
+    def raised(self) -> bool:
+        return self.state.raised
+
+    @raised.setter
+    def raised(self, raised: bool):
+        self.state.raised = raised
+
+    # Puts a used player back to how a new Player(name, traits=traits) starts, reusing its objects
+    def recycle(self, name: str, traits: dict):
+        self.chips.inventory.update(STARTING_CHIPS.inventory)
+        self.chips.contributors.clear()
+        self.name = name
+        self.state.clear()
+        self.traits = traits
+        self.rounds_survived = 0
+        for action in self.actions_called:
+            self.actions_called[action] = 0
+        self.position = None
+        self.parent1 = None
+        self.parent2 = None
+        self.lineage = None
+        self.lineage_fitness = 0
+        self.fitness = 0
+        self.strategy = TRAIT_STRATEGY
     
     def set_pos(self, pos):
         self.position = pos
@@ -61,16 +256,12 @@ class Player:
     
     # Function to reset the players info after each round
     def reset(self):
-        self.hand = []
-        self.hand_eval = (None, None)
-        self.bet = ChipStash()
-        self.folded = False
-        self.raised = False
+        self.state.clear()
 
 
     # Function to receive cards 
     def receive_card(self, card: Card):
-        self.hand.append(card)
+        self.state.hand.append(card)
 
     # Logic for player decision
     # bet_size: the bet that the round is on
@@ -81,123 +272,13 @@ class Player:
     # Need to multiply the rank of the card in evaluate.py by the trait
     # Could have a threshold or like percents of how likely they are to fold, call, raise
     def make_decision(self, bet_size: ChipStash, min_raise, community_cards, dealer_name):
-        if self.folded:
+        if self.state.folded:
             return Action.FOLD, None
-        
-        # print(f"Traits for {self.name}:")
-        # for trait, value in self.traits.items():
-        #     print(f"  {trait}: {value:.2f}")
 
         # See how good the cards are
         self.evaluate_hand(community_cards)
-        hand_rank = self.hand_eval[0]
-        player_call = (None, None)
-
-
-        # Strong hand (7-10)
-        if(hand_rank >= 7):
-            # Will bet aggressively- if agressiveness > 70% - raise $200
-            if(self.traits["aggressiveness"] >= 0.7):
-                if(self.chips.total_value() + bet_size.total_value() >= (min_raise.total_value() * 2)):
-                    player_call = Action.RAISE, (min_raise.total_value() * 2)
-                # else:
-                #     player_call = Action.ALL_IN, self.chips
-            elif(self.traits["aggressiveness"] >= 0.5):
-                if(self.chips.total_value() + bet_size.total_value() >= min_raise.total_value()):
-                    player_call =  Action.RAISE, min_raise.total_value()
-                # else:
-                #     player_call = Action.ALL_IN, self.chips
-            elif bet_size.total_value() == 0:
-                player_call = Action.CHECK, None
-            else:
-                player_call = Action.CALL, bet_size
-        # Medium hand (4-6)
-        elif(hand_rank >= 4):
-            # Will take a risk to raise if high risk tolerance
-            if(self.traits["risk_tolerance"] >= 0.7):
-                if(self.chips.total_value() + bet_size.total_value() >= (min_raise.total_value() * 2)):
-                    player_call = Action.RAISE, (min_raise.total_value() * 2)
-                # else:
-                #     player_call = Action.ALL_IN, self.chips
-            elif(self.traits["risk_tolerance"] >= 0.5):
-                if(self.chips.total_value() + bet_size.total_value() >= min_raise.total_value()):
-                    player_call =  Action.RAISE, min_raise.total_value()
-                # else:
-                #     player_call = Action.ALL_IN, self.chips
-            else:
-                if bet_size.total_value == 0:
-                    player_call = Action.CHECK, None
-                if(bet_size.total_value() < 200 and self.chips.total_value() >= 200):
-                    player_call  = Action.CALL, bet_size
-                elif len(community_cards) <= 3:
-                    player_call = Action.CALL, bet_size
-                else:
-                    player_call = Action.FOLD, None
-        # Weak hand (1-3)
-        else:
-            # Will raise if high bluff tolerance
-            if(self.traits["bluff_tendency"] >= 0.7):
-                if(self.chips.total_value() + bet_size.total_value() >= (min_raise.total_value() * 2)):
-                    player_call =  Action.BLUFF, (min_raise.total_value() * 2)
-                # else:
-                #     player_call = Action.ALL_IN, self.chips
-            elif(self.traits["bluff_tendency"] >= 0.5):
-                if(self.chips.total_value() + bet_size.total_value() >= min_raise.total_value()):
-                    player_call =  Action.BLUFF, min_raise.total_value()
-                # else:
-                #     player_call = Action.ALL_IN, self.chips
-            elif bet_size.total_value() == 0:
-                player_call = Action.CHECK, None
-            elif len(community_cards) <= 3:
-                player_call = Action.CALL, bet_size
-            else:
-                player_call  = Action.FOLD, None
-
-        # Then change betting based on chip size and position awareness
-        # The more chips a player has, a more they bet based on chip size awareness
-        if(player_call[0] == Action.RAISE):
-            if(self.traits["chip_size_awareness"] >= 0.7):
-                if(self.chips.total_value() >= 5000):
-                    if(player_call[1] + 100 <= self.chips.total_value()):
-                        player_call = Action.RAISE, player_call[1] + 100
-                    # else:
-                    #     player_call = Action.ALL_IN, self.chips
-                else:
-                    if(player_call[1] - 100 > 0): 
-                        player_call = Action.RAISE, player_call[1] - 100
-            elif(self.traits["chip_size_awareness"] >= 0.5):
-                if(self.chips.total_value() >= 5000):
-                    if(player_call[1] + 50 <= self.chips.total_value()):
-                        player_call = Action.RAISE, player_call[1] + 50
-                else:
-                    if(player_call[1] - 50 > 0): 
-                        player_call = Action.RAISE, player_call[1] - 50
-
-            # If player is the last to go (dealer), they should bet more
-            if(self.name == dealer_name and self.traits["position_awareness"] > 0.6):
-                if(player_call[1] + 50 <= self.chips.total_value()):
-                    player_call = Action.RAISE, player_call[1] + 50
-                # else:
-                #     player_call = Action.ALL_IN, self.chips
-
-        if(player_call[0] == Action.RAISE or player_call[0] == Action.BLUFF):
-            if not self.raised:
-                try:
-                    bet_stash = self.chips.copy().dollar_to_chips(player_call[1])
-                    player_call = (Action.RAISE, bet_stash)
-                except ValueError:
-                    player_call = (Action.CALL, bet_size)
-            else:
-                # print("***Player has already raised, can only call now***")
-                player_call = (Action.CALL, bet_size)
-        
-        # Catch-all
-        if not player_call[0]:
-            player_call = (Action.FOLD, None)
-
-
-        if player_call[0]:
-            self.actions_called[player_call[0]] += 1
+        player_call = self.strategy.decide(self, bet_size, min_raise, community_cards, dealer_name)
+        self.actions_called[player_call[0]] += 1
         return player_call
 
     # Allows player to place a bet
@@ -241,16 +322,9 @@ class Player:
         self.hand_eval = self.evaluator.evaluate_hand(self.hand + community_cards)
 
     def copy(self):
-        new_player = Player(self.name)
-        new_player.initial_chips = self.initial_chips.copy()
+        new_player = Player(self.name, traits=self.traits.copy(), strategy=self.strategy)
         new_player.chips = self.chips.copy()
-        new_player.evaluator = self.evaluator  # Assuming Eval has no state
-        new_player.hand = self.hand.copy()
-        new_player.hand_eval = self.hand_eval
-        new_player.bet = self.bet.copy()
-        new_player.folded = self.folded
-        new_player.raised = self.raised
-        new_player.traits = self.traits.copy()
+        new_player.state = self.state.copy()
         new_player.rounds_survived = self.rounds_survived
         new_player.actions_called = self.actions_called.copy()
         new_player.position = self.position
@@ -259,4 +333,219 @@ class Player:
         new_player.lineage = self.lineage
         new_player.lineage_fitness = self.lineage_fitness
         new_player.fitness = self.fitness
-        return new_player
\ No newline at end of file
+        return new_player
+
+# How a seat decides. Player.make_decision evaluates the hand, then asks player.strategy for its move:
+# decide() gets the same spot as make_decision and returns (action, bet) the same way. Strategies that are batchable
+# also decide many seats at once from arrays (decide_batch, same arguments and results as batch_decisions.decide).
+# The game engine always asks one seat at a time through decide(), decide_batch is for callers that have many spots
+# at once, and Poker.decision_check checks it against decide().
+# Strategies are registered by name in STRATEGIES (make_strategy builds one), so baseline bots can sit at the tables
+# next to the evolved players (run_sim's opponents).
+class Strategy:
+    name = None
+    batchable = False
+
+    def decide(self, player: Player, bet_size: ChipStash, min_raise: ChipStash, community_cards: List[Card], dealer_name):
+        raise NotImplementedError
+
+    def decide_batch(self, traits, hand_rank, to_call, min_raise, stack, community_count, is_dealer, raised=None,
+                     chip_counts=None):
+        raise NotImplementedError(f"The {self.name} strategy decides one seat at a time")
+
+STRATEGIES = {}
+
+def register_strategy(strategy_class):
+    STRATEGIES[strategy_class.name] = strategy_class
+    return strategy_class
+
+def make_strategy(name: str, **options) -> Strategy:
+    if name not in STRATEGIES:
+        raise ValueError(f"Unknown strategy {name!r}, pick one of {sorted(STRATEGIES)}")
+    return STRATEGIES[name](**options)
+
+def check_or_call(bet_size: ChipStash):
+    return (Action.CHECK, None) if bet_size.total_value() == 0 else (Action.CALL, bet_size)
+
+def check_or_fold(bet_size: ChipStash):
+    return (Action.CHECK, None) if bet_size.total_value() == 0 else (Action.FOLD, None)
+
+# A raise of amount, or a call when the player already raised this round or their chips can't make the amount exactly
+def raise_or_call(player: Player, amount: int, bet_size: ChipStash):
+    if player.state.raised:
+        return Action.CALL, bet_size
+    try:
+        return Action.RAISE, player.chips.chips_for(amount)
+    except ValueError:
+        return Action.CALL, bet_size
+
+# The evolved players: the decision table compiled from their traits (see compile_policy)
+@register_strategy
+class TraitStrategy(Strategy):
+    name = "trait"
+    batchable = True
+
+    def decide(self, player, bet_size, min_raise, community_cards, dealer_name):
+        chips = player.chips.total_value()
+        facing = bet_size.total_value()
+        action, multiple, adjustment, dealer_bonus = player.policy[
+            spot_index(player.state.hand_eval[0], len(community_cards), chips, facing, player.name == dealer_name)]
+        if not multiple:
+            return action, bet_size if action == Action.CALL else None
+
+        amount = min_raise.total_value() * multiple
+        # Can't cover the raise: fold
+        if chips + facing < amount:
+            return Action.FOLD, None
+        # Only adjust when the raise stays affordable (going up) or positive (going down)
+        if (adjustment > 0 and amount + adjustment <= chips) or (adjustment < 0 and amount + adjustment > 0):
+            amount += adjustment
+        if dealer_bonus and amount + dealer_bonus <= chips:
+            amount += dealer_bonus
+        return raise_or_call(player, amount, bet_size)
+
+    def decide_batch(self, traits, hand_rank, to_call, min_raise, stack, community_count, is_dealer, raised=None,
+                     chip_counts=None):
+        # batch_decisions builds on this module
+        from Poker.batch_decisions import decide
+        return decide(traits, hand_rank, to_call, min_raise, stack, community_count, is_dealer, raised, chip_counts)
+
+TRAIT_STRATEGY = TraitStrategy()
+
+# Calls (or checks) everything, whatever the cards
+@register_strategy
+class AlwaysCall(Strategy):
+    name = "always_call"
+    batchable = True
+
+    def decide(self, player, bet_size, min_raise, community_cards, dealer_name):
+        return check_or_call(bet_size)
+
+    def decide_batch(self, traits, hand_rank, to_call, min_raise, stack, community_count, is_dealer, raised=None,
+                     chip_counts=None):
+        to_call = np.asarray(to_call, dtype=np.int64)
+        return np.where(to_call > 0, Action.CALL.value, Action.CHECK.value), to_call
+
+# Plays few hands and raises the ones it plays: before the flop a pair or two cards of at least high_card,
+# after it made_hand or better (Eval rank, 3 is two pair) raises twice the minimum, a pair calls, anything else folds
+@register_strategy
+class TightAggressive(Strategy):
+    name = "tight_aggressive"
+
+    def __init__(self, high_card: Rank = Rank.TEN, made_hand: int = 3):
+        self.high_card = high_card
+        self.made_hand = made_hand
+
+    def decide(self, player, bet_size, min_raise, community_cards, dealer_name):
+        if community_cards:
+            strong = player.hand_eval[0] >= self.made_hand
+            playable = player.hand_eval[0] >= 2
+        else:
+            first, second = player.hand
+            strong = first.rank == second.rank or min(first.rank.value, second.rank.value) >= self.high_card.value
+            playable = strong
+        if strong:
+            amount = min_raise.total_value() * 2
+            if player.chips.total_value() + bet_size.total_value() >= amount:
+                return raise_or_call(player, amount, bet_size)
+        if playable:
+            return check_or_call(bet_size)
+        return check_or_fold(bet_size)
+
+# Folds (checks when it's free), calls or raises the minimum with equal odds, from its own seeded generators
+# (seed drawn from the global random state by default, so seeded runs stay reproducible)
+@register_strategy
+class RandomStrategy(Strategy):
+    name = "random"
+    batchable = True
+
+    def __init__(self, seed: int = None):
+        seed = random.getrandbits(32) if seed is None else seed
+        self.random = random.Random(seed)
+        self.rng = np.random.default_rng(seed)
+
+    def decide(self, player, bet_size, min_raise, community_cards, dealer_name):
+        choice = self.random.randrange(3)
+        if choice == 0:
+            return check_or_fold(bet_size)
+        amount = min_raise.total_value()
+        if choice == 2 and player.chips.total_value() + bet_size.total_value() >= amount:
+            return raise_or_call(player, amount, bet_size)
+        return check_or_call(bet_size)
+
+    def decide_batch(self, traits, hand_rank, to_call, min_raise, stack, community_count, is_dealer, raised=None,
+                     chip_counts=None):
+        to_call = np.asarray(to_call, dtype=np.int64)
+        min_raise = np.broadcast_to(np.asarray(min_raise, dtype=np.int64), to_call.shape)
+        choice = self.rng.integers(0, 3, len(to_call))
+        raising = (choice == 2) & (np.asarray(stack) + to_call >= min_raise)
+        if raised is not None:
+            raising &= ~np.asarray(raised, dtype=bool)
+        if chip_counts is not None:
+            from Poker.batch_decisions import can_pay_exactly
+            raising &= can_pay_exactly(np.asarray(chip_counts), min_raise)
+        folding = (choice == 0) & (to_call > 0)
+        actions = np.where(to_call > 0, Action.CALL.value, Action.CHECK.value)
+        actions = np.where(folding, Action.FOLD.value, np.where(raising, Action.RAISE.value, actions))
+        amounts = np.where(folding, 0, np.where(raising, min_raise, to_call))
+        return actions, amounts
+
+_DECK = [Card(rank, suit) for suit in Suit for rank in Rank]
+
+# Estimates its chance of beating one random hand at showdown (Monte Carlo over the unseen cards, ties count half)
+# and raises twice the minimum from raise_equity, calls from call_equity, and folds below
+@register_strategy
+class EquityThreshold(Strategy):
+    name = "equity_threshold"
+
+    def __init__(self, call_equity: float = 0.5, raise_equity: float = 0.75, samples: int = 20, seed: int = None):
+        self.call_equity = call_equity
+        self.raise_equity = raise_equity
+        self.samples = samples
+        self.random = random.Random(random.getrandbits(32) if seed is None else seed)
+        # A betting round can ask several times with the same cards
+        self.last = (None, 0.0)
+
+    def equity(self, hand: List[Card], community_cards: List[Card]) -> float:
+        known = [(card.rank, card.suit) for card in hand + community_cards]
+        if self.last[0] == known:
+            return self.last[1]
+        unseen = [card for card in _DECK if (card.rank, card.suit) not in known]
+        missing = 5 - len(community_cards)
+        won = 0.0
+        for _ in range(self.samples):
+            drawn = self.random.sample(unseen, 2 + missing)
+            board = community_cards + drawn[2:]
+            mine = EVALUATOR.evaluate_hand(hand + board)[0]
+            theirs = EVALUATOR.evaluate_hand(drawn[:2] + board)[0]
+            won += 1.0 if mine > theirs else 0.5 if mine == theirs else 0.0
+        self.last = (known, won / self.samples)
+        return self.last[1]
+
+    def decide(self, player, bet_size, min_raise, community_cards, dealer_name):
+        equity = self.equity(player.hand, community_cards)
+        if equity >= self.raise_equity:
+            amount = min_raise.total_value() * 2
+            if player.chips.total_value() + bet_size.total_value() >= amount:
+                return raise_or_call(player, amount, bet_size)
+        if equity >= self.call_equity:
+            return check_or_call(bet_size)
+        return check_or_fold(bet_size)
+
+# Recycles Player objects across generations: release() takes back players whose results have been read,
+# acquire() hands one out as good as new (see Player.recycle), so a generation doesn't allocate a new
+# player, chip stashes and hand state for every individual
+class PlayerPool:
+    def __init__(self):
+        self.free: List[Player] = []
+
+    def acquire(self, name: str, traits: dict) -> Player:
+        if self.free:
+            player = self.free.pop()
+            player.recycle(name, traits)
+            return player
+        return Player(name, traits=traits)
+
+    # The players must not be used after this
+    def release(self, players: List[Player]):
+        self.free.extend(players)
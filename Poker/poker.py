@@ -4,12 +4,14 @@
 from typing import List, Dict
 from enum import Enum, auto
 from Poker.chip import Chips, ChipStash, dollar_to_chips
-from Poker.deck import Deck, Card
+from Poker.deck import Deck, Card, DealSequence
 from Poker.player import Player, Action
 from Poker.evaluate import Eval
 
 class TexasHoldem:
-    def __init__(self, players: List[Player]):
+    # deals: optional DealSequence, hand n is dealt from deals.deck(n) instead of a fresh shuffle, seat by seat
+    # (see _deal_cards)
+    def __init__(self, players: List[Player], deals: DealSequence = None):
         self.initial_players = players
         self.players = players
         self.small_blind = ChipStash()
@@ -25,6 +27,8 @@ class TexasHoldem:
         self.min_raise = self.small_blind
         self.evaluator = Eval()
         self.sb_paid = False
+        self.deals = deals
+        self.hands_dealt = 0
 
         # setting the players position on the table
         for i, p in enumerate(self.initial_players):
@@ -77,7 +81,8 @@ class TexasHoldem:
     
     def _deal_round(self):
         # Reset
-        self.deck = Deck()
+        self.deck = Deck() if self.deals is None else self.deals.deck(self.hands_dealt)
+        self.hands_dealt += 1
         self.community_cards = []
         self.trash_cards = []
         self.main_pot.reset()
@@ -121,10 +126,20 @@ class TexasHoldem:
         self._deal_cards()
 
     # Deals 2 cards to each player round robin
+    # With a DealSequence the cards go around every seat the table started with, a busted seat's cards are burned,
+    # so each seat gets the same cards of a hand whoever has busted (duplicate poker relies on it)
     def _deal_cards(self):
+        if self.deals is None:
+            for _ in range(2):
+                for player in self.players:
+                    player.receive_card(self.deck.deal())
+            return
         for _ in range(2):
-            for player in self.players:
-                player.receive_card(self.deck.deal())
+            for player in self.initial_players:
+                if player in self.players:
+                    player.receive_card(self.deck.deal())
+                else:
+                    self._burn_card()
         # for player in self.players:
         #     print(f"{player.name} hand: {player.hand[0]}  {player.hand[1]}")
 
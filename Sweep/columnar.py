@@ -0,0 +1,138 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import argparse
+import os
+import shutil
+
+# Columnar output backend: each table is a Parquet dataset partitioned by combination and iteration,
+#   <root>/lineage_history/combination=<name>/iteration=<i>/part-0.parquet
+#   <root>/lineage_summary/combination=<name>/iteration=<i>/part-0.parquet
+#   <root>/population_stats/combination=<name>/iteration=<i>/part-0.parquet
+# The partition values are not stored in the files, readers get them back from the paths.
+# In lineage_history and lineage_summary the ids are dictionary encoded and generations are stored as integers
+# ("generation_-1" -> -1).
+
+COMPRESSION = "zstd"
+# Rows converted at a time, so converting a big lineage_history doesn't load it whole
+CHUNK_ROWS = 250_000
+
+def combination_folder(root: str, table: str, combination: str) -> str:
+    return os.path.join(root, table, f"combination={combination}")
+
+# Fixed column types for lineage_history and lineage_summary, so every chunk of a file gets the same schema
+def _lineage_frame(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df["generation"] = df["generation"].astype(str).str.removeprefix("generation_")
+    for column in df.columns:
+        if column in ("lineage", "id"):
+            df[column] = df[column].astype(str).astype("category")
+        elif column == "generation":
+            df[column] = df[column].astype("int32")
+        elif column == "table_position":
+            df[column] = df[column].astype("Int8")
+        elif column in ("rounds_lasted", "count") or column.startswith("action_"):
+            df[column] = df[column].astype("int64")
+        else:
+            df[column] = df[column].astype("float64")
+    return df
+
+def _table(df: pd.DataFrame) -> pa.Table:
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # pandas picks the smallest index type per chunk, pin it so chunks can share a writer
+    schema = pa.schema([pa.field(field.name, pa.dictionary(pa.int32(), pa.string())) if pa.types.is_dictionary(field.type) else field
+                        for field in table.schema])
+    return table.cast(schema)
+
+# Converts a CSV (lineage_history, lineage_summary or population_stats, with an iteration column) into
+# folder/iteration=<i>/part-0.parquet files
+def write_partitions(csv_path: str, folder: str):
+    lineage = pd.read_csv(csv_path, nrows=0).columns[0] == "lineage"
+    # population_stats is small but its extra columns can be empty for a whole chunk, so it's converted in one go
+    chunks = pd.read_csv(csv_path, chunksize=CHUNK_ROWS) if lineage else [pd.read_csv(csv_path)]
+    writers = {}
+    try:
+        for chunk in chunks:
+            for iteration, rows in chunk.groupby("iteration", sort=False):
+                rows = rows.drop(columns="iteration")
+                table = _table(_lineage_frame(rows) if lineage else rows)
+                if iteration not in writers:
+                    path = os.path.join(folder, f"iteration={iteration}", "part-0.parquet")
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    writers[iteration] = pq.ParquetWriter(path, table.schema, compression=COMPRESSION)
+                writers[iteration].write_table(table.cast(writers[iteration].schema))
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+# Names of the combinations in a dataset
+def combinations(root: str, table: str = "population_stats"):
+    folder = os.path.join(root, table)
+    if not os.path.isdir(folder):
+        return []
+    return sorted(name[len("combination="):] for name in os.listdir(folder) if name.startswith("combination="))
+
+def _partitioning():
+    return ds.partitioning(pa.schema([("combination", pa.string()), ("iteration", pa.int32())]), flavor="hive")
+
+# population_stats of one combination, in the same layout as population_stats.csv
+# Iterations are read one by one since their extra columns don't have to match
+def read_population_stats(root: str, combination: str) -> pd.DataFrame:
+    folder = combination_folder(root, "population_stats", combination)
+    frames = []
+    for name in sorted(os.listdir(folder), key=lambda name: int(name[len("iteration="):])):
+        df = pq.read_table(os.path.join(folder, name, "part-0.parquet")).to_pandas()
+        df["iteration"] = int(name[len("iteration="):])
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True)
+
+# population_stats of every combination in one read, with a combination column
+# Extra columns a combination doesn't have are empty for it
+def read_all_population_stats(root: str) -> pd.DataFrame:
+    dataset = ds.dataset(os.path.join(root, "population_stats"), format="parquet", partitioning=_partitioning())
+    schema = pa.unify_schemas([fragment.physical_schema for fragment in dataset.get_fragments()] + [_partitioning().schema])
+    dataset = ds.dataset(os.path.join(root, "population_stats"), format="parquet", partitioning=_partitioning(), schema=schema)
+    return dataset.to_table().to_pandas()
+
+# lineage_history (or with table="lineage_summary", lineage_summary) rows, optionally only some columns or one combination
+# Generations are integers and lineage / id come back as categoricals
+def read_lineage_history(root: str, combination: str = None, columns=None, table: str = "lineage_history") -> pd.DataFrame:
+    dataset = ds.dataset(os.path.join(root, table), format="parquet", partitioning=_partitioning())
+    row_filter = ds.field("combination") == combination if combination is not None else None
+    return dataset.to_table(columns=columns, filter=row_filter).to_pandas()
+
+# One-shot conversion of existing CSV results: every output/combination_<name> folder with finished CSVs
+# is written into the datasets under root (skipping combinations that are already there)
+def convert_output(output_folder: str, root: str, delete_csv: bool = False):
+    for folder_name in sorted(os.listdir(output_folder)):
+        lineage_file = os.path.join(output_folder, folder_name, "lineage_history", "lineage_history.csv")
+        summary_file = os.path.join(output_folder, folder_name, "lineage_summary", "lineage_summary.csv")
+        stats_file = os.path.join(output_folder, folder_name, "population_stats", "population_stats.csv")
+        if not folder_name.startswith("combination_") or not os.path.isfile(stats_file):
+            continue
+        combination = folder_name[len("combination_"):]
+        # population_stats goes in last, it marks the combination as converted
+        if not os.path.isdir(combination_folder(root, "population_stats", combination)):
+            for table, csv_path in (("lineage_history", lineage_file), ("lineage_summary", summary_file), ("population_stats", stats_file)):
+                # Results from before lineage_summary was written don't have one
+                if not os.path.isfile(csv_path):
+                    continue
+                final = combination_folder(root, table, combination)
+                tmp = f"{final}.tmp{os.getpid()}"
+                write_partitions(csv_path, tmp)
+                shutil.rmtree(final, ignore_errors=True)
+                os.replace(tmp, final)
+            print(f"Converted {folder_name}")
+        if delete_csv:
+            for csv_path in (lineage_file, summary_file, stats_file):
+                shutil.rmtree(os.path.dirname(csv_path), ignore_errors=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert CSV results in output/ to the Parquet datasets")
+    parser.add_argument("output", nargs="?", default="output", help="folder with the combination_* folders")
+    parser.add_argument("--root", default=None, help="where the datasets go (default: <output>/parquet)")
+    parser.add_argument("--delete-csv", action="store_true", help="remove the CSVs once a combination is converted")
+    args = parser.parse_args()
+
+    convert_output(args.output, args.root or os.path.join(args.output, "parquet"), args.delete_csv)
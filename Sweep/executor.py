@@ -0,0 +1,41 @@
+from Sweep.manifest import RunManifest
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import traceback
+from tqdm import tqdm
+
+# Runs every (combination, iteration) of jobs on a process pool and keeps track of them in a RunManifest
+# jobs: {combination name: payload}
+# run_job(payload, iteration) runs in a worker and saves its own results (atomically)
+# finish_job(payload) runs in this process once every iteration of a combination is done (merging the results)
+# Rerunning after a crash only runs what the manifest doesn't have as done
+def run_sweep(jobs: dict, iterations: int, run_job, finish_job, manifest_path: str, workers: int = None):
+    manifest = RunManifest(manifest_path)
+    for combination in jobs:
+        manifest.register(combination, iterations)
+    manifest.reset_unfinished()
+
+    # Combinations whose iterations all finished but that died before being merged
+    for combination, payload in jobs.items():
+        if manifest.combination_done(combination):
+            finish_job(payload)
+
+    pending = manifest.pending(set(jobs))
+    tqdm.write(f"Sweep: {len(pending)} runs to go ({manifest.status_counts()})")
+    with ProcessPoolExecutor(workers) as pool:
+        futures = {}
+        for combination, iteration in pending:
+            manifest.mark_running(combination, iteration)
+            futures[pool.submit(run_job, jobs[combination], iteration)] = (combination, iteration)
+
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Sweep", unit="run"):
+            combination, iteration = futures[future]
+            try:
+                future.result()
+            except Exception:
+                manifest.mark_failed(combination, iteration, traceback.format_exc())
+                tqdm.write(f"Run {combination} iteration {iteration} failed, it will be retried on the next sweep")
+                continue
+            manifest.mark_done(combination, iteration)
+            if manifest.combination_done(combination):
+                finish_job(jobs[combination])
+    manifest.close()
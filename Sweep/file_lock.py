@@ -0,0 +1,28 @@
+from contextlib import contextmanager
+import os
+
+# Exclusive lock on a lock file for the duration of a with block, so processes that share the file system
+# (sweep workers) take turns: fcntl.flock on POSIX, msvcrt.locking on Windows. Each module only exists on its own
+# platform, so they're imported when a lock is taken rather than when this module is.
+@contextmanager
+def file_lock(path: str):
+    with open(path, "w") as lock:
+        if os.name == "nt":
+            import msvcrt
+            while True:
+                try:
+                    msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after 10 seconds, keep waiting
+                    continue
+            try:
+                yield
+            finally:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            # Released when the file is closed
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
@@ -0,0 +1,184 @@
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import traceback
+
+# Iteration number of the job that merges a combination's iterations, it becomes claimable once they're all done
+MERGE = -1
+
+class Lease:
+    def __init__(self, combination: str, iteration: int, payload: dict, token: int, worker: str):
+        self.combination = combination
+        self.iteration = iteration
+        self.payload = payload
+        # Fencing token, bumped every time the job is claimed, only the current holder can heartbeat or complete it
+        self.token = token
+        self.worker = worker
+
+    # Suffix for this attempt's temp files, unique per claim so two holders never write the same path
+    @property
+    def suffix(self) -> str:
+        return f".tmp-{self.worker}-{self.token}"
+
+# Sweep job queue in a SQLite file on the shared filesystem, no broker needed.
+# Workers claim jobs with a lease that they keep alive with heartbeats, a job whose lease expires
+# (worker died or lost the filesystem) is handed to the next worker that asks.
+# Results are written to per-attempt temp files and only renamed into place inside the transaction that marks
+# the job done, under the job's current token, so a reclaimed job can never produce its results twice.
+# Note: SQLite locking needs a filesystem with working POSIX locks (local disk, or NFS with proper lockd).
+class JobQueue:
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                combination TEXT NOT NULL,
+                iteration INTEGER NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                token INTEGER NOT NULL DEFAULT 0,
+                worker TEXT,
+                lease_expires REAL,
+                finished REAL,
+                error TEXT,
+                PRIMARY KEY (combination, iteration)
+            )""")
+
+    def close(self):
+        self.conn.close()
+
+    # Queues every iteration of a combination plus its merge job, already queued jobs are left alone
+    def enqueue(self, combination: str, iterations: int, payload: dict):
+        rows = [(combination, iteration, json.dumps(payload)) for iteration in list(range(iterations)) + [MERGE]]
+        self.conn.executemany("INSERT OR IGNORE INTO jobs (combination, iteration, payload) VALUES (?, ?, ?)", rows)
+
+    # Claims one job: pending, or leased with an expired lease. Merge jobs wait for all of their iterations.
+    def claim(self, worker: str, lease_seconds: float):
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.conn.execute("""
+                SELECT combination, iteration, payload, token FROM jobs AS j
+                WHERE (status = 'pending' OR (status = 'leased' AND lease_expires < ?))
+                  AND (iteration != ? OR NOT EXISTS (
+                      SELECT 1 FROM jobs WHERE combination = j.combination AND iteration != ? AND status != 'done'))
+                ORDER BY iteration = ?, combination, iteration
+                LIMIT 1""", (now, MERGE, MERGE, MERGE)).fetchone()
+            if row is None:
+                self.conn.execute("COMMIT")
+                return None
+            combination, iteration, payload, token = row
+            self.conn.execute("UPDATE jobs SET status = 'leased', token = ?, worker = ?, lease_expires = ?, error = NULL "
+                              "WHERE combination = ? AND iteration = ?",
+                              (token + 1, worker, now + lease_seconds, combination, iteration))
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return Lease(combination, iteration, json.loads(payload), token + 1, worker)
+
+    # Extends the lease, False means it was lost (expired and claimed by someone else)
+    def heartbeat(self, lease: Lease, lease_seconds: float) -> bool:
+        cursor = self.conn.execute("UPDATE jobs SET lease_expires = ? WHERE combination = ? AND iteration = ? "
+                                   "AND status = 'leased' AND token = ?",
+                                   (time.time() + lease_seconds, lease.combination, lease.iteration, lease.token))
+        return cursor.rowcount == 1
+
+    # Moves the attempt's temp files into place and marks the job done, all or nothing.
+    # renames: [(temp path, final path)]. Returns False (and drops the temp files) if the lease was lost.
+    def complete(self, lease: Lease, renames) -> bool:
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            current = self.conn.execute("SELECT status, token FROM jobs WHERE combination = ? AND iteration = ?",
+                                        (lease.combination, lease.iteration)).fetchone()
+            if current != ("leased", lease.token):
+                self.conn.execute("ROLLBACK")
+                for tmp_path, _ in renames:
+                    if os.path.isdir(tmp_path):
+                        shutil.rmtree(tmp_path)
+                    elif os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                return False
+            for tmp_path, final_path in renames:
+                # os.replace can't overwrite a non-empty folder (partitions left by an attempt that died halfway)
+                if os.path.isdir(final_path):
+                    shutil.rmtree(final_path)
+                os.replace(tmp_path, final_path)
+            self.conn.execute("UPDATE jobs SET status = 'done', finished = ?, lease_expires = NULL "
+                              "WHERE combination = ? AND iteration = ?", (time.time(), lease.combination, lease.iteration))
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return True
+
+    # Gives a failed job back to the queue
+    def release(self, lease: Lease, error: str = None):
+        self.conn.execute("UPDATE jobs SET status = 'pending', lease_expires = NULL, error = ? "
+                          "WHERE combination = ? AND iteration = ? AND status = 'leased' AND token = ?",
+                          (error, lease.combination, lease.iteration, lease.token))
+
+    def unfinished(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM jobs WHERE status != 'done'").fetchone()[0]
+
+    def status_counts(self) -> dict:
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+# Keeps a lease alive from a background thread while the job runs
+class _Heartbeat(threading.Thread):
+    def __init__(self, queue_path: str, lease: Lease, lease_seconds: float, interval: float):
+        super().__init__(daemon=True)
+        self.queue_path = queue_path
+        self.lease = lease
+        self.lease_seconds = lease_seconds
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.lost = False
+
+    def run(self):
+        # sqlite connections can't be shared across threads
+        queue = JobQueue(self.queue_path)
+        while not self.stopped.wait(self.interval):
+            if not queue.heartbeat(self.lease, self.lease_seconds):
+                self.lost = True
+                break
+        queue.close()
+
+# Worker loop: claim, run, complete, until the queue is empty
+# execute(payload, iteration, suffix) runs the job and returns the [(temp path, final path)] it wrote
+# after_complete(payload, iteration) runs once the job's results are in place
+def run_worker(queue_path: str, execute, worker: str, lease_seconds: float = 600, heartbeat_seconds: float = 60,
+               poll_seconds: float = 30, after_complete=None):
+    queue = JobQueue(queue_path)
+    while True:
+        lease = queue.claim(worker, lease_seconds)
+        if lease is None:
+            if queue.unfinished() == 0:
+                break
+            # Everything left is leased by other workers (or merges waiting on them)
+            time.sleep(poll_seconds)
+            continue
+
+        heartbeat = _Heartbeat(queue_path, lease, lease_seconds, heartbeat_seconds)
+        heartbeat.start()
+        try:
+            renames = execute(lease.payload, lease.iteration, lease.suffix)
+        except Exception:
+            heartbeat.stopped.set()
+            heartbeat.join()
+            queue.release(lease, traceback.format_exc())
+            print(f"{worker}: {lease.combination} iteration {lease.iteration} failed, released it back to the queue")
+            continue
+        heartbeat.stopped.set()
+        heartbeat.join()
+
+        if queue.complete(lease, renames):
+            if after_complete is not None:
+                after_complete(lease.payload, lease.iteration)
+        else:
+            print(f"{worker}: lost the lease on {lease.combination} iteration {lease.iteration}, discarded the results")
+    queue.close()
@@ -0,0 +1,59 @@
+import sqlite3
+import time
+
+# Sweep bookkeeping in a small SQLite file, one row per (combination, iteration)
+# status is one of pending, running, done, failed
+# Every change is its own transaction, so the file is always consistent even if the sweep dies mid-run
+class RunManifest:
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS runs (
+                combination TEXT NOT NULL,
+                iteration INTEGER NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                started REAL,
+                finished REAL,
+                error TEXT,
+                PRIMARY KEY (combination, iteration)
+            )""")
+
+    def close(self):
+        self.conn.close()
+
+    # Adds the iterations of a combination that aren't in the manifest yet
+    def register(self, combination: str, iterations: int):
+        self.conn.executemany("INSERT OR IGNORE INTO runs (combination, iteration) VALUES (?, ?)",
+                              [(combination, iteration) for iteration in range(iterations)])
+
+    # After a crash anything that was running (or failed) is handed out again
+    def reset_unfinished(self):
+        self.conn.execute("UPDATE runs SET status = 'pending' WHERE status IN ('running', 'failed')")
+
+    def pending(self, combinations=None):
+        rows = self.conn.execute("SELECT combination, iteration FROM runs WHERE status = 'pending' ORDER BY combination, iteration").fetchall()
+        if combinations is not None:
+            rows = [row for row in rows if row[0] in combinations]
+        return rows
+
+    def mark_running(self, combination: str, iteration: int):
+        self.conn.execute("UPDATE runs SET status = 'running', attempts = attempts + 1, started = ?, error = NULL "
+                          "WHERE combination = ? AND iteration = ?", (time.time(), combination, iteration))
+
+    def mark_done(self, combination: str, iteration: int):
+        self.conn.execute("UPDATE runs SET status = 'done', finished = ? WHERE combination = ? AND iteration = ?",
+                          (time.time(), combination, iteration))
+
+    def mark_failed(self, combination: str, iteration: int, error: str):
+        self.conn.execute("UPDATE runs SET status = 'failed', finished = ?, error = ? WHERE combination = ? AND iteration = ?",
+                          (time.time(), error, combination, iteration))
+
+    def combination_done(self, combination: str) -> bool:
+        remaining = self.conn.execute("SELECT COUNT(*) FROM runs WHERE combination = ? AND status != 'done'", (combination,)).fetchone()[0]
+        return remaining == 0
+
+    def status_counts(self) -> dict:
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM runs GROUP BY status").fetchall())
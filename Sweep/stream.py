@@ -0,0 +1,114 @@
+import csv
+import heapq
+import io
+import json
+import os
+import random
+import shutil
+
+# Append-only writer for results that arrive one generation at a time. Every write goes straight to the file,
+# so memory stays flat however long the run is and a crash only loses the generation in progress.
+# offset: reopen an existing file and cut off everything after that byte (what was written since the last checkpoint)
+class StreamWriter:
+    def __init__(self, path: str, offset: int = None):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if offset is None:
+            self.file = open(path, "wb")
+        else:
+            self.file = open(path, "r+b")
+            self.file.truncate(offset)
+            self.file.seek(offset)
+
+    def _append(self, text: str):
+        self.file.write(text.encode())
+        self.file.flush()
+
+    # Byte offset of everything written so far, forced to disk so a checkpoint can rely on it
+    def sync(self) -> int:
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+# CSV with a fixed set of columns, the header is written when the file is started
+class CsvStream(StreamWriter):
+    def __init__(self, path: str, columns, offset: int = None):
+        super().__init__(path, offset)
+        self.columns = list(columns)
+        if offset is None:
+            self._append(",".join(self.columns) + "\n")
+
+    def write(self, rows):
+        buffer = io.StringIO()
+        csv.DictWriter(buffer, self.columns, lineterminator="\n").writerows(rows)
+        self._append(buffer.getvalue())
+
+# One JSON object per line, for rows whose columns vary (population_stats' extra columns depend on the generation)
+class JsonLinesStream(StreamWriter):
+    def write(self, rows):
+        # numpy scalars aren't JSON serializable
+        self._append("".join(json.dumps(row, default=lambda value: value.item()) + "\n" for row in rows))
+
+def read_json_lines(path: str):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+# Concatenates CSV files with the same header into out_path without loading them
+def concat_csv(paths, out_path: str):
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    with open(out_path, "wb") as out:
+        for n, path in enumerate(paths):
+            with open(path, "rb") as f:
+                header = f.readline()
+                if n == 0:
+                    out.write(header)
+                shutil.copyfileobj(f, out)
+
+# Stand-ins for a CsvStream that only keep some of the rows written to them, for outputs too big to keep whole.
+# Memory is bounded by size, the rows are written out at the end (rows()). Both pickle, so they go in checkpoints.
+
+# Uniform sample of size rows out of everything written (reservoir sampling, algorithm R)
+class ReservoirSample:
+    def __init__(self, size: int, seed=None):
+        self.size = size
+        self.seen = 0
+        self.sample = []
+        self.random = random.Random(seed)
+
+    def write(self, rows):
+        for row in rows:
+            if len(self.sample) < self.size:
+                self.sample.append((self.seen, row))
+            else:
+                slot = self.random.randrange(self.seen + 1)
+                if slot < self.size:
+                    self.sample[slot] = (self.seen, row)
+            self.seen += 1
+
+    # The sampled rows in the order they were written
+    def rows(self):
+        return [row for _, row in sorted(self.sample, key=lambda entry: entry[0])]
+
+# The size rows with the highest key (ties go to the earlier row)
+class TopKSample:
+    def __init__(self, size: int, key: str):
+        self.size = size
+        self.key = key
+        self.seen = 0
+        self.heap = []
+
+    def write(self, rows):
+        for row in rows:
+            entry = (row[self.key], -self.seen, row)
+            if len(self.heap) < self.size:
+                heapq.heappush(self.heap, entry)
+            elif entry[:2] > self.heap[0][:2]:
+                heapq.heapreplace(self.heap, entry)
+            self.seen += 1
+
+    # The kept rows in the order they were written
+    def rows(self):
+        return [row for _, _, row in sorted(self.heap, key=lambda entry: -entry[1])]
@@ -0,0 +1,83 @@
+# Materialized per-combination aggregates for the graphing scripts, stored next to the catalog in output/catalog.sqlite
+# Each combination's aggregates remember the results mtime they were computed from, updating only recomputes
+# the combinations whose results changed (per the catalog) and drops the ones that are gone.
+#   fitness_by_generation: count, sum and sum of squares of fitness per generation (over iterations),
+#                          so means and standard deviations of any group of combinations can be put together
+#   fitness_rows:          every population_stats row's fitness and average traits, for top-n% queries
+import numpy as np
+import pandas as pd
+from catalog import connect, load_catalog, TRAITS
+from results import read_population_stats
+
+ROW_COLUMNS = ['fitness'] + [f'avg_trait_{trait}' for trait in TRAITS]
+
+def create_tables(conn):
+    conn.execute('CREATE TABLE IF NOT EXISTS aggregated (folder PRIMARY KEY, stats_mtime)')
+    conn.execute('CREATE TABLE IF NOT EXISTS fitness_by_generation (folder, generation, n, total, total_sq)')
+    conn.execute(f'CREATE TABLE IF NOT EXISTS fitness_rows (folder, generation, iteration, {", ".join(ROW_COLUMNS)})')
+    conn.execute('CREATE INDEX IF NOT EXISTS fitness_by_generation_folder ON fitness_by_generation (folder)')
+    conn.execute('CREATE INDEX IF NOT EXISTS fitness_rows_folder ON fitness_rows (folder)')
+
+def delete_aggregates(conn, folder):
+    for table in ('aggregated', 'fitness_by_generation', 'fitness_rows'):
+        conn.execute(f'DELETE FROM {table} WHERE folder = ?', (folder,))
+
+# Updates the catalog, then recomputes the aggregates of the combinations that changed
+# Returns the catalog and the names of the recomputed combinations
+def update_aggregates(output_folder):
+    catalog = load_catalog(output_folder)
+    conn = connect(output_folder)
+    create_tables(conn)
+    aggregated = dict(conn.execute('SELECT folder, stats_mtime FROM aggregated'))
+
+    recomputed = []
+    for _, entry in catalog.iterrows():
+        if aggregated.get(entry['folder']) == entry['stats_mtime']:
+            continue
+        pop_stats = read_population_stats(output_folder, entry['format'], entry['stats_path'])
+        delete_aggregates(conn, entry['folder'])
+
+        fitness = pop_stats.groupby('generation')['fitness']
+        by_generation = pd.DataFrame({'n': fitness.count(), 'total': fitness.sum(),
+                                      'total_sq': (pop_stats['fitness'] ** 2).groupby(pop_stats['generation']).sum()})
+        conn.executemany('INSERT INTO fitness_by_generation VALUES (?, ?, ?, ?, ?)',
+                         [(entry['folder'], int(generation), int(row.n), row.total, row.total_sq)
+                          for generation, row in by_generation.iterrows()])
+
+        rows = pop_stats[['generation', 'iteration'] + ROW_COLUMNS]
+        conn.executemany(f'INSERT INTO fitness_rows VALUES ({", ".join("?" * (len(ROW_COLUMNS) + 3))})',
+                         [(entry['folder'], int(generation), int(iteration), *map(float, values))
+                          for generation, iteration, *values in rows.itertuples(index=False)])
+        conn.execute('INSERT INTO aggregated VALUES (?, ?)', (entry['folder'], entry['stats_mtime']))
+        recomputed.append(entry['folder'])
+
+    for folder in set(aggregated) - set(catalog['folder']):
+        delete_aggregates(conn, folder)
+    conn.commit()
+    conn.close()
+    return catalog, recomputed
+
+def query(output_folder, sql, params=()):
+    conn = connect(output_folder)
+    df = pd.read_sql_query(sql, conn, params=params)
+    conn.close()
+    return df
+
+# Mean and standard deviation of fitness per generation over all runs of the combinations with each value of
+# parameter (a catalog column like 'N' or 'p_c'), the same as grouping their population_stats rows together
+def fitness_by_parameter(output_folder, parameter):
+    update_aggregates(output_folder)
+    sums = query(output_folder, f'''
+        SELECT c.{parameter} AS value, g.generation, SUM(g.n) AS n, SUM(g.total) AS total, SUM(g.total_sq) AS total_sq
+        FROM fitness_by_generation AS g JOIN combinations AS c ON c.folder = g.folder
+        GROUP BY c.{parameter}, g.generation ORDER BY c.{parameter}, g.generation''')
+    sums['mean'] = sums['total'] / sums['n']
+    variance = (sums['total_sq'] - sums['total'] ** 2 / sums['n']) / (sums['n'] - 1)
+    sums['std'] = np.sqrt(variance.clip(lower=0)).where(sums['n'] > 1)
+    return sums[['value', 'generation', 'mean', 'std']]
+
+# The top share of all population_stats rows (every generation of every combination) by fitness
+def top_rows(output_folder, share=0.05):
+    update_aggregates(output_folder)
+    total = query(output_folder, 'SELECT COUNT(*) AS n FROM fitness_rows')['n'][0]
+    return query(output_folder, 'SELECT * FROM fitness_rows ORDER BY fitness DESC LIMIT ?', (int(total * share),))
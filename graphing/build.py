@@ -0,0 +1,123 @@
+# Plot build runner: python graphing/build.py [--force] [--workers N] [figure names]
+# Every figure is declared with the data it's drawn from. A figure is only rendered again when that data or the
+# script that draws it changed since its last build (fingerprints are kept in output/catalog.sqlite), and the
+# figures that need rendering are drawn in parallel worker processes on the headless Agg backend.
+import matplotlib
+matplotlib.use('Agg')
+
+import argparse
+import hashlib
+import inspect
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+import matplotlib.pyplot as plt
+import pandas as pd
+from catalog import connect
+from aggregates import fitness_by_parameter, top_rows
+import graph_traits
+import graph_varying_parameters
+import heatmap_graph
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+base_output_folder = os.path.join(current_dir, '..', 'output')
+
+class Figure:
+    # data: name of the loader (see loaders) whose DataFrame the figure is drawn from
+    # render(data, save_path=path) draws and saves the figure
+    def __init__(self, name, path, data, render):
+        self.name = name
+        self.path = path
+        self.data = data
+        self.render = render
+
+# Data the figures are drawn from, all of it comes from the catalog and the cached aggregates
+def loaders(output_folder):
+    data = {
+        'fitness': partial(graph_traits.load_fitness, output_folder),
+        'top_rows': partial(top_rows, output_folder, 0.05)
+    }
+    for group_key, _, _ in graph_varying_parameters.variables:
+        data[f'fitness_by_{group_key}'] = partial(fitness_by_parameter, output_folder, group_key)
+    return data
+
+def figures():
+    declared = []
+    for group_key, title, save_name in graph_varying_parameters.variables:
+        declared.append(Figure(save_name, os.path.join(graph_varying_parameters.output_dir, f'{save_name}.png'),
+                               f'fitness_by_{group_key}', partial(graph_varying_parameters.plot_variable, group_key=group_key, title=title)))
+    for param in graph_traits.parameters:
+        declared.append(Figure(f'best_fitness_vs_{param}', os.path.join(graph_traits.output_dir, f'best_fitness_vs_{param}.png'),
+                               'fitness', partial(graph_traits.plot_best_fitness, param=param)))
+    declared.append(Figure('bar_chart_for_best_traits', os.path.join(graph_traits.output_dir, 'bar_chart_for_best_traits.png'),
+                           'fitness', graph_traits.plot_winning_traits))
+    declared.append(Figure('heatmap_correlation', os.path.join(heatmap_graph.output_dir, 'heatmap_correlation.png'),
+                           'top_rows', heatmap_graph.plot_heatmap))
+    return declared
+
+# Changes when the figure's data, the script that draws it or where it's saved change
+def fingerprint(figure, data):
+    digest = hashlib.sha1()
+    digest.update(figure.path.encode())
+    digest.update(str(list(data.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    with open(inspect.getsourcefile(figure.render.func if isinstance(figure.render, partial) else figure.render), 'rb') as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+# Runs in a worker, returns how long the figure took
+def render_figure(render, data, path):
+    start = time.perf_counter()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    render(data, save_path=path)
+    plt.close('all')
+    return time.perf_counter() - start
+
+def build(output_folder, names=None, force=False, workers=None):
+    conn = connect(output_folder)
+    conn.execute('CREATE TABLE IF NOT EXISTS figures (name PRIMARY KEY, fingerprint, seconds, built)')
+    built = {name: figure_fingerprint for name, figure_fingerprint in conn.execute('SELECT name, fingerprint FROM figures')}
+    conn.close()
+
+    start = time.perf_counter()
+    data_loaders = loaders(output_folder)
+    loaded = {}
+    todo = []
+    for figure in figures():
+        if names and figure.name not in names:
+            continue
+        if figure.data not in loaded:
+            loaded[figure.data] = data_loaders[figure.data]()
+        figure_fingerprint = fingerprint(figure, loaded[figure.data])
+        if not force and built.get(figure.name) == figure_fingerprint and os.path.exists(figure.path):
+            print(f'{figure.name}: up to date')
+            continue
+        todo.append((figure, figure_fingerprint))
+    print(f'Loaded the data in {time.perf_counter() - start:.2f}s, {len(todo)} figures to render')
+
+    results = []
+    with ProcessPoolExecutor(workers) as pool:
+        futures = {pool.submit(render_figure, figure.render, loaded[figure.data], figure.path): (figure, figure_fingerprint)
+                   for figure, figure_fingerprint in todo}
+        for future in as_completed(futures):
+            figure, figure_fingerprint = futures[future]
+            seconds = future.result()
+            print(f'{figure.name}: rendered in {seconds:.2f}s')
+            results.append((figure.name, figure_fingerprint, seconds, time.time()))
+
+    conn = connect(output_folder)
+    conn.executemany('INSERT OR REPLACE INTO figures VALUES (?, ?, ?, ?)', results)
+    conn.commit()
+    conn.close()
+    print(f'Built {len(results)} figures in {time.perf_counter() - start:.2f}s')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Render the figures whose data changed')
+    parser.add_argument('names', nargs='*', help='only these figures (default: all)')
+    parser.add_argument('--force', action='store_true', help='render even if nothing changed')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--output', default=base_output_folder, help='folder with the results')
+    args = parser.parse_args()
+
+    build(args.output, args.names, args.force, args.workers)
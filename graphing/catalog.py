@@ -0,0 +1,100 @@
+# Catalog of the combinations in output/, kept in output/catalog.sqlite
+# Every combination's parameters (from config.json), result paths, their modification times and summary metrics
+# are stored once. Updating only reads the combinations whose files changed since the last update, so the
+# graphing scripts query the catalog instead of reading every population_stats file.
+import json
+import os
+import re
+import sqlite3
+import pandas as pd
+from results import find_results, read_population_stats, results_mtime
+
+CATALOG_FILE = 'catalog.sqlite'
+
+TRAITS = ['aggressiveness', 'risk_tolerance', 'bluff_tendency', 'position_awareness', 'chip_size_awareness']
+
+# Summary metrics over the last 5 generations, the window every graphing script uses
+SUMMARY_COLUMNS = ['best_fitness', 'last5_fitness'] + [f'last5_avg_trait_{trait}' for trait in TRAITS]
+
+COLUMNS = (['folder', 'N', 'p_c', 'p_m', 'max_players', 'k', 'round_cutoff', 'generations', 'iterations',
+            'format', 'stats_path', 'lineage_path', 'config_mtime', 'stats_mtime', 'last_generation'] + SUMMARY_COLUMNS)
+
+def connect(output_folder):
+    conn = sqlite3.connect(os.path.join(output_folder, CATALOG_FILE))
+    conn.execute(f'CREATE TABLE IF NOT EXISTS combinations ({", ".join(COLUMNS)}, PRIMARY KEY (folder))')
+    return conn
+
+# Parameters from config.json, or from the folder name for combinations without one
+def read_config(output_folder, folder_name):
+    config_file = os.path.join(output_folder, folder_name, 'config.json')
+    if os.path.isfile(config_file):
+        with open(config_file) as f:
+            config = json.load(f)
+        return {
+            'N': config['POPULATION_SIZE'],
+            'p_c': config['CROSSOVER_PROBABILITY'],
+            'p_m': config['MUTATION_PROBABILITY'],
+            'max_players': config['MAX_PLAYERS_PER_GAME'],
+            'k': config['TOURNAMENT_K'],
+            'round_cutoff': config['ROUND_CUTOFF'],
+            'generations': config.get('GENERATIONS'),
+            'iterations': config.get('ITERATIONS')
+        }
+    N, p_c, p_m, max_players, k, round_cutoff = re.match(r'combination_(\d+)_([\d.]+)_([\d.]+)_(\d+)_(\d+)_(\d+)', folder_name).groups()
+    return {'N': int(N), 'p_c': float(p_c), 'p_m': float(p_m), 'max_players': int(max_players), 'k': int(k),
+            'round_cutoff': int(round_cutoff), 'generations': None, 'iterations': None}
+
+def summarize(pop_stats):
+    last_generation = pop_stats['generation'].max()
+    last_5 = pop_stats[pop_stats['generation'] >= (last_generation - 4)]
+    summary = {
+        'last_generation': int(last_generation),
+        'best_fitness': last_5['fitness'].max(),
+        'last5_fitness': last_5['fitness'].mean()
+    }
+    for trait in TRAITS:
+        summary[f'last5_avg_trait_{trait}'] = last_5[f'avg_trait_{trait}'].mean()
+    return summary
+
+# Brings the catalog up to date with output_folder and returns the names of the combinations that were (re)read
+def update_catalog(output_folder):
+    conn = connect(output_folder)
+    known = {folder: (config_mtime, stats_mtime)
+             for folder, config_mtime, stats_mtime in conn.execute('SELECT folder, config_mtime, stats_mtime FROM combinations')}
+
+    found = set()
+    updated = []
+    for folder_name, file_format, stats_path, lineage_path in find_results(output_folder):
+        found.add(folder_name)
+        config_file = os.path.join(output_folder, folder_name, 'config.json')
+        config_mtime = os.path.getmtime(config_file) if os.path.isfile(config_file) else None
+        stats_mtime = results_mtime(os.path.join(output_folder, stats_path))
+        if known.get(folder_name) == (config_mtime, stats_mtime):
+            continue
+
+        entry = {'folder': folder_name, 'format': file_format, 'stats_path': stats_path, 'lineage_path': lineage_path,
+                 'config_mtime': config_mtime, 'stats_mtime': stats_mtime}
+        entry.update(read_config(output_folder, folder_name))
+        entry.update(summarize(read_population_stats(output_folder, file_format, stats_path)))
+        conn.execute(f'INSERT OR REPLACE INTO combinations VALUES ({", ".join("?" * len(COLUMNS))})',
+                     [entry[column] for column in COLUMNS])
+        updated.append(folder_name)
+
+    removed = set(known) - found
+    conn.executemany('DELETE FROM combinations WHERE folder = ?', [(folder,) for folder in removed])
+    conn.commit()
+    conn.close()
+    return updated
+
+# The catalog as a DataFrame, one row per combination (updated first)
+def load_catalog(output_folder):
+    update_catalog(output_folder)
+    conn = connect(output_folder)
+    catalog = pd.read_sql_query('SELECT * FROM combinations ORDER BY folder', conn)
+    conn.close()
+    return catalog
+
+# Yields (catalog row, population_stats DataFrame) for every combination in the catalog
+def load_population_stats(output_folder):
+    for _, entry in load_catalog(output_folder).iterrows():
+        yield entry, read_population_stats(output_folder, entry['format'], entry['stats_path'])
@@ -1,9 +1,7 @@
 # Graphing the parameters varying- similar to what we did on assignment 2 in COSC 420
-import pandas as pd
 import matplotlib.pyplot as plt
 import os
-import numpy as np
-import re
+from aggregates import fitness_by_parameter
 
 
 # Get the absolute path to the current script (graph_traits.py)
@@ -11,48 +9,23 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 
 # Creating directory to store the images this code produces
 output_dir = os.path.join(current_dir, 'varying_parameters')
-os.makedirs(output_dir, exist_ok=True)
 
 base_output_folder = os.path.join(current_dir, '..', 'output')
 
-data = []
-
-# Read through the files in population_stats
-for folder_name in os.listdir(base_output_folder):
-    folder_path = os.path.join(base_output_folder, folder_name)
-    pop_stat_file = os.path.join(folder_path, 'population_stats', 'population_stats.csv')
-
-    if os.path.isfile(pop_stat_file):
-        # Extract parameters from folder name using regex
-        match = re.match(r'combination_(\d+)_([\d.]+)_([\d.]+)_(\d+)_(\d+)_(\d+)', folder_name)
-        if match:
-            N, p_c, p_m, max_players, tournament_k, round_cutoff = match.groups()
-            params = {
-                'folder': folder_path,
-                'N': int(N),
-                'p_c': float(p_c),
-                'p_m': float(p_m),
-                'k': int(tournament_k)
-            }
-            df = pd.read_csv(pop_stat_file)
-            params['data'] = df
-            data.append(params)
+# Parameters we have varied, with the plot title and file name for each
+variables = [
+    ('N', 'Average Fitness vs Generation for Varying N', 'varying_N'),
+    ('p_c', 'Average Fitness vs Generation for Varying p_c', 'varying_p_c'),
+    ('p_m', 'Average Fitness vs Generation for Varying p_m', 'varying_p_m'),
+    ('k', 'Average Fitness vs Generation for Varying Tournament Size', 'varying_k')
+]
 
 # Plot the parameter we have varies
-def plot_variable(data, group_key, title, save_name):
-    grouped = {}
-    
-    for entry in data:
-        key = entry[group_key]
-        if key not in grouped:
-            grouped[key] = []
-        grouped[key].append(entry['data'])
-    
+# grouped: the per-generation mean and std over every run with the same parameter value (fitness_by_parameter)
+def plot_variable(grouped, group_key, title, save_path):
     plt.figure(figsize=(12, 8))
     
-    for key, dfs in grouped.items():
-        all_runs = pd.concat(dfs)
-
+    for key, runs in grouped.groupby('value'):
         # # Uncomment below if only want the last 5 generations of each CSV
         # # (I just didn't like how it looked for a poster or reserach paper)
         # max_generation = all_runs['generation'].max()
@@ -62,11 +35,9 @@ def plot_variable(data, group_key, title, save_name):
         # std = grouped_data.std()
         # generations = mean.index
 
-        all_runs = pd.concat(dfs)
-        grouped_data = all_runs.groupby('generation')['fitness']
-        mean = grouped_data.mean()
-        std = grouped_data.std()
-        generations = mean.index
+        mean = runs['mean'].to_numpy()
+        std = runs['std'].to_numpy()
+        generations = runs['generation'].to_numpy()
         
         plt.plot(generations, mean, label=f"{group_key}={key}")
         plt.fill_between(generations, mean - std, mean + std, alpha=0.3)
@@ -78,11 +49,12 @@ def plot_variable(data, group_key, title, save_name):
     plt.legend()
     plt.tight_layout()
 
-    plt.savefig(os.path.join(output_dir, f"{save_name}.png"), dpi=300)
-    plt.show()
+    plt.savefig(save_path, dpi=300)
 
-# Plotting each parameter (similar to our assignment 2)
-plot_variable(data, 'N', 'Average Fitness vs Generation for Varying N', 'varying_N')
-plot_variable(data, 'p_c', 'Average Fitness vs Generation for Varying p_c', 'varying_p_c')
-plot_variable(data, 'p_m', 'Average Fitness vs Generation for Varying p_m', 'varying_p_m')
-plot_variable(data, 'k', 'Average Fitness vs Generation for Varying Tournament Size', 'varying_k')
\ No newline at end of file
+if __name__ == '__main__':
+    os.makedirs(output_dir, exist_ok=True)
+    # Plotting each parameter (similar to our assignment 2)
+    for group_key, title, save_name in variables:
+        plot_variable(fitness_by_parameter(base_output_folder, group_key), group_key, title,
+                      os.path.join(output_dir, f"{save_name}.png"))
+        plt.show()
\ No newline at end of file
@@ -1,7 +1,6 @@
 import os
-import re
-import pandas as pd
 import matplotlib.pyplot as plt
+from aggregates import top_rows
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 output_root = os.path.join(current_dir, '..', 'output')  # adjust if needed
@@ -14,24 +13,8 @@ trait_columns = [
     'avg_trait_chip_size_awareness'
 ]
 
-# Accumulate all CSV data
-all_data = []
-
-for folder_name in os.listdir(output_root):
-    folder_path = os.path.join(output_root, folder_name)
-    stats_path = os.path.join(folder_path, 'population_stats', 'population_stats.csv')
-
-    if os.path.isfile(stats_path):
-        df = pd.read_csv(stats_path)
-        df['experiment'] = folder_name  # Optional: add source tag
-        all_data.append(df)
-
-# Combine all rows into one DataFrame
-combined_df = pd.concat(all_data, ignore_index=True)
-
-# Get top 5% by fitness
-top_n = int(len(combined_df) * 0.05)
-top_5_df = combined_df.sort_values(by='fitness', ascending=False).head(top_n)
+# Get top 5% by fitness (of every generation of every experiment, from the cached aggregates)
+top_5_df = top_rows(output_root, 0.05)
 
 # Compute average traits of top 5%
 trait_means = top_5_df[trait_columns].mean()
@@ -0,0 +1,63 @@
+# Finding and loading results for the graphing scripts, with either output format (OUTPUT_FORMAT in main.py)
+import os
+import sys
+import pandas as pd
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+# So the scripts can use the repo's modules when run from anywhere
+sys.path.insert(0, os.path.join(current_dir, '..'))
+
+# Latest modification time of a results file, or of the newest file in a Parquet partition folder
+def results_mtime(path):
+    if os.path.isfile(path):
+        return os.path.getmtime(path)
+    return max(os.path.getmtime(os.path.join(folder, name)) for folder, _, names in os.walk(path) for name in names)
+
+# Yields (folder name, format, population_stats path, lineage_history path) for every finished combination
+# in output_folder, paths relative to it. Only directories are listed, no results are read.
+# Combinations in the Parquet datasets (output/parquet) win over CSVs of the same combination
+def find_results(output_folder):
+    parquet_stats = os.path.join(output_folder, 'parquet', 'population_stats')
+    converted = set()
+    if os.path.isdir(parquet_stats):
+        for name in os.listdir(parquet_stats):
+            # Partition folders still being written have a suffix after the combination
+            if name.startswith('combination=') and '.tmp' not in name:
+                folder_name = f'combination_{name[len("combination="):]}'
+                converted.add(folder_name)
+                yield (folder_name, 'parquet', os.path.join('parquet', 'population_stats', name),
+                       os.path.join('parquet', 'lineage_history', name))
+
+    for folder_name in os.listdir(output_folder):
+        stats_path = os.path.join(folder_name, 'population_stats', 'population_stats.csv')
+        if folder_name not in converted and os.path.isfile(os.path.join(output_folder, stats_path)):
+            yield folder_name, 'csv', stats_path, os.path.join(folder_name, 'lineage_history', 'lineage_history.csv')
+
+def read_population_stats(output_folder, file_format, stats_path):
+    if file_format == 'parquet':
+        from Sweep.columnar import read_population_stats as read_parquet
+        return read_parquet(os.path.join(output_folder, 'parquet'), stats_path.split('combination=', 1)[1])
+    return pd.read_csv(os.path.join(output_folder, stats_path))
+
+# A combination's lineage_summary: one row per lineage per generation (lineage_summary_rows in main.py).
+# Results from before runs wrote it only have lineage_history, the same rows are built from that instead
+# (from a sampled lineage_history, see LINEAGE_ROWS in main.py, the counts are the sample's)
+def read_lineage_summary(base_folder):
+    summary_path = os.path.join(base_folder, 'lineage_summary', 'lineage_summary.csv')
+    if os.path.isfile(summary_path):
+        return pd.read_csv(summary_path)
+    return summarize_lineage_history(pd.read_csv(os.path.join(base_folder, 'lineage_history', 'lineage_history.csv')))
+
+# lineage_summary rows from lineage_history rows: lineages in the order they first appear in each generation,
+# average traits over whichever trait columns the history has (older runs had other traits)
+def summarize_lineage_history(history):
+    iteration = ['iteration'] if 'iteration' in history else []
+    traits = [column for column in history.columns if column.startswith('trait_')]
+    groups = history.groupby(iteration + ['generation', 'lineage'], sort=False)
+    summary = groups.size().rename('count').to_frame()
+    summary['avg_fitness'] = groups['fitness'].mean()
+    summary['max_fitness'] = groups['fitness'].max()
+    for trait in traits:
+        summary[f'avg_{trait}'] = groups[trait].mean()
+    summary = summary.reset_index()
+    return summary[['lineage', 'generation', 'count', 'avg_fitness', 'max_fitness'] + [f'avg_{trait}' for trait in traits] + iteration]
@@ -1,22 +1,50 @@
-from Genetic_Algo.GA_init import initiate_player, run_sim
-from Genetic_Algo.selection import tournament_selection
-from Genetic_Algo.crossover import crossover
-from Genetic_Algo.mutation import mutate
-from Poker.player import Action
+from Genetic_Algo.GA_init import run_sim
+from Genetic_Algo.population import Population, TRAITS, ACTIONS, evolve
+from Genetic_Algo.behavior import BehaviorFitnessCache, behavior_classes
+from Genetic_Algo.matchup import MatchupMatrix
+from Genetic_Algo.racing import run_sim_racing
+from Genetic_Algo.surrogate import SurrogateModel, screen_offspring, surrogate_accuracy
+from Genetic_Algo.genealogy import GenealogyStream, save_genealogy
+from Genetic_Algo.gauntlet import Gauntlet, gauntlet_stats, load_hall_of_fame
+from Genetic_Algo.online_stats import RunningStats, STAT_COLUMNS, player_stat_values, population_stat_values
+from Sweep.executor import run_sweep
+from Sweep.stream import CsvStream, JsonLinesStream, ReservoirSample, TopKSample, read_json_lines, concat_csv
+from Sweep.job_queue import JobQueue, run_worker, MERGE
+from Sweep.file_lock import file_lock
+from Poker.player import Action, PlayerPool
+from Poker import hot_path
 
-import uuid
 import random
 import numpy as np
 import pandas as pd
 import os
+import argparse
+import gzip
+import hashlib
 import json
+import pickle
+import shutil
+import socket
 import sys
+import time
+from functools import partial
 from itertools import product
+from math import ceil
 from tqdm import trange, tqdm
 
 # Configuration
 ITERATIONS = 1
 GENERATIONS = 50
+# None draws a fresh seed for every run
+SEED = None
+# With a SEED, generation 0 is shared by every combination with the same population size, table size and round cutoff
+SHARED_PREFIX = True
+PREFIX_CACHE_FOLDER = "output/prefix_cache"
+# Every this many generations a run saves everything it needs to carry on (population, RNG states, how far its
+# streamed results go) next to them, with --resume interrupted runs continue from their last checkpoint
+CHECKPOINT_INTERVAL = 10
+# Bumped whenever what's pickled in checkpoints and prefix caches changes, older ones are ignored
+STATE_VERSION = 3
 
 POPULATION_SIZES = [25, 50, 75]
 CROSSOVER_PROBABILITIES = [0.2, 0.5, 0.8]
@@ -25,6 +53,80 @@ MAX_PLAYERS_PER_GAMES = [6, 8]
 TOURNAMENT_KS = [5, 10, 20, 30, 40, 50]
 ROUND_CUTOFFS = [3000]
 
+# "csv" writes lineage_history.csv / population_stats.csv into each combination folder, "parquet" (needs pyarrow)
+# writes them to the datasets in output/parquet, partitioned by combination and iteration (see Sweep/columnar.py)
+OUTPUT_FORMAT = "csv"
+# Every run writes lineage_summary (one row per lineage per generation: its size, mean and max fitness and mean
+# traits). The per-individual rows of lineage_history are kept: "all", "reservoir" (a uniform sample of
+# LINEAGE_SAMPLE_SIZE rows of the run) or "top_k" (the LINEAGE_SAMPLE_SIZE fittest rows of the run)
+LINEAGE_ROWS = "all"
+LINEAGE_SAMPLE_SIZE = 5000
+
+# "grid" runs every combination for GENERATIONS, "halving" prunes them with successive halving first
+SWEEP_MODE = "grid"
+# Parallel sweep: worker processes (None uses every CPU) and the run manifest used to resume after a crash
+WORKERS = None
+MANIFEST_PATH = "output/sweep_manifest.sqlite"
+# Multi-node sweep (--enqueue / --worker): queue file and worker lease timing in seconds
+QUEUE_PATH = "output/job_queue.sqlite"
+LEASE_SECONDS = 600
+HEARTBEAT_SECONDS = 60
+# Generations of the first successive halving rung
+HALVING_MIN_GENERATIONS = 5
+# Each rung keeps 1 / HALVING_ETA of the combinations and runs them HALVING_ETA times longer
+HALVING_ETA = 3
+
+# Pool fitness samples of genomes with the same behavior class and select on the pooled estimate
+BEHAVIOR_CACHE = False
+# How much of the pooled statistics carries over to the next generation
+BEHAVIOR_CACHE_DECAY = 0.9
+
+# "simulate" plays every table, "matchup" scores tables from a precomputed matrix (python -m Genetic_Algo.matchup)
+FITNESS_MODE = "simulate"
+MATCHUP_MATRIX_PATH = "output/matchup_matrix.npz"
+# In matchup mode every this many generations are still fully simulated to check the estimate
+MATCHUP_VALIDATION_INTERVAL = 10
+
+# Duplicate poker: every table replays its deals once per seat rotation and results are averaged
+# (not with RACING, racing plays its own seeded tables)
+DUPLICATE_DEALS = False
+
+# Baseline bots seated at every simulated table next to the evolved players, {strategy name: seats per table}
+# (Poker.player.STRATEGIES: "always_call", "tight_aggressive", "random", "equity_threshold"), e.g. {"always_call": 1}.
+# Matchup mode plays without them (its estimates can't seat them, nor do the generations simulated to check them),
+# racing doesn't support them.
+OPPONENTS = {}
+
+# Racing: after two tables each, only players too close to the tournament selection boundary to call
+# get extra tables, until RACING_HAND_BUDGET hands have been played this generation
+RACING = False
+RACING_HAND_BUDGET = 20000
+
+# Fixed benchmark (Genetic_Algo/gauntlet.py): every generation is also scored heads up against the same lineup,
+# the genomes in GAUNTLET_HALL_OF_FAME (python -m Genetic_Algo.gauntlet) and the GAUNTLET_BOTS strategies, on
+# seeded deals, which gives population_stats a fitness that compares across generations and combinations.
+# Scores are cached by behavior class in GAUNTLET_CACHE_FOLDER, so each class is only ever played once.
+GAUNTLET = False
+GAUNTLET_HALL_OF_FAME = "output/hall_of_fame.npy"
+GAUNTLET_BOTS = ("always_call", "tight_aggressive", "random")
+# Hands against each opponent
+GAUNTLET_HANDS = 100
+GAUNTLET_SEED = 0
+GAUNTLET_CACHE_FOLDER = "output/gauntlet_cache"
+
+# Count and time the game's hot path (dealing, hand evaluation, decisions, betting rounds per street, pots, chip
+# transfers, see Poker/hot_path.py) and add the totals of every generation's tables to population_stats (hot_path_*)
+# A generation 0 shared through SHARED_PREFIX isn't played by the run, its hot_path_* columns are nan
+HOT_PATH_PROFILE = False
+
+# Breed SURROGATE_OVERSAMPLE times the population and only seat the children a regression on past generations likes
+SURROGATE = False
+SURROGATE_OVERSAMPLE = 3
+# Share of the seats handed to randomly picked (unscreened) candidates
+SURROGATE_EXPLORATION = 0.2
+# Generations of history the surrogate is trained on
+SURROGATE_WINDOW = 5
+
 def get_unique_folder(base):
     i = 1
     folder = base
@@ -34,186 +136,657 @@ def get_unique_folder(base):
     os.makedirs(folder)
     return folder
 
-def flatten_population_stats(pop_stats):
-    flat = []
-    for gen, stats in pop_stats.items():
+# Action columns of population_stats and the Action each one averages
+STAT_ACTIONS = {
+    "bluff_attempts": Action.BLUFF,
+    "fold": Action.FOLD,
+    "raise": Action.RAISE,
+    "call": Action.CALL,
+    "all_in": Action.ALL_IN,
+    "check": Action.CHECK
+}
+
+# Quantiles of every statistic in population_stats (p10_..., p50_..., p90_...)
+STAT_QUANTILES = (0.1, 0.5, 0.9)
+
+# Row of population_stats for one generation from the RunningStats of its players, extra columns are added by
+# the caller. The means keep their names (fitness, avg_rounds_lasted, avg_trait_*, avg_action_*), then come the
+# std_, min_, max_ and quantile columns of each, named after the mean without "avg_" (std_fitness, p50_trait_...)
+def population_stats_row(generation, stats: RunningStats):
+    names = ["fitness", "rounds_lasted"] + [f"trait_{trait}" for trait in TRAITS]
+    columns = [STAT_COLUMNS.index(name) for name in names]
+    for name, action in STAT_ACTIONS.items():
+        names.append(f"action_{name}")
+        columns.append(STAT_COLUMNS.index(f"action_{action.name.lower()}"))
+
+    row = {"generation": generation}
+    for name, column in zip(names, columns):
+        row["fitness" if name == "fitness" else f"avg_{name}"] = stats.mean[column]
+    summaries = [("std", stats.std()), ("min", stats.min), ("max", stats.max)]
+    summaries += [(f"p{round(q * 100)}", stats.quantile(q)) for q in STAT_QUANTILES]
+    for name, column in zip(names, columns):
+        for prefix, values in summaries:
+            row[f"{prefix}_{name}"] = values[column]
+    return row
+
+LINEAGE_COLUMNS = (["lineage", "generation", "id", "fitness", "lineage_fitness", "lineage_avg_fitness", "rounds_lasted", "table_position"]
+                   + [f"trait_{trait}" for trait in TRAITS] + [f"action_{action.name.lower()}" for action in ACTIONS] + ["iteration"])
+
+# Rows of lineage_history for one generation, one per individual
+# lineage_avg_fitness is the average lineage fitness of the lineage's members listed before it in the generation
+def lineage_rows(generation, population: Population, iteration):
+    lineage_fitness = {}
+    rows = []
+    for i in range(len(population)):
+        lineage = population.lineage[i]
+        fitness_values = lineage_fitness.setdefault(lineage, [])
+        row = {
+            "lineage": lineage,
+            "generation": f"generation_{generation}",
+            "id": population.names[i],
+            "fitness": float(population.fitness[i]),
+            "lineage_fitness": float(population.lineage_fitness[i]),
+            "lineage_avg_fitness": float(np.average(fitness_values)) if fitness_values else 0,
+            "rounds_lasted": int(population.rounds_survived[i]),
+            "table_position": int(population.positions[i]) if population.positions[i] >= 0 else None,
+        }
+        for trait, value in zip(TRAITS, population.traits[i].tolist()):
+            row[f"trait_{trait}"] = value
+        for action, value in zip(ACTIONS, population.actions[i].tolist()):
+            row[f"action_{action.name.lower()}"] = value
+        row["iteration"] = iteration
+        fitness_values.append(row["lineage_fitness"])
+        rows.append(row)
+    return rows
+
+LINEAGE_SUMMARY_COLUMNS = (["lineage", "generation", "count", "avg_fitness", "max_fitness"]
+                           + [f"avg_trait_{trait}" for trait in TRAITS] + ["iteration"])
+
+# Rows of lineage_summary for one generation, one per lineage in the order they first appear in the population
+def lineage_summary_rows(generation, population: Population, iteration):
+    lineages, first, inverse, counts = np.unique(population.lineage, return_index=True, return_inverse=True, return_counts=True)
+    max_fitness = np.full(len(lineages), -np.inf)
+    np.maximum.at(max_fitness, inverse, population.fitness)
+    avg_fitness = np.bincount(inverse, population.fitness, len(lineages)) / counts
+    avg_traits = np.stack([np.bincount(inverse, population.traits[:, i], len(lineages)) for i in range(len(TRAITS))], axis=1) / counts[:, None]
+    rows = []
+    for j in np.argsort(first, kind="stable"):
         row = {
-            "generation": gen,
-            "fitness": stats["fitness"],
-            "avg_rounds_lasted": stats["avg_rounds_lasted"],
+            "lineage": lineages[j],
+            "generation": f"generation_{generation}",
+            "count": int(counts[j]),
+            "avg_fitness": float(avg_fitness[j]),
+            "max_fitness": float(max_fitness[j])
         }
-        for trait, value in stats["avg_traits"].items():
+        for trait, value in zip(TRAITS, avg_traits[j].tolist()):
             row[f"avg_trait_{trait}"] = value
-        for action, value in stats["avg_actions"].items():
-            row[f"avg_action_{action}"] = value
-        flat.append(row)
-    return flat
-
-def flatten_lineage_history(lineage_hist):
-    flat = []
-    for lineage, gens in lineage_hist.items():
-        for gen, entries in gens.items():
-            for entry in entries:
-                row = {
-                    "lineage": lineage,
-                    "generation": gen,
-                    "id": entry["id"],
-                    "fitness": entry["fitness"],
-                    "lineage_fitness": entry["lineage_fitness"],
-                    "lineage_avg_fitness": entry["lineage_avg_fitness"],
-                    "rounds_lasted": entry["rounds_lasted"],
-                    "table_position": entry["table_position"],
-                }
-                for trait, value in entry["traits"].items():
-                    row[f"trait_{trait}"] = value
-                for action, value in entry["actions_made"].items():
-                    action_str = action.name if hasattr(action, "name") else str(action)
-                    row[f"action_{action_str.lower()}"] = value
-                flat.append(row)
-    return flat
-
-def evolve_population(population, tournament_k, crossover_probability, mutation_probability):
-    new_population = []
-    while len(new_population) < len(population):
-        parent1 = tournament_selection(tournament_k, population)
-        parent2 = tournament_selection(tournament_k, population)
-        if random.random() < crossover_probability:
-            child = crossover(parent1, parent2)
-        else:
-            child = random.choice([parent1, parent2]).copy()
-
-            # Have to reset the childs poker game information
-            child.chips = child.initial_chips.copy()
-            child.name = str(uuid.uuid4())[:8]
-            child.reset()
-            child.raised = False
-            child.rounds_survived = 0
-            child.actions_called = {action: 0 for action in Action}
-            child.position = None
-
-        if parent1.fitness >= parent2.fitness:
-            child.lineage = parent1.lineage
+        row["iteration"] = iteration
+        rows.append(row)
+    return rows
+
+# Where a run's lineage_history rows go: straight to the stream, or to a sample that is written at the end
+def lineage_sample(seed):
+    if LINEAGE_ROWS == "reservoir":
+        # Seeded apart from the run's RNGs, sampling doesn't change the run
+        return ReservoirSample(LINEAGE_SAMPLE_SIZE, None if seed is None else f"lineage_sample_{seed}")
+    if LINEAGE_ROWS == "top_k":
+        return TopKSample(LINEAGE_SAMPLE_SIZE, "fitness")
+    return None
+
+# Plays (or estimates) one generation and reads the results back into the population
+# accumulator (a RunningStats over STAT_COLUMNS) gets the players as their tables finish
+# pool: a PlayerPool the players are taken from and given back to once their results are read
+# Returns extra per-generation columns for population_stats
+def evaluate_population(population: Population, generation, max_players_per_game, round_cutoff, tournament_k, matchup=None,
+                        accumulator=None, pool=None):
+    extra = {}
+    players = population.to_players(pool)
+    if matchup is not None and generation % MATCHUP_VALIDATION_INTERVAL != 0:
+        run_sim(players, max_players_per_game, round_cutoff, matchup, accumulator=accumulator)
+    else:
+        if matchup is not None:
+            estimate_players = population.to_players(pool)
+            run_sim(estimate_players, max_players_per_game, round_cutoff, matchup)
+            estimated_fitness = np.array([p.fitness for p in estimate_players])
+            if pool is not None:
+                pool.release(estimate_players)
+        if RACING:
+            run_sim_racing(players, max_players_per_game, round_cutoff, tournament_k, RACING_HAND_BUDGET, stats=extra)
+            # Racing averages players over several tables, they're only done once it's over
+            if accumulator is not None:
+                accumulator.add(player_stat_values(players))
         else:
-            child.lineage = parent2.lineage
-        if random.random() < mutation_probability:
-            child = mutate(child)
-            child.lineage = str(uuid.uuid4())[:12]
-        new_population.append(child)
-    return new_population
-
-def set_population_stats(pop_arr, generation, population):
-    pop_arr[generation] = {
-        "fitness": np.average([p.fitness for p in population]),
-        "avg_rounds_lasted": np.average([p.rounds_survived for p in population]),
-        "avg_traits": {
-            "aggressiveness": np.average([p.traits["aggressiveness"] for p in population]),
-            "risk_tolerance": np.average([p.traits["risk_tolerance"] for p in population]),
-            "bluff_tendency": np.average([p.traits["bluff_tendency"] for p in population]),
-            "adaptability": np.average([p.traits["adaptability"] for p in population]),
-            "position_awareness": np.average([p.traits["position_awareness"] for p in population]),
-            "chip_size_awareness": np.average([p.traits["chip_size_awareness"] for p in population])
-        },
-        "avg_actions":{
-            "bluff_attempts": np.average([p.actions_called[Action.BLUFF] for p in population]),
-            "fold": np.average([p.actions_called[Action.FOLD] for p in population]),
-            "raise": np.average([p.actions_called[Action.RAISE] for p in population]),
-            "call": np.average([p.actions_called[Action.CALL] for p in population]),
-            "all_in": np.average([p.actions_called[Action.ALL_IN] for p in population]),
-            "check": np.average([p.actions_called[Action.CHECK] for p in population])
-        }
+            # Validation generations play the same game the estimates score: without bots
+            run_sim(players, max_players_per_game, round_cutoff, duplicate=DUPLICATE_DEALS, stats=extra, accumulator=accumulator,
+                    opponents=OPPONENTS if matchup is None else None)
+        if matchup is not None:
+            simulated_fitness = np.array([p.fitness for p in players])
+            extra["matchup_validation_corr"] = np.corrcoef(estimated_fitness, simulated_fitness)[0, 1]
+            extra["matchup_validation_mae"] = np.abs(estimated_fitness - simulated_fitness).mean()
+    population.collect(players)
+    if pool is not None:
+        pool.release(players)
+    return extra
+
+# Generation 0 (the initial population and its evaluation) only depends on the seed, population size, table size,
+# round cutoff and evaluation settings, not on crossover, mutation or tournament k, so it is computed once,
+# cached in PREFIX_CACHE_FOLDER and every combination forks from it, RNG state included.
+# Returns the initial population, the evaluated population and generation 0's extra stats
+def shared_generation_zero(seed, population_size, max_players_per_game, round_cutoff, tournament_k, matchup, rng):
+    settings = {
+        "version": STATE_VERSION,
+        "seed": seed,
+        "population_size": population_size,
+        "max_players_per_game": max_players_per_game,
+        "round_cutoff": round_cutoff,
+        "fitness_mode": FITNESS_MODE,
+        "matchup_matrix": MATCHUP_MATRIX_PATH if matchup is not None else None,
+        "duplicate_deals": DUPLICATE_DEALS,
+        "opponents": OPPONENTS,
+        # racing spends its budget based on the tournament size
+        "racing": [tournament_k, RACING_HAND_BUDGET] if RACING else None
     }
+    key = hashlib.sha1(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:16]
+    os.makedirs(PREFIX_CACHE_FOLDER, exist_ok=True)
+    path = os.path.join(PREFIX_CACHE_FOLDER, f"generation_zero_{key}.pkl")
 
-def set_individual_history(individual_hist, generation, population):
-    for p in population:
-        if p.lineage not in individual_hist:
-            individual_hist[p.lineage] = {}
-        if f"generation_{generation}" not in individual_hist[p.lineage]:
-            individual_hist[p.lineage][f"generation_{generation}"] = []
-        fitness_values = [entry["lineage_fitness"] for entry in individual_hist[p.lineage][f"generation_{generation}"]]
-        lineage_avg_fitness = np.average(fitness_values) if fitness_values or len(fitness_values) > 0 else 0
-        individual_hist[p.lineage][f"generation_{generation}"].append({
-            "id": p.name,
-            "fitness": p.fitness,
-            "lineage_fitness": p.lineage_fitness,
-            "lineage_avg_fitness": lineage_avg_fitness,
-            "rounds_lasted": p.rounds_survived,
-            "table_position": p.position,
-            "traits": p.traits.copy(),
-            "actions_made": p.actions_called.copy()
-        })
-
-def run_combination(iteration, population_size, generations, crossover_probability, mutation_probability, max_players_per_game, tournament_k, round_cutoff):
-    population = initiate_player(population_size)
-    population_stats = {}
-    lineage_history = {}
-    set_individual_history(lineage_history, -1, population)
-
-    for generation in trange(generations, desc="Generations", unit="gen"):
-        evaluated_population = run_sim(population, max_players_per_game, round_cutoff)
-        set_population_stats(population_stats, generation, population)
-        set_individual_history(lineage_history, generation, population)
-        population = evolve_population(evaluated_population, tournament_k, crossover_probability, mutation_probability)
-    tqdm.write("Evolution complete.")
+    # Sweep workers that need the same prefix wait for whoever computes it first
+    with file_lock(path + ".lock"):
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                prefix = pickle.load(f)
+            rng.bit_generator.state = prefix["numpy_state"]
+            random.setstate(prefix["random_state"])
+            return prefix["initial"], prefix["evaluated"], prefix["extra"]
 
-    # Flatten and save
-    generation_avg = pd.DataFrame(flatten_population_stats(population_stats))
-    lineage_data = pd.DataFrame(flatten_lineage_history(lineage_history))
+        initial = Population.random(population_size, rng)
+        evaluated = initial.subset(np.arange(len(initial)))
+        extra = evaluate_population(evaluated, 0, max_players_per_game, round_cutoff, tournament_k, matchup)
+        prefix = {
+            "settings": settings,
+            "initial": initial,
+            "evaluated": evaluated,
+            "extra": extra,
+            "numpy_state": rng.bit_generator.state,
+            "random_state": random.getstate()
+        }
+        with open(path + ".tmp", "wb") as f:
+            pickle.dump(prefix, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + ".tmp", path)
+    return initial, evaluated, extra
 
-    # append iteration to all entries in both dataframes
-    generation_avg["iteration"] = iteration
-    lineage_data["iteration"] = iteration
+# Pickled and gzipped, written to a temp file and renamed so a crash mid-write keeps the previous checkpoint
+def save_checkpoint(path, state):
+    start = time.perf_counter()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with gzip.open(tmp_path, "wb", compresslevel=1) as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    tqdm.write(f"Checkpoint before generation {state['generation']}: {os.path.getsize(path) / 1024:.1f} KiB "
+               f"written in {time.perf_counter() - start:.3f}s")
 
-    return generation_avg, lineage_data
+# Returns the checkpoint at path, or None if there isn't one, it was saved by a run with other parameters
+# or the streamed results it continues are gone
+def load_checkpoint(path, run):
+    if not os.path.exists(path):
+        return None
+    with gzip.open(path, "rb") as f:
+        state = pickle.load(f)
+    if state.get("version") != STATE_VERSION:
+        tqdm.write(f"Ignoring checkpoint {path}, it was saved by an older version")
+        return None
+    if state["run"] != run:
+        tqdm.write(f"Ignoring checkpoint {path}, it was saved by a different run")
+        return None
+    if any(not os.path.exists(stream) or os.path.getsize(stream) < offset for stream, offset in state["offsets"].items()):
+        tqdm.write(f"Ignoring checkpoint {path}, the results it continues are missing")
+        return None
+    return state
 
-def main():
-    # combinations of parameters
-    for population_size, crossover_probability, mutation_probability, max_players_per_game, tournament_k, round_cutoff in product(
-        POPULATION_SIZES, CROSSOVER_PROBABILITIES, MUTATION_PROBABILITIES, MAX_PLAYERS_PER_GAMES, TOURNAMENT_KS, ROUND_CUTOFFS):
+def run_files(folder):
+    return (os.path.join(folder, "lineage_history.csv"), os.path.join(folder, "lineage_summary.csv"),
+            os.path.join(folder, "genealogy.npy"), os.path.join(folder, "population_stats.csv"))
+
+# Where an attempt with this suffix streams its results and keeps its checkpoint while it runs
+def partial_files(folder, suffix):
+    lineage_file, summary_file, genealogy_file, stats_file = run_files(folder)
+    streams = (f"{lineage_file}{suffix}.partial", f"{summary_file}{suffix}.partial", f"{genealogy_file}{suffix}.partial",
+               f"{stats_file}{suffix}.jsonl.partial")
+    return streams, os.path.join(folder, f"checkpoint{suffix}.pkl.gz")
+
+# A queue job reclaimed under a new lease gets a new suffix, so it doesn't find its own checkpoint. It copies the newest
+# usable checkpoint of an earlier attempt in folder, and the results it continues, to its own names instead of
+# writing to them, as the earlier holder may still be running.
+def adopt_previous_checkpoint(folder, suffix, run):
+    streams, checkpoint_path = partial_files(folder, suffix)
+    if os.path.exists(checkpoint_path) or not os.path.isdir(folder):
+        return
+    candidates = []
+    for name in os.listdir(folder):
+        path = os.path.join(folder, name)
+        if name.startswith("checkpoint") and name.endswith(".pkl.gz") and path != checkpoint_path:
+            try:
+                candidates.append((os.path.getmtime(path), name[len("checkpoint"):-len(".pkl.gz")]))
+            except FileNotFoundError:
+                continue
+    for _, previous_suffix in sorted(candidates, reverse=True):
+        previous_streams, previous_checkpoint = partial_files(folder, previous_suffix)
+        try:
+            state = load_checkpoint(previous_checkpoint, run)
+            if state is None:
+                continue
+            offsets = {}
+            for previous, stream in zip(previous_streams, streams):
+                if previous in state["offsets"]:
+                    # Only what the checkpoint covers matters, anything written since is cut off on resume
+                    shutil.copyfile(previous, stream)
+                    offsets[stream] = state["offsets"][previous]
+        except (FileNotFoundError, EOFError):
+            # The earlier holder finished (or cleaned up) meanwhile
+            continue
+        state["offsets"] = offsets
+        save_checkpoint(checkpoint_path, state)
+        tqdm.write(f"Continuing the checkpoint of attempt {previous_suffix or 'without suffix'} in {folder}")
+        return
+
+# Runs one iteration and streams its results into folder as it goes: every generation's lineage rows are appended
+# to lineage_history.csv (or kept in a sample, see LINEAGE_ROWS), its lineage summaries to lineage_summary.csv and
+# its genealogy records (see Genetic_Algo/genealogy.py) to genealogy.npy and its population_stats row to a JSON lines
+# file (the extra columns vary by generation), which becomes population_stats.csv at the end. All are written under
+# .partial names and renamed to their final names plus suffix once the run is complete, population_stats last.
+# folder also gets a checkpoint every CHECKPOINT_INTERVAL generations, which resume=True continues from.
+# The .partial files and the checkpoint carry the suffix too, so two holders of a queue job never write the same file,
+# a reclaimed job resumes from a copy of the previous attempt's (see adopt_previous_checkpoint).
+# Returns the final (lineage_history, lineage_summary, genealogy, population_stats) paths, without the suffix
+def run_combination(iteration, population_size, generations, crossover_probability, mutation_probability, max_players_per_game,
+                    tournament_k, round_cutoff, seed=None, folder="output/run", suffix="", resume=False):
+    if RACING and OPPONENTS:
+        raise ValueError("OPPONENTS can't be combined with RACING, racing doesn't seat baseline bots")
+    if RACING and DUPLICATE_DEALS:
+        raise ValueError("DUPLICATE_DEALS can't be combined with RACING, racing doesn't replay deals")
+    rng = np.random.default_rng(seed)
+    # The poker engine deals with the random module, seed it from rng so one seed reproduces the whole run
+    # (this also keeps forked sweep workers from all dealing the same cards)
+    random.seed(int(rng.integers(2 ** 63)))
+    matchup = MatchupMatrix.load(MATCHUP_MATRIX_PATH) if FITNESS_MODE == "matchup" else None
+    lineage_file, summary_file, genealogy_file, stats_file = run_files(folder)
+    streams, checkpoint_path = partial_files(folder, suffix)
+    run = (iteration, population_size, crossover_probability, mutation_probability, max_players_per_game, tournament_k,
+           round_cutoff, seed)
+    if resume:
+        adopt_previous_checkpoint(folder, suffix, run)
+    checkpoint = load_checkpoint(checkpoint_path, run) if resume else None
+    generation_zero = None
+    if checkpoint is not None:
+        first_generation = checkpoint["generation"]
+        population = checkpoint["population"]
+        behavior_cache = checkpoint["behavior_cache"]
+        surrogate = checkpoint["surrogate"]
+        predicted = checkpoint["predicted"]
+        rng.bit_generator.state = checkpoint["numpy_state"]
+        random.setstate(checkpoint["random_state"])
+        sample = checkpoint["lineage_sample"]
+        lineage_stream = sample if sample is not None else CsvStream(streams[0], LINEAGE_COLUMNS, checkpoint["offsets"][streams[0]])
+        summary_stream = CsvStream(streams[1], LINEAGE_SUMMARY_COLUMNS, checkpoint["offsets"][streams[1]])
+        genealogy_stream = GenealogyStream(streams[2], checkpoint["offsets"][streams[2]])
+        stats_stream = JsonLinesStream(streams[3], checkpoint["offsets"][streams[3]])
+        tqdm.write(f"Resuming iteration {iteration} from generation {first_generation}")
+    else:
+        first_generation = 0
+        behavior_cache = BehaviorFitnessCache() if BEHAVIOR_CACHE else None
+        surrogate = SurrogateModel(SURROGATE_WINDOW) if SURROGATE else None
+        predicted = None
+        if SHARED_PREFIX and seed is not None:
+            population, *generation_zero = shared_generation_zero(seed, population_size, max_players_per_game, round_cutoff,
+                                                                  tournament_k, matchup, rng)
+        else:
+            population = Population.random(population_size, rng)
+        sample = lineage_sample(seed)
+        lineage_stream = sample if sample is not None else CsvStream(streams[0], LINEAGE_COLUMNS)
+        summary_stream = CsvStream(streams[1], LINEAGE_SUMMARY_COLUMNS)
+        genealogy_stream = GenealogyStream(streams[2])
+        stats_stream = JsonLinesStream(streams[3])
+        lineage_stream.write(lineage_rows(-1, population, iteration))
+        summary_stream.write(lineage_summary_rows(-1, population, iteration))
+
+    # Players only exist while the population is seated at the tables, the same Player objects are reused every generation
+    pool = PlayerPool()
+    # The instrumentation comes off again even when the run fails, so the next job in this process starts clean
+    profile = hot_path.enable() if HOT_PATH_PROFILE else None
+    try:
+        gauntlet = (Gauntlet(load_hall_of_fame(GAUNTLET_HALL_OF_FAME), GAUNTLET_BOTS, GAUNTLET_HANDS, GAUNTLET_SEED, GAUNTLET_CACHE_FOLDER)
+                    if GAUNTLET else None)
+        for generation in trange(first_generation, generations, desc="Generations", unit="gen"):
+            accumulator = RunningStats(STAT_COLUMNS)
+            if generation == 0 and generation_zero is not None:
+                population, extra = generation_zero
+                # Played when the prefix was cached
+                accumulator.add(population_stat_values(population))
+            else:
+                extra = evaluate_population(population, generation, max_players_per_game, round_cutoff, tournament_k, matchup,
+                                            accumulator, pool)
+            stats = population_stats_row(generation, accumulator)
+            stats.update(extra)
+            if profile is not None:
+                hot_path_stats = profile.generation_stats()
+                # A shared generation 0 was played (or cached) before profiling started, it has nothing to report
+                if generation == 0 and generation_zero is not None:
+                    hot_path_stats = dict.fromkeys(hot_path_stats, np.nan)
+                stats.update(hot_path_stats)
+            if predicted is not None:
+                stats.update(surrogate_accuracy(predicted, population.fitness))
+            if gauntlet is not None:
+                stats.update(gauntlet_stats(gauntlet, population))
+            lineage_stream.write(lineage_rows(generation, population, iteration))
+            summary_stream.write(lineage_summary_rows(generation, population, iteration))
+            genealogy_stream.write(generation, population)
+
+            selection_fitness = None
+            if behavior_cache is not None:
+                classes = behavior_classes(population.traits)
+                behavior_cache.decay(BEHAVIOR_CACHE_DECAY)
+                behavior_cache.update(classes, population.fitness)
+                selection_fitness = behavior_cache.estimate(classes, population.fitness)
+                stats["behavior_classes"] = len(np.unique(classes))
+            stats_stream.write([stats])
+
+            if surrogate is not None:
+                surrogate.add(population.traits, population.fitness)
+                surrogate.fit()
+                candidates = evolve(population, tournament_k, crossover_probability, mutation_probability, rng, selection_fitness,
+                                    num_children=len(population) * SURROGATE_OVERSAMPLE)
+                population, predicted = screen_offspring(candidates, surrogate, len(population), SURROGATE_EXPLORATION, rng)
+            else:
+                population = evolve(population, tournament_k, crossover_probability, mutation_probability, rng, selection_fitness)
+
+            if (generation + 1) % CHECKPOINT_INTERVAL == 0 and generation + 1 < generations:
+                save_checkpoint(checkpoint_path, {
+                    "version": STATE_VERSION,
+                    "run": run,
+                    "generation": generation + 1,
+                    "population": population,
+                    "offsets": {stream.path: stream.sync() for stream in (lineage_stream, summary_stream, genealogy_stream, stats_stream)
+                                if stream is not sample},
+                    "lineage_sample": sample,
+                    "behavior_cache": behavior_cache,
+                    "surrogate": surrogate,
+                    "predicted": predicted,
+                    "numpy_state": rng.bit_generator.state,
+                    "random_state": random.getstate()
+                })
+        if sample is not None:
+            lineage_stream = CsvStream(streams[0], LINEAGE_COLUMNS)
+            lineage_stream.write(sample.rows())
+        lineage_stream.close()
+        summary_stream.close()
+        genealogy_stream.close()
+        stats_stream.close()
+    finally:
+        if profile is not None:
+            hot_path.disable()
+    tqdm.write("Evolution complete.")
+
+    save_genealogy(streams[2], f"{genealogy_file}{suffix}.partial.npy")
+    generation_avg = pd.DataFrame(read_json_lines(streams[3]))
+    generation_avg["iteration"] = iteration
+    generation_avg.to_csv(f"{stats_file}{suffix}.partial", index=False)
+    # Without the checkpoint a crash from here on reruns the iteration rather than resuming past its end
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    os.replace(streams[0], lineage_file + suffix)
+    os.replace(streams[1], summary_file + suffix)
+    os.replace(f"{genealogy_file}{suffix}.partial.npy", genealogy_file + suffix)
+    os.replace(f"{stats_file}{suffix}.partial", stats_file + suffix)
+    os.remove(streams[2])
+    os.remove(streams[3])
+    return lineage_file, summary_file, genealogy_file, stats_file
+
+# Every parameter combination of the sweep as
+# (population_size, crossover_probability, mutation_probability, max_players_per_game, tournament_k, round_cutoff)
+def parameter_grid():
+    for params in product(POPULATION_SIZES, CROSSOVER_PROBABILITIES, MUTATION_PROBABILITIES, MAX_PLAYERS_PER_GAMES, TOURNAMENT_KS, ROUND_CUTOFFS):
+        population_size, tournament_k = params[0], params[4]
         # Skip if tournament_k is greater than population_size
         if tournament_k > population_size:
             print(f"Skipping {population_size=}, {tournament_k=}: tournament_k > population_size")
             continue
-        combination = f"{population_size}_{crossover_probability}_{mutation_probability}_{max_players_per_game}_{tournament_k}_{round_cutoff}"
+        yield params
+
+def combination_name(params):
+    return "_".join(str(value) for value in params)
+
+# Seed of one iteration, iterations share it across combinations so they start from the same population
+def run_seed(iteration):
+    return None if SEED is None else [SEED, iteration]
+
+# Runs every iteration of one combination for the given number of generations in folder
+# Returns the population_stats of all iterations, the folder is removed afterwards
+def run_iterations(params, generations, folder, resume=False):
+    population_size, crossover_probability, mutation_probability, max_players_per_game, tournament_k, round_cutoff = params
+    gen_aggegated = []
+
+    for iteration in trange(ITERATIONS, desc="Iterations", unit="iter"):
+        *_, stats_file = run_combination(iteration, population_size, generations, crossover_probability, mutation_probability,
+                                        max_players_per_game, tournament_k, round_cutoff, run_seed(iteration),
+                                        os.path.join(folder, f"iteration_{iteration}"), resume=resume)
+        gen_aggegated.append(pd.read_csv(stats_file))
+    shutil.rmtree(folder)
+
+    # Concatenate all dataframes
+    return pd.concat(gen_aggegated, ignore_index=True)
+
+def write_config(base_folder, params):
+    population_size, crossover_probability, mutation_probability, max_players_per_game, tournament_k, round_cutoff = params
+    config = {
+        "POPULATION_SIZE": population_size,
+        "GENERATIONS": GENERATIONS,
+        "CROSSOVER_PROBABILITY": crossover_probability,
+        "MUTATION_PROBABILITY": mutation_probability,
+        "MAX_PLAYERS_PER_GAME": max_players_per_game,
+        "TOURNAMENT_K": tournament_k,
+        "ROUND_CUTOFF": round_cutoff,
+        "ITERATIONS": ITERATIONS
+    }
+    with open(os.path.join(base_folder, "config.json"), "w") as f:
+        json.dump(config, f, indent=4)
+
+def iteration_folder(base_folder, iteration):
+    return os.path.join(base_folder, "iterations", f"iteration_{iteration}")
+
+# Runs one iteration of a combination into <combination>/iterations/, with its checkpoints
+# Returns the (lineage_history, lineage_summary, genealogy, population_stats) paths, the files themselves have suffix appended
+def run_iteration(job, iteration, generations=GENERATIONS, suffix="", resume=False):
+    params, base_folder = job
+    population_size, crossover_probability, mutation_probability, max_players_per_game, tournament_k, round_cutoff = params
+    return run_combination(iteration, population_size, generations, crossover_probability, mutation_probability,
+                           max_players_per_game, tournament_k, round_cutoff, run_seed(iteration),
+                           iteration_folder(base_folder, iteration), suffix, resume)
+
+# Sweep worker: runs one iteration of a combination, run_combination puts its results in place when it's done
+# resume comes in as an argument: under spawn or forkserver workers import main afresh, they don't see the
+# parent's command line
+def run_iteration_job(job, iteration, resume=False):
+    run_iteration(job, iteration, resume=resume)
+
+# A combination's (lineage_history, lineage_summary, genealogy, population_stats) results, population_stats (the last
+# one) marks it as complete. With the parquet backend the tables are the combination's partition folders.
+# genealogy is a folder with every iteration's genealogy_<i>.npy in both formats
+def final_files(base_folder):
+    genealogy_folder = os.path.join(base_folder, "genealogy")
+    if OUTPUT_FORMAT == "parquet":
+        root = os.path.join(os.path.dirname(base_folder), "parquet")
+        combination = os.path.basename(base_folder)[len("combination_"):]
+        lineage_file, summary_file, stats_file = (os.path.join(root, table, f"combination={combination}")
+                                                  for table in ("lineage_history", "lineage_summary", "population_stats"))
+    else:
+        lineage_file, summary_file, stats_file = (os.path.join(base_folder, table, f"{table}.csv")
+                                                  for table in ("lineage_history", "lineage_summary", "population_stats"))
+    return lineage_file, summary_file, genealogy_folder, stats_file
+
+def read_final_population_stats(base_folder):
+    if OUTPUT_FORMAT == "parquet":
+        from Sweep.columnar import read_population_stats
+        root = os.path.join(os.path.dirname(base_folder), "parquet")
+        return read_population_stats(root, os.path.basename(base_folder)[len("combination_"):])
+    return pd.read_csv(final_files(base_folder)[-1])
+
+# Writes a combination's output files (with suffix appended) from its iterations
+# lineage_history is concatenated on disk rather than loaded, it's the big one
+# Returns [(written path, final path)]
+def write_merged_iterations(base_folder, iterations, suffix):
+    folders = [iteration_folder(base_folder, iteration) for iteration in range(iterations)]
+    lineage_file, summary_file, genealogy_folder, stats_file = final_files(base_folder)
+    # Ids are only unique within a run, so genealogies stay one file per iteration
+    shutil.rmtree(genealogy_folder + suffix, ignore_errors=True)
+    os.makedirs(genealogy_folder + suffix)
+    for iteration, folder in enumerate(folders):
+        shutil.copyfile(run_files(folder)[2], os.path.join(genealogy_folder + suffix, f"genealogy_{iteration}.npy"))
+    genealogy_rename = (genealogy_folder + suffix, genealogy_folder)
+
+    if OUTPUT_FORMAT == "parquet":
+        # pyarrow is only needed for this backend
+        from Sweep.columnar import write_partitions
+        renames = []
+        for index, final_path in ((0, lineage_file), (1, summary_file), (3, stats_file)):
+            shutil.rmtree(final_path + suffix, ignore_errors=True)
+            for folder in folders:
+                write_partitions(run_files(folder)[index], final_path + suffix)
+            renames.append((final_path + suffix, final_path))
+        return renames[:2] + [genealogy_rename] + renames[2:]
+    concat_csv([run_files(folder)[0] for folder in folders], lineage_file + suffix)
+    concat_csv([run_files(folder)[1] for folder in folders], summary_file + suffix)
+    generation_avg = pd.concat([pd.read_csv(run_files(folder)[3]) for folder in folders], ignore_index=True)
+    os.makedirs(os.path.dirname(stats_file), exist_ok=True)
+    generation_avg.to_csv(stats_file + suffix, index=False)
+    return [(lineage_file + suffix, lineage_file), (summary_file + suffix, summary_file), genealogy_rename,
+            (stats_file + suffix, stats_file)]
+
+# Concatenates the iterations of a finished combination into the usual output files
+# population_stats.csv is moved in last, its existence marks the combination as complete
+def merge_iterations(job):
+    params, base_folder = job
+    if os.path.exists(final_files(base_folder)[-1]):
+        return
+    for tmp_path, final_path in write_merged_iterations(base_folder, ITERATIONS, f".tmp{os.getpid()}"):
+        # A partition folder left by a merge that died halfway
+        if os.path.isdir(final_path):
+            shutil.rmtree(final_path)
+        os.replace(tmp_path, final_path)
+    shutil.rmtree(os.path.join(base_folder, "iterations"))
+
+# Runs the combinations (all ITERATIONS each) for the full GENERATIONS on WORKERS processes
+# Progress is kept in output/sweep_manifest.sqlite, so after a crash rerunning picks up exactly the unfinished runs
+def run_grid(param_list, resume=False):
+    jobs = {}
+    for params in param_list:
+        combination = combination_name(params)
+        base_folder = f"output/combination_{combination}"
+        # Skip if the combination already has its results
+        if os.path.exists(final_files(base_folder)[-1]):
+            print(f"Skipping {combination} (already exists)")
+            continue
+        os.makedirs(base_folder, exist_ok=True)
+        write_config(base_folder, params)
+        jobs[combination] = (params, base_folder)
+    run_sweep(jobs, ITERATIONS, partial(run_iteration_job, resume=resume), merge_iterations, MANIFEST_PATH, WORKERS)
+
+# Multi-node sweep: the combinations go into a SQLite job queue on the shared filesystem and any number of
+# `python main.py --worker` processes, on any machine that sees output/, claim and run them
+def enqueue_grid(param_list):
+    queue = JobQueue(QUEUE_PATH)
+    for params in param_list:
+        combination = combination_name(params)
         base_folder = f"output/combination_{combination}"
-        # Skip if folder already exists
-        if os.path.exists(base_folder):
+        if os.path.exists(final_files(base_folder)[-1]):
             print(f"Skipping {combination} (already exists)")
             continue
-        base_folder = get_unique_folder(base_folder)
-        pop_stat_folder = os.path.join(base_folder, "population_stats")
-        lineage_folder = os.path.join(base_folder, "lineage_history")
-        os.makedirs(pop_stat_folder)
-        os.makedirs(lineage_folder)
-
-        config = {
-            "POPULATION_SIZE": population_size,
-            "GENERATIONS": GENERATIONS,
-            "CROSSOVER_PROBABILITY": crossover_probability,
-            "MUTATION_PROBABILITY": mutation_probability,
-            "MAX_PLAYERS_PER_GAME": max_players_per_game,
-            "TOURNAMENT_K": tournament_k,
-            "ROUND_CUTOFF": round_cutoff,
-            "ITERATIONS": ITERATIONS
-        }
-        with open(os.path.join(base_folder, "config.json"), "w") as f:
-            json.dump(config, f, indent=4)
+        os.makedirs(base_folder, exist_ok=True)
+        write_config(base_folder, params)
+        payload = {"params": list(params), "base_folder": base_folder, "generations": GENERATIONS, "iterations": ITERATIONS}
+        queue.enqueue(combination, ITERATIONS, payload)
+    print(f"Queue: {queue.status_counts()}")
+    queue.close()
+
+# Runs one queued job, writing its results to temp files the queue renames into place on completion
+def execute_queue_job(payload, iteration, suffix, resume=False):
+    job = (tuple(payload["params"]), payload["base_folder"])
+    if iteration == MERGE:
+        return write_merged_iterations(job[1], payload["iterations"], suffix)
+    # lineage first, population_stats (the completion marker) last
+    return [(path + suffix, path) for path in run_iteration(job, iteration, payload["generations"], suffix, resume)]
+
+def after_queue_job(payload, iteration):
+    if iteration == MERGE:
+        shutil.rmtree(os.path.join(payload["base_folder"], "iterations"), ignore_errors=True)
 
-        gen_aggegated = []
-        lineage_aggegated = []
+def run_queue_worker(resume=False):
+    worker = f"{socket.gethostname()}-{os.getpid()}"
+    run_worker(QUEUE_PATH, partial(execute_queue_job, resume=resume), worker, LEASE_SECONDS, HEARTBEAT_SECONDS, after_complete=after_queue_job)
 
-        for iteration in trange(ITERATIONS, desc="Iterations", unit="iter"):
-            generation_avg, lineage_data = run_combination(iteration, population_size, GENERATIONS, crossover_probability, mutation_probability,
-                                                           max_players_per_game, tournament_k, round_cutoff)
-            gen_aggegated.append(generation_avg)
-            lineage_aggegated.append(lineage_data)
+# Score of a (possibly partial) run used to rank combinations: mean population fitness over the
+# last 5 generations, averaged over iterations
+def trajectory_score(generation_avg, generations):
+    run = generation_avg[generation_avg["generation"] < generations]
+    return run[run["generation"] >= generations - 5]["fitness"].mean()
 
-        # Concatenate all dataframes
-        generation_avg = pd.concat(gen_aggegated, ignore_index=True)
-        lineage_data = pd.concat(lineage_aggegated, ignore_index=True)
+# Successive halving: every combination gets HALVING_MIN_GENERATIONS, the best 1 / HALVING_ETA by
+# trajectory_score move on to HALVING_ETA times as many generations, and so on until the survivors
+# get the full GENERATIONS and are saved like a normal sweep.
+# Combinations that already have an output folder are scored from it instead of being rerun.
+# Every rung's decisions go to output/successive_halving/rungs.csv
+def sweep_successive_halving(resume=False):
+    survivors = list(parameter_grid())
+    decisions = []
+    generations = HALVING_MIN_GENERATIONS
+    rung = 0
+    while generations < GENERATIONS and len(survivors) > 1:
+        scores = []
+        for params in tqdm(survivors, desc=f"Rung {rung} ({generations} gens)", unit="comb"):
+            existing = f"output/combination_{combination_name(params)}"
+            if os.path.exists(final_files(existing)[-1]):
+                generation_avg = read_final_population_stats(existing)
+            else:
+                generation_avg = run_iterations(params, generations, f"output/successive_halving/rung_{rung}/{combination_name(params)}",
+                                                resume)
+            scores.append(trajectory_score(generation_avg, generations))
 
-        # Save to CSV
-        generation_avg.to_csv(os.path.join(pop_stat_folder, "population_stats.csv"), index=False)
-        lineage_data.to_csv(os.path.join(lineage_folder, "lineage_history.csv"), index=False)
+        keep = max(1, ceil(len(survivors) / HALVING_ETA))
+        promoted = set(np.argsort(-np.array(scores), kind="stable")[:keep])
+        for i, params in enumerate(survivors):
+            decisions.append({
+                "rung": rung,
+                "generations": generations,
+                "combination": combination_name(params),
+                "score": scores[i],
+                "promoted": i in promoted
+            })
+        survivors = [params for i, params in enumerate(survivors) if i in promoted]
+        tqdm.write(f"Rung {rung}: kept {len(survivors)} combinations for {min(generations * HALVING_ETA, GENERATIONS)} generations")
+        generations *= HALVING_ETA
+        rung += 1
+
+    os.makedirs("output/successive_halving", exist_ok=True)
+    pd.DataFrame(decisions).to_csv("output/successive_halving/rungs.csv", index=False)
+    run_grid(survivors, resume)
+
+def main(resume=False):
+    if SWEEP_MODE == "halving":
+        sweep_successive_halving(resume)
+        return
+    # combinations of parameters
+    run_grid(list(parameter_grid()), resume)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--enqueue", action="store_true", help="put the parameter grid into the job queue and exit")
+    parser.add_argument("--worker", action="store_true", help="run jobs from the job queue until it is empty")
+    parser.add_argument("--resume", action="store_true", help="continue interrupted runs from their last checkpoint")
+    args = parser.parse_args()
+
+    if args.enqueue:
+        enqueue_grid(list(parameter_grid()))
+    elif args.worker:
+        run_queue_worker(args.resume)
+    else:
+        main(args.resume)
@@ -0,0 +1,30 @@
+from Genetic_Algo.genealogy import Genealogy, RECORD
+import numpy as np
+
+# generation 0: 0, 1, 2
+# generation 1: 3 = 0 x 1, 4 copied from 2, 5 = 1 x 2
+# generation 2: 6 = 3 x 4, 7 copied from 5
+def small_genealogy():
+    rows = [
+        (0, 0, -1, -1, b"a", 0.1), (0, 1, -1, -1, b"b", 0.2), (0, 2, -1, -1, b"c", 0.3),
+        (1, 3, 0, 1, b"a", 0.4), (1, 4, 2, -1, b"c", 0.2), (1, 5, 1, 2, b"b", 0.5),
+        (2, 6, 3, 4, b"a", 0.6), (2, 7, 5, -1, b"b", 0.7),
+    ]
+    return Genealogy(np.array(rows, dtype=RECORD))
+
+def test_ancestors():
+    genealogy = small_genealogy()
+    assert genealogy.ancestors(6).tolist() == [0, 1, 2, 3, 4]
+    assert genealogy.ancestors(7).tolist() == [1, 2, 5]
+    assert genealogy.ancestors([6, 7]).tolist() == [0, 1, 2, 3, 4, 5]
+    assert genealogy.ancestors(0).tolist() == []
+
+def test_best_and_lineages():
+    genealogy = small_genealogy()
+    assert genealogy.best() == 7
+    assert genealogy.best(1) == 5
+    assert genealogy.lineages_alive()["lineages"].tolist() == [3, 3, 2]
+    # a and b last 3 generations, c 2
+    survival = genealogy.lineage_survival()
+    assert survival["generations"].tolist() == [1, 2, 3]
+    assert np.allclose(survival["surviving"], [1, 1, 2 / 3])
@@ -0,0 +1,69 @@
+from Sweep.job_queue import JobQueue, MERGE
+import os
+import pytest
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(str(tmp_path / "queue.sqlite"))
+    yield queue
+    queue.close()
+
+def write(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+    return path
+
+def test_claims_iterations_before_their_merge(queue):
+    queue.enqueue("a", 2, {"x": 1})
+    first = queue.claim("w1", 60)
+    second = queue.claim("w2", 60)
+    assert sorted([first.iteration, second.iteration]) == [0, 1]
+    assert first.payload == {"x": 1}
+    # The merge waits until both iterations are done
+    assert queue.claim("w3", 60) is None
+    assert queue.complete(first, [])
+    assert queue.claim("w3", 60) is None
+    assert queue.complete(second, [])
+    merge = queue.claim("w3", 60)
+    assert merge.iteration == MERGE
+    assert queue.complete(merge, [])
+    assert queue.unfinished() == 0
+
+def test_enqueue_leaves_queued_jobs_alone(queue):
+    queue.enqueue("a", 1, {})
+    lease = queue.claim("w1", 60)
+    queue.enqueue("a", 1, {})
+    assert queue.status_counts() == {"leased": 1, "pending": 1}
+    assert queue.heartbeat(lease, 60)
+
+def test_lost_lease_is_fenced_off_at_complete(queue, tmp_path):
+    queue.enqueue("a", 1, {})
+    # An expired lease is handed to the next worker with a new token
+    stale = queue.claim("w1", -1)
+    current = queue.claim("w2", 60)
+    assert (current.combination, current.iteration) == (stale.combination, stale.iteration)
+    assert current.token == stale.token + 1
+    assert current.suffix != stale.suffix
+
+    final = str(tmp_path / "result.csv")
+    stale_tmp = write(final + stale.suffix, "stale")
+    current_tmp = write(final + current.suffix, "current")
+    assert not queue.heartbeat(stale, 60)
+    assert not queue.complete(stale, [(stale_tmp, final)])
+    # The stale attempt's files are dropped and nothing is moved into place
+    assert not os.path.exists(stale_tmp)
+    assert not os.path.exists(final)
+
+    assert queue.complete(current, [(current_tmp, final)])
+    with open(final) as f:
+        assert f.read() == "current"
+    # A release from the stale holder doesn't put the finished job back
+    queue.release(stale, "late failure")
+    assert queue.status_counts() == {"done": 1, "pending": 1}
+
+def test_released_job_is_claimed_again(queue):
+    queue.enqueue("a", 1, {})
+    lease = queue.claim("w1", 60)
+    queue.release(lease, "boom")
+    again = queue.claim("w2", 60)
+    assert (again.iteration, again.token) == (lease.iteration, lease.token + 1)
@@ -0,0 +1,52 @@
+from Genetic_Algo.online_stats import RunningStats
+import numpy as np
+import pytest
+
+def sample(rng, rows):
+    # A continuous column, a signed one and a small count with many ties and zeros
+    return np.column_stack([rng.normal(5, 2, rows), rng.normal(0, 1, rows), rng.integers(0, 4, rows)]).astype(float)
+
+def test_merge_matches_single_pass_and_numpy():
+    rng = np.random.default_rng(0)
+    values = sample(rng, 1000)
+    single = RunningStats(("a", "b", "c"))
+    for start in range(0, len(values), 7):
+        single.add(values[start:start + 7])
+    left, right = RunningStats(("a", "b", "c")), RunningStats(("a", "b", "c"))
+    left.add(values[:300])
+    right.add(values[300:])
+    left.merge(right)
+
+    for stats in (single, left):
+        assert stats.n == len(values)
+        assert np.allclose(stats.mean, values.mean(axis=0))
+        assert np.allclose(stats.variance(), values.var(axis=0, ddof=1))
+        assert np.array_equal(stats.min, values.min(axis=0))
+        assert np.array_equal(stats.max, values.max(axis=0))
+    for q in (0, 0.1, 0.5, 0.9, 1):
+        assert np.array_equal(left.quantile(q), single.quantile(q))
+
+def test_quantiles_within_relative_accuracy():
+    rng = np.random.default_rng(1)
+    values = sample(rng, 2000)
+    stats = RunningStats(("a", "b", "c"), relative_accuracy=0.01)
+    stats.add(values)
+    for q in (0.05, 0.1, 0.5, 0.9, 0.95):
+        exact = np.quantile(values, q, axis=0, method="lower")
+        assert np.all(np.abs(stats.quantile(q) - exact) <= 0.01 * np.abs(exact) + 1e-12)
+    # Counts are kept exactly
+    assert stats.quantile(0.5)[2] == np.quantile(values[:, 2], 0.5, method="lower")
+
+def test_missing_values_make_their_column_nan():
+    stats = RunningStats(("a", "b"))
+    stats.add([[1.0, np.nan], [3.0, np.nan]])
+    other = RunningStats(("a", "b"))
+    other.add([[5.0, 2.0]])
+    stats.merge(other)
+    assert np.allclose(stats.mean[0], 3.0)
+    assert stats.quantile(0.5)[0] == 3.0
+    assert np.isnan(stats.mean[1]) and np.isnan(stats.max[1]) and np.isnan(stats.quantile(0.5)[1])
+
+def test_merge_needs_the_same_columns():
+    with pytest.raises(ValueError):
+        RunningStats(("a",)).merge(RunningStats(("b",)))